@@ -0,0 +1,21 @@
+"""Index tasks.project_id for per-project scans and ON DELETE CASCADE
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_tasks_project_id", "tasks", ["project_id"])
+
+
+def downgrade():
+    op.drop_index("ix_tasks_project_id", table_name="tasks")
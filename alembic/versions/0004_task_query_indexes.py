@@ -0,0 +1,27 @@
+"""Index task date columns and (project_id, status) for filtered, sorted lists
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_tasks_deadline", "tasks", ["deadline"])
+    op.create_index("ix_tasks_created_at", "tasks", ["created_at"])
+    op.create_index("ix_tasks_updated_at", "tasks", ["updated_at"])
+    op.create_index("ix_tasks_project_id_status", "tasks", ["project_id", "status"])
+
+
+def downgrade():
+    op.drop_index("ix_tasks_project_id_status", table_name="tasks")
+    op.drop_index("ix_tasks_updated_at", table_name="tasks")
+    op.drop_index("ix_tasks_created_at", table_name="tasks")
+    op.drop_index("ix_tasks_deadline", table_name="tasks")
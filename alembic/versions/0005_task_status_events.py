@@ -0,0 +1,98 @@
+"""Append-only task status log written by triggers on tasks
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER tasks_status_event_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+        VALUES (NEW.id, NEW.project_id, NULL, NEW.status, NEW.created_at);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_status_event_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+        VALUES (NEW.id, NEW.project_id, OLD.status, NEW.status, NEW.updated_at);
+    END
+    """,
+]
+
+POSTGRESQL_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION record_task_status_event() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+            VALUES (NEW.id, NEW.project_id, NULL, NEW.status, NEW.created_at);
+        ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+            INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+            VALUES (NEW.id, NEW.project_id, OLD.status, NEW.status, NEW.updated_at);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tasks_status_event AFTER INSERT OR UPDATE OF status ON tasks
+    FOR EACH ROW EXECUTE FUNCTION record_task_status_event()
+    """,
+]
+
+
+def upgrade():
+    op.create_table(
+        "task_status_events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("from_status", sa.String(length=20), nullable=True),
+        sa.Column("to_status", sa.String(length=20), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_task_status_events_project_status_time", "task_status_events",
+        ["project_id", "to_status", "changed_at"],
+    )
+    op.create_index(
+        "ix_task_status_events_task_time", "task_status_events", ["task_id", "changed_at"]
+    )
+    # Existing tasks start their history at creation; earlier status
+    # changes were never recorded
+    op.execute(
+        "INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at) "
+        "SELECT id, project_id, NULL, 'todo', created_at FROM tasks"
+    )
+    dialect = op.get_bind().dialect.name
+    triggers = {"sqlite": SQLITE_TRIGGERS, "postgresql": POSTGRESQL_TRIGGERS}.get(dialect, [])
+    for statement in triggers:
+        op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS tasks_status_event_update")
+        op.execute("DROP TRIGGER IF EXISTS tasks_status_event_insert")
+    elif dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS tasks_status_event ON tasks")
+        op.execute("DROP FUNCTION IF EXISTS record_task_status_event()")
+    op.drop_index("ix_task_status_events_task_time", table_name="task_status_events")
+    op.drop_index("ix_task_status_events_project_status_time", table_name="task_status_events")
+    op.drop_table("task_status_events")
@@ -0,0 +1,171 @@
+"""Compact task storage: status codes, bounded descriptions, epoch timestamps on SQLite
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+STATUS_CODES = {"todo": 0, "doing": 1, "done": 2}
+DESCRIPTION_LENGTH = 150
+
+# Status and timestamp columns per table; the status event log and the
+# archive follow 'tasks' as triggers and INSERT ... SELECT copy from it
+STATUS_COLUMNS = {
+    "tasks": ["status"],
+    "tasks_archive": ["status"],
+    "tasks_archive_totals": ["status"],
+    "task_status_events": ["from_status", "to_status"],
+}
+TIMESTAMP_COLUMNS = {
+    "tasks": ["deadline", "created_at", "updated_at"],
+    "tasks_archive": ["deadline", "created_at", "updated_at", "archived_at"],
+    "task_status_events": ["changed_at"],
+}
+NULLABLE = {"from_status", "deadline"}
+CHECKS = {"tasks": "ck_tasks_status", "tasks_archive": "ck_tasks_archive_status"}
+
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER tasks_status_event_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+        VALUES (NEW.id, NEW.project_id, NULL, NEW.status, NEW.created_at);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_status_event_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+        VALUES (NEW.id, NEW.project_id, OLD.status, NEW.status, NEW.updated_at);
+    END
+    """,
+]
+# PostgreSQL cannot change the type of a column named in UPDATE OF
+POSTGRESQL_TRIGGER = """
+    CREATE TRIGGER tasks_status_event AFTER INSERT OR UPDATE OF status ON tasks
+    FOR EACH ROW EXECUTE FUNCTION record_task_status_event()
+"""
+
+
+def _status_to_code(column: str) -> str:
+    whens = " ".join(f"WHEN '{name}' THEN {code}" for name, code in STATUS_CODES.items())
+    return f"CASE {column} {whens} END"
+
+
+def _code_to_status(column: str) -> str:
+    # SQLite compares '0' and 0 as different values, so cast first
+    whens = " ".join(f"WHEN {code} THEN '{name}'" for name, code in STATUS_CODES.items())
+    return f"CASE CAST({column} AS INTEGER) {whens} END"
+
+
+def _check() -> str:
+    codes = ", ".join(str(code) for code in STATUS_CODES.values())
+    return f"status IN ({codes})"
+
+
+def _drop_triggers(dialect: str):
+    if dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS tasks_status_event_update")
+        op.execute("DROP TRIGGER IF EXISTS tasks_status_event_insert")
+    elif dialect == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS tasks_status_event ON tasks")
+
+
+def _create_triggers(dialect: str):
+    if dialect == "sqlite":
+        for statement in SQLITE_TRIGGERS:
+            op.execute(statement)
+    elif dialect == "postgresql":
+        op.execute(POSTGRESQL_TRIGGER)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    _drop_triggers(dialect)
+
+    for table in STATUS_COLUMNS:
+        if dialect == "sqlite":
+            # Converted in place, the table rebuild below casts '0' to 0
+            for column in STATUS_COLUMNS[table]:
+                op.execute(f"UPDATE {table} SET {column} = {_status_to_code(column)}")
+            for column in TIMESTAMP_COLUMNS.get(table, []):
+                # 'YYYY-MM-DD HH:MM:SS.ffffff' to microseconds since the epoch
+                op.execute(
+                    f"UPDATE {table} SET {column} = "
+                    f"CAST(strftime('%s', substr({column}, 1, 19)) AS INTEGER) * 1000000"
+                    f" + CAST(substr({column}, 21, 6) AS INTEGER)"
+                    f" WHERE typeof({column}) = 'text'"
+                )
+
+        with op.batch_alter_table(table, recreate="always" if dialect == "sqlite" else "auto") as batch_op:
+            for column in STATUS_COLUMNS[table]:
+                batch_op.alter_column(
+                    column, existing_type=sa.String(length=20), type_=sa.SmallInteger(),
+                    existing_nullable=column in NULLABLE,
+                    postgresql_using=_status_to_code(column),
+                )
+            if table in ("tasks", "tasks_archive"):
+                batch_op.alter_column(
+                    "description", existing_type=sa.String(),
+                    type_=sa.String(length=DESCRIPTION_LENGTH), existing_nullable=False,
+                )
+            if dialect == "sqlite":
+                for column in TIMESTAMP_COLUMNS.get(table, []):
+                    batch_op.alter_column(
+                        column, existing_type=sa.DateTime(), type_=sa.BigInteger(),
+                        existing_nullable=column in NULLABLE,
+                    )
+            if table in CHECKS:
+                batch_op.create_check_constraint(CHECKS[table], _check())
+
+    _create_triggers(dialect)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    _drop_triggers(dialect)
+
+    for table in STATUS_COLUMNS:
+        with op.batch_alter_table(table, recreate="always" if dialect == "sqlite" else "auto") as batch_op:
+            if table in CHECKS:
+                batch_op.drop_constraint(CHECKS[table], type_="check")
+            for column in STATUS_COLUMNS[table]:
+                batch_op.alter_column(
+                    column, existing_type=sa.SmallInteger(), type_=sa.String(length=20),
+                    existing_nullable=column in NULLABLE,
+                    postgresql_using=_code_to_status(column),
+                )
+            if table in ("tasks", "tasks_archive"):
+                batch_op.alter_column(
+                    "description", existing_type=sa.String(length=DESCRIPTION_LENGTH),
+                    type_=sa.String(), existing_nullable=False,
+                )
+            if dialect == "sqlite":
+                for column in TIMESTAMP_COLUMNS.get(table, []):
+                    batch_op.alter_column(
+                        column, existing_type=sa.BigInteger(), type_=sa.DateTime(),
+                        existing_nullable=column in NULLABLE,
+                    )
+
+        if dialect == "sqlite":
+            for column in STATUS_COLUMNS[table]:
+                op.execute(f"UPDATE {table} SET {column} = {_code_to_status(column)}")
+            for column in TIMESTAMP_COLUMNS.get(table, []):
+                op.execute(
+                    f"UPDATE {table} SET {column} = "
+                    f"strftime('%Y-%m-%d %H:%M:%S', {column} / 1000000, 'unixepoch')"
+                    f" || printf('.%06d', {column} % 1000000)"
+                    f" WHERE typeof({column}) = 'integer'"
+                )
+
+    _create_triggers(dialect)
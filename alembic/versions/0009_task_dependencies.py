@@ -0,0 +1,35 @@
+"""Blocking relationships between tasks
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "task_dependencies",
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("blocker_id", sa.Integer(), nullable=False),
+        # Epoch microseconds on SQLite, like the other task timestamps
+        sa.Column("created_at", sa.DateTime().with_variant(sa.BigInteger(), "sqlite"),
+                  nullable=False),
+        sa.CheckConstraint("task_id <> blocker_id", name="ck_task_dependencies_not_self"),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["blocker_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id", "blocker_id"),
+    )
+    op.create_index("ix_task_dependencies_blocker_id", "task_dependencies", ["blocker_id"])
+
+
+def downgrade():
+    op.drop_index("ix_task_dependencies_blocker_id", table_name="task_dependencies")
+    op.drop_table("task_dependencies")
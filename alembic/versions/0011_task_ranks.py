@@ -0,0 +1,72 @@
+"""Task ranks for manual ordering within (project, status) columns
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+# Same key scheme as src/todolist/utils/ranks.py
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+RANK_GAP = len(DIGITS) ** 3
+RANK_WIDTH = 6
+
+
+def _spaced_ranks(count: int) -> list:
+    base = len(DIGITS)
+    width = RANK_WIDTH
+    while base ** width < 2 * (count + 1) * RANK_GAP:
+        width += 1
+    start = (base ** width // RANK_GAP - count) // 2 * RANK_GAP
+    ranks = []
+    for i in range(count):
+        value, digits = start + i * RANK_GAP, []
+        for _ in range(width):
+            value, digit = divmod(value, base)
+            digits.append(DIGITS[digit])
+        ranks.append("".join(reversed(digits)).rstrip("0"))
+    return ranks
+
+
+def upgrade():
+    op.add_column("tasks", sa.Column("rank", sa.String(), nullable=True))
+    op.add_column("tasks_archive", sa.Column("rank", sa.String(), nullable=True))
+
+    # Existing tasks keep their creation order within each column
+    bind = op.get_bind()
+    tasks = sa.table("tasks", sa.column("id"), sa.column("project_id"),
+                     sa.column("status"), sa.column("rank"))
+    columns = {}
+    for id, project_id, status in bind.execute(
+        sa.select(tasks.c.id, tasks.c.project_id, tasks.c.status)
+        .order_by(tasks.c.project_id, tasks.c.status, tasks.c.id)
+    ):
+        columns.setdefault((project_id, status), []).append(id)
+    statement = tasks.update().where(tasks.c.id == sa.bindparam("task_id")).values(
+        rank=sa.bindparam("new_rank")
+    )
+    for ids in columns.values():
+        bind.execute(statement, [
+            {"task_id": id, "new_rank": rank} for id, rank in zip(ids, _spaced_ranks(len(ids)))
+        ])
+
+    # The new index also serves lookups by (project_id, status)
+    op.drop_index("ix_tasks_project_id_status", table_name="tasks")
+    op.create_index("ix_tasks_project_id_status_rank", "tasks", ["project_id", "status", "rank"])
+
+
+def downgrade():
+    op.drop_index("ix_tasks_project_id_status_rank", table_name="tasks")
+    op.create_index("ix_tasks_project_id_status", "tasks", ["project_id", "status"])
+    # A plain DROP COLUMN (SQLite 3.35+) keeps the status event triggers on
+    # 'tasks', which a batch table rebuild would drop
+    op.drop_column("tasks_archive", "rank")
+    op.drop_column("tasks", "rank")
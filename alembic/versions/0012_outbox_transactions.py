@@ -0,0 +1,29 @@
+"""Order outbox delivery by writing transaction
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing events and cursors sort first, in their old ID order
+    op.add_column("outbox_events", sa.Column(
+        "transaction_id", sa.BigInteger(), nullable=False, server_default="0"
+    ))
+    op.add_column("webhook_endpoints", sa.Column(
+        "cursor_transaction", sa.BigInteger(), nullable=False, server_default="0"
+    ))
+
+
+def downgrade():
+    op.drop_column("webhook_endpoints", "cursor_transaction")
+    op.drop_column("outbox_events", "transaction_id")
@@ -0,0 +1,76 @@
+"""
+Tail latency under write overload, with and without admission control
+
+A stand-in app serialises writes behind one lock (like SQLite's single
+writer). Bursts of concurrent writes are sent straight through the ASGI
+interface so only queueing is measured.
+
+Usage:
+    python -m benchmarks.bench_admission --requests 500 --service-ms 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.todolist.api.middleware.admission import AdmissionMiddleware
+
+
+def make_app(service_seconds: float):
+    writer = asyncio.Lock()
+
+    async def app(scope, receive, send):
+        async with writer:
+            await asyncio.sleep(service_seconds)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+async def burst(app, requests: int):
+    scope = {"type": "http", "method": "POST", "path": "/api/v1/tasks/",
+             "headers": [], "client": ("127.0.0.1", 1)}
+
+    async def one():
+        status = []
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        start = time.perf_counter()
+        await app(scope, None, send)
+        return status[0], time.perf_counter() - start
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+def report(name: str, results):
+    served = sorted(seconds for status, seconds in results if status == 200)
+    shed = len(results) - len(served)
+    p50 = statistics.median(served) * 1000
+    p99 = served[int(len(served) * 0.99) - 1] * 1000
+    print(f"{name:>10}: served {len(served):4d}, shed {shed:4d}, "
+          f"p50 {p50:7.1f} ms, p99 {p99:7.1f} ms, max {served[-1] * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--service-ms", type=float, default=5.0)
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--queue-timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    service = args.service_ms / 1000
+    report("no limit", asyncio.run(burst(make_app(service), args.requests)))
+    guarded = AdmissionMiddleware(
+        make_app(service), write_limit=1, queue_size=args.queue_size,
+        queue_timeout=args.queue_timeout,
+    )
+    report("admission", asyncio.run(burst(guarded, args.requests)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Analytics reports: NumPy arrays vs a pure-Python loop over Task objects
+
+Both versions produce the same burn-down, overdue-age and deadline
+heatmap numbers; the benchmark checks that before printing timings.
+
+Usage:
+    python -m benchmarks.bench_analytics --rows 200000 --projects 50
+"""
+import argparse
+import bisect
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from src.todolist.analytics import load_task_arrays
+from src.todolist.analytics.reports import OVERDUE_AGE_BINS, build_reports
+from src.todolist.models.task import Task
+from .common import make_sessionmaker
+
+
+BURN_DOWN_DAYS = 30
+HORIZON_DAYS = 28
+
+
+def python_reports(db, now: datetime):
+    """The same reports, row by row from ORM objects"""
+    today = now.date()
+    start = today - timedelta(days=BURN_DOWN_DAYS - 1)
+    days = [start + timedelta(days=i) for i in range(BURN_DOWN_DAYS)]
+    burn_down = defaultdict(lambda: [0] * BURN_DOWN_DAYS)
+    overdue = defaultdict(lambda: [0] * len(OVERDUE_AGE_BINS))
+    heatmap = defaultdict(lambda: [0] * HORIZON_DAYS)
+
+    for task in db.query(Task).all():
+        remaining = burn_down[task.project_id]
+        for i, day in enumerate(days):
+            open_at_end = task.created_at.date() <= day and not (
+                task.status == "done" and task.updated_at.date() <= day
+            )
+            remaining[i] += open_at_end
+        if task.status == "done" or task.deadline is None:
+            continue
+        if task.deadline < now:
+            age = (now - task.deadline).total_seconds() / 86400
+            overdue[task.project_id][bisect.bisect_right(OVERDUE_AGE_BINS, age) - 1] += 1
+        offset = (task.deadline.date() - today).days
+        if 0 <= offset < HORIZON_DAYS:
+            heatmap[task.project_id][offset] += 1
+    return burn_down, overdue, heatmap
+
+
+def numpy_reports(db, now: datetime):
+    return build_reports(load_task_arrays(db), now, BURN_DOWN_DAYS, HORIZON_DAYS)
+
+
+def timed(fn, Session, now):
+    db = Session()
+    try:
+        start = time.perf_counter()
+        result = fn(db, now)
+        return result, time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--projects", type=int, default=50)
+    args = parser.parse_args()
+
+    Session = make_sessionmaker(args.rows, projects=args.projects)
+    now = datetime.now()
+    (burn_down, overdue, heatmap), python_seconds = timed(python_reports, Session, now)
+    reports, numpy_seconds = timed(numpy_reports, Session, now)
+
+    for name, expected, key in (("burn_down", burn_down, "remaining"),
+                                ("overdue_age", overdue, "counts"),
+                                ("deadline_heatmap", heatmap, "counts")):
+        report = reports[name]
+        for project_id, row in zip(report["projects"], report[key]):
+            assert list(row) == expected.get(int(project_id), [0] * len(row)), name
+
+    print(f"{args.rows} tasks in {args.projects} projects, identical results")
+    print(f"  python loop: {python_seconds:7.3f}s")
+    print(f"  numpy:       {numpy_seconds:7.3f}s  ({python_seconds / numpy_seconds:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
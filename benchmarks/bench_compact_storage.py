@@ -0,0 +1,150 @@
+"""
+Task storage size and scan speed: the previous layout vs the compact one
+
+The previous layout (status as text, unbounded description, timestamps as
+text) is rebuilt from its old column types; the compact layout is the
+current ``Task`` model. Both SQLite files get the same rows and are
+vacuumed before table and index sizes are read from ``dbstat``.
+
+Usage:
+    python -m benchmarks.bench_compact_storage --rows 200000
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    Column, DateTime, ForeignKey, Index, Integer, MetaData, String, Table, create_engine,
+    insert, text,
+)
+
+from src.todolist.db.base import Base
+from src.todolist.db.init_db import import_models
+from src.todolist.models.task import Task
+
+
+legacy_metadata = MetaData()
+Table(
+    "projects", legacy_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(100), nullable=False),
+    Column("description", String, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+legacy_tasks = Table(
+    "tasks", legacy_metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String(30), nullable=False),
+    Column("description", String, nullable=False),
+    Column("status", String(20), nullable=False),
+    Column("deadline", DateTime, index=True),
+    Column("created_at", DateTime, nullable=False, index=True),
+    Column("updated_at", DateTime, nullable=False, index=True),
+    Column("project_id", Integer, ForeignKey("projects.id"), nullable=False, index=True),
+    Index("ix_tasks_project_id_status", "project_id", "status"),
+)
+
+# Full scans and index lookups over status and timestamps
+QUERIES = {
+    "count by status": "SELECT status, count(*) FROM tasks GROUP BY status",
+    "project + status": "SELECT count(*) FROM tasks WHERE project_id = 1 AND status = :status",
+    "all rows": "SELECT * FROM tasks",
+    "recently updated": "SELECT id FROM tasks ORDER BY updated_at DESC LIMIT 1000",
+}
+
+
+def task_rows(rows: int, projects: int):
+    now = datetime.now()
+    for i in range(rows):
+        yield {
+            "title": f"Task {i}",
+            "description": "Benchmark task",
+            "status": ("todo", "doing", "done")[i % 3],
+            "deadline": now + timedelta(days=i % 30 - 10),
+            "created_at": now - timedelta(days=i % 60, seconds=i),
+            "updated_at": now - timedelta(seconds=i),
+            "project_id": i % projects + 1,
+        }
+
+
+def build(path: str, metadata: MetaData, table, rows: int, projects: int):
+    engine = create_engine(f"sqlite:///{path}")
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        now = datetime.now()
+        conn.execute(insert(metadata.tables["projects"]), [
+            {"id": i + 1, "name": f"Bench {i}", "description": "Benchmark project",
+             "created_at": now, "updated_at": now}
+            for i in range(projects)
+        ])
+        # Only the tasks table is compared, the status log is not needed
+        conn.execute(text("DROP TRIGGER IF EXISTS tasks_status_event_insert"))
+        batch = []
+        for row in task_rows(rows, projects):
+            batch.append(row)
+            if len(batch) == 50000:
+                conn.execute(insert(table), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(table), batch)
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("VACUUM"))
+    return engine
+
+
+def sizes(engine) -> tuple:
+    """Bytes used by the tasks table and by its indexes"""
+    with engine.connect() as conn:
+        pages = dict(conn.execute(text("SELECT name, sum(pgsize) FROM dbstat GROUP BY name")).all())
+        indexes = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'")
+        ).scalars().all()
+    return pages["tasks"], sum(pages.get(name, 0) for name in indexes)
+
+
+def best_of(engine, sql: str, params: dict, repeat: int) -> float:
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(text(sql), params).all()
+            timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000, help="Number of tasks")
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per query, best is kept")
+    args = parser.parse_args()
+
+    import_models()
+    with tempfile.TemporaryDirectory() as tmp:
+        layouts = {
+            "previous": build(os.path.join(tmp, "previous.db"), legacy_metadata, legacy_tasks,
+                              args.rows, args.projects),
+            "compact": build(os.path.join(tmp, "compact.db"), Base.metadata, Task,
+                             args.rows, args.projects),
+        }
+        for name, engine in layouts.items():
+            table, indexes = sizes(engine)
+            file_size = os.path.getsize(engine.url.database)
+            print(f"{name:>9}: table {table / 2**20:7.1f} MiB ({table / args.rows:5.1f} B/row), "
+                  f"indexes {indexes / 2**20:7.1f} MiB, file {file_size / 2**20:7.1f} MiB")
+        for label, sql in QUERIES.items():
+            timings = []
+            for name, engine in layouts.items():
+                # The same filter in each layout's own status representation
+                status = "done" if name == "previous" else 2
+                timings.append(best_of(engine, sql, {"status": status}, args.repeat))
+            print(f"{label:>17}: previous {timings[0] * 1000:8.1f} ms, compact {timings[1] * 1000:8.1f} ms")
+        for engine in layouts.values():
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Sustained write throughput on one SQLite file: a commit per write vs group commit
+
+Usage:
+    python -m benchmarks.bench_group_commit --threads 16 --writes 200
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from src.todolist.db.write_coordinator import WriteCoordinator
+from src.todolist.models.task import Task
+from src.todolist.repositories.coordinated_repository import CoordinatedRepository
+from src.todolist.repositories.task_repository import TaskRepository
+from .common import make_sessionmaker
+
+
+def run(threads: int, writes: int, repository_for) -> tuple:
+    errors = []
+
+    def writer(index: int):
+        repository = repository_for()
+        for i in range(writes):
+            task = Task(title=f"Task {index}-{i}", description="Benchmark task")
+            task.project_id = 1
+            try:
+                repository.add(task)
+            except OperationalError as e:  # "database is locked"
+                repository.db.rollback()
+                errors.append(e)
+
+    workers = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200, help="Writes per thread")
+    parser.add_argument("--delay-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    total = args.threads * args.writes
+
+    for name in ("per-write", "group"):
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+        make_sessionmaker(0, url=url)
+        engine = create_engine(url, connect_args={"check_same_thread": False})
+        Session = sessionmaker(bind=engine, expire_on_commit=False)
+
+        batches = total
+        if name == "per-write":
+            seconds, errors = run(args.threads, args.writes, lambda: TaskRepository(Session()))
+        else:
+            coordinator = WriteCoordinator(url, max_delay=args.delay_ms / 1000)
+            seconds, errors = run(args.threads, args.writes, lambda: CoordinatedRepository(
+                TaskRepository(Session()), coordinator
+            ))
+            coordinator.stop()
+            batches = coordinator.batches
+        print(f"{name:>10}: {total / seconds:8.0f} writes/s, {batches} commits, "
+              f"{errors} lock errors")
+
+
+if __name__ == "__main__":
+    main()
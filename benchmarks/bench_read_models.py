@@ -0,0 +1,57 @@
+"""
+Peak memory of bulk task reads: ORM instances vs read-model records
+
+Usage:
+    python -m benchmarks.bench_read_models --rows 200000
+"""
+import argparse
+import time
+import tracemalloc
+
+from src.todolist.models.task import Task
+from src.todolist.repositories.read_models import TaskReadRepository
+from .common import make_sessionmaker
+
+
+def orm_all(db):
+    return len(db.query(Task).all())
+
+
+def records_list(db):
+    return len(TaskReadRepository(db).list())
+
+
+def records_batches(db):
+    return sum(len(batch) for batch in TaskReadRepository(db).iter_batches(1000))
+
+
+def measure(fn, Session):
+    db = Session()
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = fn(db)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return count, seconds, peak
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk read memory")
+    parser.add_argument("--rows", type=int, default=200000, help="Number of tasks")
+    args = parser.parse_args()
+
+    Session = make_sessionmaker(args.rows)
+    for name, fn in (("orm .all()", orm_all),
+                     ("records list", records_list),
+                     ("records batches", records_batches)):
+        count, seconds, peak = measure(fn, Session)
+        print(f"{name:>16}: {count} rows, {seconds:6.2f} s, "
+              f"peak {peak / 2**20:8.1f} MiB ({peak / count:6.0f} B/row)")
+
+
+if __name__ == "__main__":
+    main()
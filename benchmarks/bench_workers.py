@@ -0,0 +1,100 @@
+"""
+Request throughput of the production server from 1 to N workers
+
+Every run serves the same SQLite file, so only the worker count changes.
+
+Usage:
+    python -m benchmarks.bench_workers --rows 20000 --max-workers 4
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from .common import make_sessionmaker
+
+
+PATH = "/api/v1/tasks/?status=todo,doing&sort=-deadline&limit=50"
+
+
+def wait_until_up(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def load(port: int, clients: int, seconds: float) -> int:
+    """Keep-alive clients requesting PATH in a loop, returns completed requests"""
+    counts = [0] * clients
+    stop = time.monotonic() + seconds
+
+    def client(index: int):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        while time.monotonic() < stop:
+            connection.request("GET", PATH)
+            response = connection.getresponse()
+            response.read()
+            if response.status == 200:
+                counts[index] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+
+def run_server(url: str, workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=url, REPOSITORY_BACKEND="sqlalchemy")
+    return subprocess.Popen(
+        [sys.executable, "-m", "src.todolist.api.server",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    url = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+    make_sessionmaker(args.rows, projects=10, url=url)
+    print(f"{args.rows} tasks, {args.clients} clients, {args.seconds:.0f}s per run, "
+          f"{os.cpu_count()} CPU(s)")
+
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        server = run_server(url, workers, args.port)
+        try:
+            wait_until_up(args.port)
+            load(args.port, args.clients, 1.0)  # warm up
+            rate = load(args.port, args.clients, args.seconds) / args.seconds
+        finally:
+            server.terminate()
+            server.wait()
+        baseline = baseline or rate
+        print(f"{workers:>3} worker(s): {rate:8.0f} req/s  ({rate / baseline:.2f}x)")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
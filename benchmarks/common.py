@@ -0,0 +1,45 @@
+"""
+Shared fixtures for benchmarks: an in-memory SQLite database with N tasks
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.todolist.db.base import Base
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+
+
+def make_sessionmaker(rows: int, projects: int = 1, url: str = "sqlite://"):
+    """Create a database filled with ``rows`` tasks spread over ``projects``"""
+    engine = create_engine(
+        url, connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, expire_on_commit=False)
+    db = Session()
+    db.add_all([
+        Project(name=f"Bench {i}", description="Benchmark project")
+        for i in range(projects)
+    ])
+    db.commit()
+    now = datetime.now()
+    chunk = 50000
+    for start in range(0, rows, chunk):
+        db.execute(insert(Task), [
+            {
+                "title": f"Task {i}",
+                "description": "Benchmark task",
+                "status": ("todo", "doing", "done")[i % 3],
+                "deadline": now + timedelta(days=i % 30 - 10),
+                "created_at": now - timedelta(days=i % 60),
+                "updated_at": now,
+                "project_id": i % projects + 1,
+            }
+            for i in range(start, min(start + chunk, rows))
+        ])
+    db.commit()
+    db.close()
+    return Session
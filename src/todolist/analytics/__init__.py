@@ -0,0 +1,22 @@
+"""
+Vectorised task analytics (requires the optional ``numpy`` dependency)
+"""
+from .task_arrays import STATUS_CODES, TaskArrays, load_task_arrays
+from .reports import (
+    burn_down,
+    deadline_heatmap,
+    overdue_age_histogram,
+    write_csv,
+    write_npz,
+)
+
+__all__ = [
+    "STATUS_CODES",
+    "TaskArrays",
+    "load_task_arrays",
+    "burn_down",
+    "deadline_heatmap",
+    "overdue_age_histogram",
+    "write_csv",
+    "write_npz",
+]
@@ -0,0 +1,132 @@
+"""
+Per-project reports computed with vectorised NumPy operations
+
+Every report groups by project with ``np.unique(..., return_inverse=True)``
+and counts with a single ``np.bincount`` over a (project, bucket) index,
+so the cost is a few passes over the arrays whatever the number of projects.
+"""
+import csv
+import os
+from datetime import date, datetime, timedelta
+from typing import Dict, Sequence
+
+from .task_arrays import DONE, SECONDS_PER_DAY, TaskArrays, np, require_numpy, to_epoch
+
+
+# Overdue age buckets in days: [0, 1), [1, 3), ... [90, inf)
+OVERDUE_AGE_BINS = (0, 1, 3, 7, 14, 30, 90)
+
+
+def _grouped_counts(project_index, bucket, projects: int, buckets: int):
+    """Count (project, bucket) pairs into a projects x buckets matrix"""
+    flat = project_index * buckets + bucket
+    return np.bincount(flat, minlength=projects * buckets).reshape(projects, buckets)
+
+
+def _day_index(epoch, start: int, days: int):
+    """Day bucket of each timestamp, clipped to [0, days]"""
+    return np.clip((epoch - start) // SECONDS_PER_DAY, 0, days).astype(np.int64)
+
+
+def burn_down(arrays: TaskArrays, start: date, days: int) -> Dict[str, "np.ndarray"]:
+    """
+    Open tasks per project at the end of each day from ``start``
+
+    A task counts as open from ``created_at`` until it is done; the time it
+    was done is taken from ``updated_at``.
+    """
+    require_numpy()
+    projects, project_index = np.unique(arrays.project_id, return_inverse=True)
+    start_epoch = to_epoch(datetime.combine(start, datetime.min.time()))
+    buckets = days + 1  # last bucket collects everything after the range
+
+    created = _grouped_counts(
+        project_index, _day_index(arrays.created_at, start_epoch, days), len(projects), buckets
+    )
+    done = arrays.status == DONE
+    closed = _grouped_counts(
+        project_index[done], _day_index(arrays.updated_at[done], start_epoch, days),
+        len(projects), buckets
+    )
+    remaining = np.cumsum(created - closed, axis=1)[:, :days]
+    return {
+        "projects": projects,
+        "days": np.arange(np.datetime64(start), np.datetime64(start) + days),
+        "remaining": remaining,
+    }
+
+
+def overdue_age_histogram(arrays: TaskArrays, now: datetime,
+                          bins: Sequence[int] = OVERDUE_AGE_BINS) -> Dict[str, "np.ndarray"]:
+    """Unfinished overdue tasks per project, bucketed by days past deadline"""
+    require_numpy()
+    projects, project_index = np.unique(arrays.project_id, return_inverse=True)
+    now_epoch = to_epoch(now)
+    # NaN deadlines compare False, so tasks without one are never overdue
+    with np.errstate(invalid="ignore"):
+        overdue = (arrays.status != DONE) & (arrays.deadline < now_epoch)
+    age_days = (now_epoch - arrays.deadline[overdue]) / SECONDS_PER_DAY
+    bucket = np.digitize(age_days, bins) - 1
+    return {
+        "projects": projects,
+        "bins": np.asarray(bins),
+        "counts": _grouped_counts(project_index[overdue], bucket, len(projects), len(bins)),
+    }
+
+
+def deadline_heatmap(arrays: TaskArrays, today: date, days: int) -> Dict[str, "np.ndarray"]:
+    """Unfinished tasks per project due on each of the next ``days`` days"""
+    require_numpy()
+    projects, project_index = np.unique(arrays.project_id, return_inverse=True)
+    start_epoch = to_epoch(datetime.combine(today, datetime.min.time()))
+    day = (arrays.deadline - start_epoch) // SECONDS_PER_DAY
+    with np.errstate(invalid="ignore"):
+        due = (arrays.status != DONE) & (day >= 0) & (day < days)
+    return {
+        "projects": projects,
+        "days": np.arange(np.datetime64(today), np.datetime64(today) + days),
+        "counts": _grouped_counts(project_index[due], day[due].astype(np.int64), len(projects), days),
+    }
+
+
+def build_reports(arrays: TaskArrays, now: datetime, burn_down_days: int,
+                  horizon_days: int) -> Dict[str, Dict[str, "np.ndarray"]]:
+    """All reports, keyed by name"""
+    today = now.date()
+    return {
+        "burn_down": burn_down(arrays, today - timedelta(days=burn_down_days - 1), burn_down_days),
+        "overdue_age": overdue_age_histogram(arrays, now),
+        "deadline_heatmap": deadline_heatmap(arrays, today, horizon_days),
+    }
+
+
+def write_npz(reports: Dict[str, Dict[str, "np.ndarray"]], path: str) -> str:
+    """Write all reports into one compressed ``.npz`` file, keys 'report.array'"""
+    arrays = {
+        f"{name}.{key}": value
+        for name, report in reports.items()
+        for key, value in report.items()
+    }
+    np.savez_compressed(path, **arrays)
+    return path if path.endswith(".npz") else f"{path}.npz"
+
+
+def write_csv(reports: Dict[str, Dict[str, "np.ndarray"]], directory: str) -> list:
+    """Write each report as a long-format CSV file in ``directory``"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, report in reports.items():
+        columns = report["days"] if "days" in report else report["bins"]
+        header = "day" if "days" in report else "overdue_days_from"
+        values = report["remaining"] if "remaining" in report else report["counts"]
+        path = os.path.join(directory, f"{name}.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["project_id", header, "count"])
+            for project_id, row in zip(report["projects"], values):
+                writer.writerows(
+                    (int(project_id), str(column), int(count))
+                    for column, count in zip(columns, row)
+                )
+        paths.append(path)
+    return paths
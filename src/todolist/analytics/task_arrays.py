@@ -0,0 +1,106 @@
+"""
+Bulk loading of task columns into NumPy arrays
+
+Statuses are stored as integer codes, and timestamps are mapped to epoch
+seconds by the database, so rows arrive as plain numbers and are copied into preallocated
+arrays partition by partition. Naive timestamps are treated as UTC throughout; only differences
+between them matter for the reports.
+"""
+import calendar
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from sqlalchemy import BigInteger, Integer, SmallInteger, cast, extract, func, select, type_coerce
+from sqlalchemy.orm import Session
+
+from ..db.types import STATUS_CODES
+from ..models.task import Task
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None
+
+
+DONE = STATUS_CODES["done"]
+
+SECONDS_PER_DAY = 86400
+
+
+class TaskArrays(NamedTuple):
+    """Column arrays for all tasks, one element per task"""
+    project_id: "np.ndarray"  # int64
+    status: "np.ndarray"      # int8 status code
+    deadline: "np.ndarray"    # float64 epoch seconds, NaN when unset
+    created_at: "np.ndarray"  # int64 epoch seconds
+    updated_at: "np.ndarray"  # int64 epoch seconds
+
+    def __len__(self):
+        return len(self.project_id)
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("Analytics reports need NumPy, install the analytics extra: "
+                          "poetry install --extras analytics")
+
+
+def to_epoch(value: datetime) -> int:
+    """Epoch seconds of a naive datetime, in the same frame as the arrays"""
+    return calendar.timegm(value.timetuple())
+
+
+def _epoch_column(db: Session, column):
+    if db.get_bind().dialect.name == "sqlite":
+        # Stored as epoch microseconds
+        return type_coerce(column, BigInteger) // 1000000
+    return cast(extract("epoch", column), Integer)
+
+
+def load_task_arrays(db: Session, batch_size: int = 50000,
+                     project_id: Optional[int] = None) -> TaskArrays:
+    """Load task columns into arrays with one streamed query"""
+    require_numpy()
+    count_query = select(func.count(Task.id))
+    query = select(
+        Task.project_id,
+        # The stored code, not the status string
+        type_coerce(Task.status, SmallInteger),
+        _epoch_column(db, Task.deadline),
+        _epoch_column(db, Task.created_at),
+        _epoch_column(db, Task.updated_at),
+    )
+    if project_id is not None:
+        count_query = count_query.where(Task.project_id == project_id)
+        query = query.where(Task.project_id == project_id)
+
+    total = db.execute(count_query).scalar_one()
+    arrays = TaskArrays(
+        project_id=np.empty(total, dtype=np.int64),
+        status=np.empty(total, dtype=np.int8),
+        deadline=np.empty(total, dtype=np.float64),
+        created_at=np.empty(total, dtype=np.int64),
+        updated_at=np.empty(total, dtype=np.int64),
+    )
+
+    filled = 0
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        # Rows inserted since the count are left out
+        rows = rows[:total - filled]
+        if not rows:
+            break
+        end = filled + len(rows)
+        project_ids, statuses, deadlines, created, updated = zip(*rows)
+        arrays.project_id[filled:end] = project_ids
+        arrays.status[filled:end] = statuses
+        arrays.deadline[filled:end] = np.array(deadlines, dtype=np.float64)
+        arrays.created_at[filled:end] = created
+        arrays.updated_at[filled:end] = updated
+        filled = end
+    result.close()
+
+    if filled < total:
+        # Rows deleted since the count
+        arrays = TaskArrays(*(column[:filled] for column in arrays))
+    return arrays
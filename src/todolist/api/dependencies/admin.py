@@ -0,0 +1,16 @@
+import secrets
+
+from fastapi import Header, HTTPException, status
+
+from ...utils.config import Config
+
+
+def require_admin(x_admin_token: str = Header(None, description="Must match ADMIN_TOKEN")):
+    """
+    Dependency guarding admin endpoints with the ADMIN_TOKEN; without one
+    configured they do not exist (404)
+    """
+    if not Config.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not secrets.compare_digest(x_admin_token or "", Config.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
@@ -1,7 +1,9 @@
-from typing import Generator
+from typing import Generator, Optional
 from sqlalchemy.orm import Session
 
 from ...db.session import SessionLocal
+from ...db.sharding import ShardSessions, get_shard_router
+from ...utils.config import Config
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -10,4 +12,15 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_shard_sessions() -> Generator[Optional[ShardSessions], None, None]:
+    """Dependency for per-shard sessions, None when sharding is off"""
+    if not Config.SHARD_URLS:
+        yield None
+        return
+    sessions = get_shard_router().sessions()
+    try:
+        yield sessions
+    finally:
+        sessions.close()
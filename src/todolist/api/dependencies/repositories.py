@@ -0,0 +1,104 @@
+from functools import lru_cache
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from .database import get_db, get_shard_sessions
+from ...db.write_coordinator import WriteCoordinator
+from ...repositories.archive_repository import TaskArchiveRepository
+from ...repositories.coordinated_repository import CoordinatedRepository
+from ...repositories.memory_repository import (
+    InMemoryProjectRepository,
+    InMemoryStore,
+    InMemoryTaskRepository,
+)
+from ...repositories.project_repository import ProjectRepository
+from ...repositories.sharded_repository import (
+    ShardedProjectRepository,
+    ShardedTaskEventRepository,
+    ShardedTaskRepository,
+)
+from ...repositories.rank_repository import TaskRankRepository
+from ...repositories.tag_repository import TagRepository
+from ...repositories.task_dependency_repository import TaskDependencyRepository
+from ...repositories.task_event_repository import TaskEventRepository
+from ...repositories.task_repository import TaskRepository
+from ...utils.config import Config
+
+
+@lru_cache(maxsize=None)
+def get_memory_store() -> InMemoryStore:
+    """Process-wide store used when REPOSITORY_BACKEND is 'memory'"""
+    return InMemoryStore(snapshot_path=Config.MEMORY_SNAPSHOT_PATH)
+
+
+@lru_cache(maxsize=None)
+def get_write_coordinator() -> WriteCoordinator:
+    """Process-wide writer thread used when WRITE_COORDINATOR is enabled"""
+    return WriteCoordinator(
+        max_batch=Config.WRITE_BATCH_SIZE,
+        max_delay=Config.WRITE_BATCH_DELAY_MS / 1000,
+    )
+
+
+def _coordinated(repository):
+    if Config.WRITE_COORDINATOR:
+        return CoordinatedRepository(repository, get_write_coordinator())
+    return repository
+
+
+def get_project_repository(db: Session = Depends(get_db),
+                           shards=Depends(get_shard_sessions)):
+    """Dependency for the configured project repository backend"""
+    if Config.REPOSITORY_BACKEND == "memory":
+        return InMemoryProjectRepository(get_memory_store())
+    if shards is not None:
+        return ShardedProjectRepository(shards)
+    return _coordinated(ProjectRepository(db))
+
+
+def get_task_repository(db: Session = Depends(get_db),
+                        shards=Depends(get_shard_sessions)):
+    """Dependency for the configured task repository backend"""
+    if Config.REPOSITORY_BACKEND == "memory":
+        return InMemoryTaskRepository(get_memory_store())
+    if shards is not None:
+        return ShardedTaskRepository(shards)
+    return _coordinated(TaskRepository(db))
+
+
+def get_archive_repository(db: Session = Depends(get_db)):
+    """Dependency for the task archive, None when the backend has no archive"""
+    if Config.REPOSITORY_BACKEND == "memory" or Config.SHARD_URLS:
+        return None
+    return TaskArchiveRepository(db)
+
+
+def get_dependency_repository(db: Session = Depends(get_db)):
+    """Dependency for the task dependency graph, None when the backend has none"""
+    if Config.REPOSITORY_BACKEND == "memory" or Config.SHARD_URLS:
+        return None
+    return _coordinated(TaskDependencyRepository(db))
+
+
+def get_tag_repository(db: Session = Depends(get_db)):
+    """Dependency for task tags, None when the backend has none"""
+    if Config.REPOSITORY_BACKEND == "memory" or Config.SHARD_URLS:
+        return None
+    return _coordinated(TagRepository(db))
+
+
+def get_rank_repository(db: Session = Depends(get_db)):
+    """Dependency for the manual task order, None when the backend has none"""
+    if Config.REPOSITORY_BACKEND == "memory" or Config.SHARD_URLS:
+        return None
+    return _coordinated(TaskRankRepository(db))
+
+
+def get_event_repository(db: Session = Depends(get_db),
+                         shards=Depends(get_shard_sessions)):
+    """Dependency for the task status log, None when the backend has no log"""
+    if Config.REPOSITORY_BACKEND == "memory":
+        return None
+    if shards is not None:
+        return ShardedTaskEventRepository(shards)
+    return TaskEventRepository(db)
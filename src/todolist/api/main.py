@@ -1,7 +1,37 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from .dependencies.repositories import get_memory_store, get_write_coordinator
+from .middleware import (
+    AdmissionMiddleware, MemoryMiddleware, ProfilingMiddleware, RequestContextMiddleware
+)
+from .middleware.profiling import get_profile_store
+from .routes import admin, jobs, projects, tasks
+from ..commands.jobs import get_job_runner
+from ..db.sharding import ProjectMovingError
+from ..utils.config import Config
+from ..utils.log import configure_logging, shutdown_logging
+from ..utils.memory import get_memory_tracker
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks"""
+    configure_logging()
+    if Config.JOB_WORKERS:
+        get_job_runner().start()
+    yield
+    if Config.JOB_WORKERS:
+        # Running jobs finish first; jobs of a killed process are queued again
+        get_job_runner().stop()
+    if Config.WRITE_COORDINATOR:
+        get_write_coordinator().stop()
+    if Config.REPOSITORY_BACKEND == "memory" and Config.MEMORY_SNAPSHOT_PATH:
+        get_memory_store().save_snapshot()
+    shutdown_logging()
 
-from .routes import projects, tasks
 
 app = FastAPI(
     title="ToDoList API",
@@ -9,8 +39,39 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+# Peak allocation sampling per route
+if Config.MEMORY_TRACING_ENABLED:
+    app.add_middleware(
+        MemoryMiddleware,
+        tracker=get_memory_tracker(),
+        sample_rate=Config.MEMORY_TRACE_SAMPLE_RATE,
+    )
+
+# Profiling, inside admission control so only admitted work is measured
+if Config.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=get_profile_store(),
+        sample_rate=Config.PROFILING_SAMPLE_RATE,
+        token=Config.ADMIN_TOKEN,
+    )
+
+# Admission control, inside CORS so rejections carry CORS headers
+if Config.ADMISSION_ENABLED:
+    app.add_middleware(
+        AdmissionMiddleware,
+        read_limit=Config.ADMISSION_READ_LIMIT,
+        write_limit=Config.ADMISSION_WRITE_LIMIT,
+        queue_size=Config.ADMISSION_QUEUE_SIZE,
+        queue_timeout=Config.ADMISSION_QUEUE_TIMEOUT,
+        retry_after=Config.ADMISSION_RETRY_AFTER,
+        client_rate=Config.CLIENT_RATE_LIMIT,
+        client_burst=Config.CLIENT_RATE_BURST,
+    )
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -20,9 +81,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request IDs and access records, outermost so every response is covered
+app.add_middleware(RequestContextMiddleware, log_requests=Config.LOG_REQUESTS)
+
+@app.exception_handler(ProjectMovingError)
+async def project_moving_handler(request: Request, exc: ProjectMovingError):
+    """Writes to a project being moved between shards are retried later"""
+    return JSONResponse(status_code=503, content={"detail": str(exc)},
+                        headers={"Retry-After": "5"})
+
+
 # Include routers
 app.include_router(projects.router, prefix="/api/v1/projects", tags=["projects"])
 app.include_router(tasks.router, prefix="/api/v1/tasks", tags=["tasks"])
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["jobs"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["admin"])
 
 
 @app.get("/")
@@ -0,0 +1,11 @@
+from .admission import AdmissionMiddleware
+from .memory import MemoryMiddleware
+from .profiling import ProfilingMiddleware
+from .request_context import RequestContextMiddleware
+
+__all__ = [
+    "AdmissionMiddleware",
+    "MemoryMiddleware",
+    "ProfilingMiddleware",
+    "RequestContextMiddleware",
+]
@@ -0,0 +1,157 @@
+"""
+Admission control in front of the database
+
+Requests are split into reads (GET/HEAD/OPTIONS) and writes. Each class has
+its own concurrency limit and a bounded FIFO wait queue. A request that
+cannot get a slot within the queue timeout, or finds the queue full, gets
+an immediate 503 with ``Retry-After`` instead of piling up behind SQLite's
+single writer and the connection pool. An optional per-client token bucket
+answers 429 to a single client sending too much.
+
+Limits are per worker process.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+EXEMPT_PATHS = {"/", "/health", "/docs", "/redoc", "/openapi.json"}
+
+
+class Gate:
+    """Concurrency limit with a bounded FIFO queue of waiters"""
+
+    def __init__(self, limit: int, queue_size: int, timeout: float):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.active = 0
+        self.waiters = deque()
+        self.rejected = 0
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue up to ``timeout`` seconds"""
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return True
+        if len(self.waiters) >= self.queue_size:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # The slot was handed over just as the deadline passed
+                return True
+            self.rejected += 1
+            return False
+        except asyncio.CancelledError:
+            # Client went away; pass on a slot it was just given
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+            try:
+                self.waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self):
+        """Hand the slot to the oldest live waiter, or free it"""
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class TokenBucket:
+    """Per-client token buckets refilled at ``rate`` tokens per second"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, client: str, now: Optional[float] = None) -> float:
+        """Take one token, returning 0 or the seconds until one is available"""
+        now = time.monotonic() if now is None else now
+        tokens, updated = self.buckets.pop(client, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self.buckets[client] = (tokens, now)
+        # Forget the least recently seen clients
+        while len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying read/write gates and per-client rate limits"""
+
+    def __init__(self, app, read_limit: int = 32, write_limit: int = 4,
+                 queue_size: int = 64, queue_timeout: float = 2.0,
+                 retry_after: int = 1, client_rate: float = 0,
+                 client_burst: int = 20):
+        self.app = app
+        self.gates: Dict[str, Gate] = {
+            "read": Gate(read_limit, queue_size, queue_timeout),
+            "write": Gate(write_limit, queue_size, queue_timeout),
+        }
+        self.retry_after = retry_after
+        self.bucket = TokenBucket(client_rate, client_burst) if client_rate > 0 else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if self.bucket is not None:
+            wait = self.bucket.take(self._client(scope))
+            if wait:
+                response = self._reject(429, "Rate limit exceeded", math.ceil(wait))
+                await response(scope, receive, send)
+                return
+
+        gate = self.gates["read" if scope["method"] in READ_METHODS else "write"]
+        if not await gate.acquire():
+            response = self._reject(503, "Server busy, retry later", self.retry_after)
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+    @staticmethod
+    def _client(scope) -> str:
+        """Identify clients by API key header, falling back to address"""
+        for name, value in scope.get("headers", []):
+            if name == b"x-api-key":
+                return value.decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def _reject(status_code: int, detail: str, retry_after: int) -> JSONResponse:
+        return JSONResponse(
+            {"detail": detail}, status_code=status_code,
+            headers={"Retry-After": str(max(retry_after, 1))},
+        )
@@ -0,0 +1,36 @@
+"""
+Per-request peak allocation sampling
+
+A sampled request resets the tracemalloc peak before it runs and records
+the peak afterwards under its method and route template, e.g.
+``GET /api/v1/tasks/{task_id}``. The peak counter is process-wide, so one
+request is measured at a time per worker. Only installed when
+MEMORY_TRACING_ENABLED is set.
+"""
+import random
+
+from ...utils.memory import MemoryTracker
+
+
+class MemoryMiddleware:
+    """ASGI middleware recording the peak traced memory of sampled requests"""
+
+    def __init__(self, app, tracker: MemoryTracker, sample_rate: float = 0.1):
+        self.app = app
+        self.tracker = tracker
+        self.sample_rate = sample_rate
+        tracker.start()
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http" or random.random() >= self.sample_rate
+                or not self.tracker.try_measure()):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            path = getattr(route, "path", scope["path"])
+            self.tracker.finish_measure(f"{scope['method']} {path}")
@@ -0,0 +1,167 @@
+"""
+Opt-in per-request CPU profiling
+
+A request is profiled with cProfile when it is flagged with an ``X-Profile``
+header or a ``profile`` query parameter and carries the admin token in
+``X-Admin-Token``, or when it is picked by the sampling rate. The token is
+never read from the query string, where it would end up in access logs.
+The profile is saved to a bounded ring buffer of ``.prof`` files (readable
+with ``pstats`` or snakeviz) and its ID is returned in the ``X-Profile-Id``
+response header. The middleware is only installed when PROFILING_ENABLED is
+set, so it costs nothing otherwise.
+
+cProfile follows the event loop thread: the route, service and repository
+code of async endpoints is captured, work handed to the thread pool (sync
+dependencies) is not. One request is profiled at a time per worker.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import secrets
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+from ...utils.config import Config
+
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{9}-[0-9]+-[0-9]+$")
+
+
+class ProfileStore:
+    """Directory of profiles, keeping only the newest ``max_files``"""
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = str(directory)
+        self.max_files = max_files
+        self._sequence = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def new_id(self) -> str:
+        """Unique, time ordered profile ID"""
+        self._sequence += 1
+        now = datetime.now()
+        return f"{now:%Y%m%dT%H%M%S}{now.microsecond // 1000:03d}-{os.getpid()}-{self._sequence}"
+
+    def save(self, profile_id: str, profile: cProfile.Profile, info: dict):
+        """Write a profile with its metadata, dropping the oldest beyond max_files"""
+        profile.dump_stats(self._path(profile_id, ".prof"))
+        with open(self._path(profile_id, ".json"), "w") as f:
+            json.dump(dict(info, id=profile_id, created_at=datetime.now().isoformat()), f)
+        self._prune()
+
+    def list(self) -> List[dict]:
+        """Metadata of the stored profiles, newest first"""
+        profiles = []
+        for profile_id in reversed(self._ids()):
+            try:
+                with open(self._path(profile_id, ".json")) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # pruned by another worker meanwhile
+        return profiles
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """Path of a stored ``.prof`` file, None when unknown"""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self._path(profile_id, ".prof")
+        return path if os.path.exists(path) else None
+
+    def summary(self, profile_id: str, limit: int = 50, sort: str = "cumulative") -> Optional[str]:
+        """Text report of the top functions of a profile"""
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def _ids(self) -> List[str]:
+        # IDs start with a timestamp, so names sort oldest first
+        return sorted(
+            name[:-len(".prof")] for name in os.listdir(self.directory) if name.endswith(".prof")
+        )
+
+    def _prune(self):
+        for profile_id in self._ids()[:-self.max_files or None]:
+            for suffix in (".prof", ".json"):
+                try:
+                    os.remove(self._path(profile_id, suffix))
+                except FileNotFoundError:
+                    pass
+
+    def _path(self, profile_id: str, suffix: str) -> str:
+        return os.path.join(self.directory, profile_id + suffix)
+
+
+@lru_cache(maxsize=None)
+def get_profile_store() -> ProfileStore:
+    """Process-wide store in PROFILING_DIR"""
+    return ProfileStore(Config.PROFILING_DIR, Config.PROFILING_MAX_FILES)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests on demand or at a sampling rate"""
+
+    def __init__(self, app, store: ProfileStore, sample_rate: float = 0.0,
+                 token: str = ""):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.token = token
+        self.active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.active or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self.active = True
+        profile_id = self.store.new_id()
+        status = {"code": None}
+        profile = cProfile.Profile()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.disable()
+            self.active = False
+            self.store.save(profile_id, profile, {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status["code"],
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+            })
+
+    def _wanted(self, scope) -> bool:
+        """Profile on an X-Profile header or profile query flag, else sample"""
+        headers = dict(scope["headers"])
+        query = scope.get("query_string", b"")
+        flagged = b"x-profile" in headers or (
+            b"profile" in query
+            and "profile" in parse_qs(query.decode("latin-1"), keep_blank_values=True)
+        )
+        if flagged:
+            return self._allowed(headers.get(b"x-admin-token", b"").decode("latin-1"))
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _allowed(self, value: str) -> bool:
+        """Only the admin token enables profiling on demand, never without one"""
+        return bool(self.token) and secrets.compare_digest(value.encode(), self.token.encode())
@@ -0,0 +1,61 @@
+"""
+Request-scoped logging context
+
+Every request gets an ID (taken from ``X-Request-ID`` or generated) that is
+bound to all records logged while it is handled and returned in the
+response. When it completes one access record is logged with the route
+template, status, duration and the time spent in the database.
+"""
+import logging
+import time
+import uuid
+
+from ...utils.log import bind, start_db_timer
+
+
+logger = logging.getLogger(__name__)
+
+
+class RequestContextMiddleware:
+    """ASGI middleware binding request IDs and logging one record per request"""
+
+    def __init__(self, app, log_requests: bool = True):
+        self.app = app
+        self.log_requests = log_requests
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        status = {"code": 500}
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        with bind(request_id=request_id, method=scope["method"], path=scope["path"]):
+            db_time = start_db_timer()
+            start = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                if self.log_requests:
+                    route = scope.get("route")
+                    logger.info("request", extra={
+                        "route": getattr(route, "path", None),
+                        "status": status["code"],
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                        "db_ms": round(db_time[0], 3),
+                        "db_statements": db_time[1],
+                    })
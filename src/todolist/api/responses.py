@@ -0,0 +1,107 @@
+"""
+Fast-path JSON responses for list endpoints
+
+List endpoints select only the columns of their response schema as row tuples
+and map them straight to dicts, skipping per-row ORM instances and pydantic
+validation. Routes keep their ``response_model`` so the OpenAPI schema is
+unchanged; FastAPI does not re-validate a returned ``Response``.
+"""
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi.responses import Response
+
+from .schemas.project import ProjectResponse
+from .schemas.task import TaskResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+# Column order used for row selects, identical to the response schemas
+PROJECT_FIELDS = tuple(ProjectResponse.model_fields)
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+
+# Largest ``ids`` list accepted by batch lookups, same as the list page limit
+MAX_BATCH_IDS = 1000
+# Most tags one filter or bulk operation can name
+MAX_TAGS = 20
+
+
+def _default(value: Any):
+    """Fallback encoder for the stdlib json module"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson when available, stdlib json otherwise"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Tuple[str, ...]:
+    """Parse a comma separated sparse fieldset, defaulting to all fields"""
+    if not fields:
+        return tuple(allowed)
+    selected = tuple(dict.fromkeys(field.strip() for field in fields.split(",")))
+    unknown = [field for field in selected if field not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}, available: {', '.join(allowed)}"
+        )
+    return selected
+
+
+def parse_ids(ids: Optional[str]) -> Optional[List[int]]:
+    """Parse a comma separated list of IDs for a batch lookup, None when absent"""
+    if ids is None:
+        return None
+    try:
+        parsed = list(dict.fromkeys(int(id) for id in ids.split(",") if id.strip()))
+    except ValueError:
+        raise ValueError("ids must be a comma separated list of integers")
+    if len(parsed) > MAX_BATCH_IDS:
+        raise ValueError(f"At most {MAX_BATCH_IDS} ids can be requested at once")
+    return parsed
+
+
+def parse_tags(tags: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma separated list of tag names, None when absent"""
+    if tags is None:
+        return None
+    parsed = list(dict.fromkeys(tag.strip() for tag in tags.split(",") if tag.strip()))
+    if not parsed:
+        raise ValueError("tags must name at least one tag")
+    if len(parsed) > MAX_TAGS:
+        raise ValueError(f"At most {MAX_TAGS} tags can be given at once")
+    return parsed
+
+
+def project_with_tasks(project, tasks: Iterable) -> dict:
+    """Project response dict with its tasks embedded"""
+    return dict(
+        {field: getattr(project, field) for field in PROJECT_FIELDS},
+        tasks=[{field: getattr(task, field) for field in TASK_FIELDS} for task in tasks],
+    )
+
+
+def rows_to_dicts(fields: Sequence[str], rows: Iterable[tuple]) -> List[dict]:
+    """Map row tuples to dicts keyed by the given field names"""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def rows_response(fields: Sequence[str], rows: Iterable[tuple]) -> FastJSONResponse:
+    """Build a JSON list response directly from row tuples"""
+    return FastJSONResponse(rows_to_dicts(fields, rows))
@@ -1,4 +1,5 @@
+from .jobs import router as jobs_router
 from .projects import router as projects_router
 from .tasks import router as tasks_router
 
-__all__ = ["projects_router", "tasks_router"]
\ No newline at end of file
+__all__ = ["jobs_router", "projects_router", "tasks_router"]
\ No newline at end of file
@@ -0,0 +1,200 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, PlainTextResponse
+from sqlalchemy.orm import Session
+
+from ..dependencies.admin import require_admin
+from ..dependencies.database import get_db
+from ..middleware.profiling import get_profile_store
+from ..schemas.admin import (
+    AllocationSite, CoalescingStats, MemorySnapshotInfo, PeakAllocation, ProfileInfo, SlowQuery, StatementStats,
+    WebhookCreate, WebhookInfo,
+)
+from ...db.query_log import get_query_log
+from ...repositories.outbox_repository import OutboxRepository
+from ...utils.config import Config
+from ...utils.memory import diff_stats, get_memory_tracker, top_stats
+from ...utils.single_flight import get_single_flight
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _profile_store():
+    if not Config.PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    return get_profile_store()
+
+
+def _query_log():
+    if not Config.SLOW_QUERY_LOG_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Query log is disabled")
+    return get_query_log()
+
+
+def _memory_tracker():
+    if not Config.MEMORY_TRACING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Memory tracing is disabled")
+    return get_memory_tracker()
+
+
+def _single_flight():
+    if not Config.COALESCE_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Coalescing is disabled")
+    return get_single_flight()
+
+
+def _outbox_repository(db: Session = Depends(get_db)):
+    if not Config.OUTBOX_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Outbox is disabled")
+    return OutboxRepository(db)
+
+
+def _snapshot(tracker, snapshot_id: int):
+    snapshot = tracker.snapshot(snapshot_id)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Snapshot {snapshot_id} not found"
+        )
+    return snapshot
+
+
+GROUP_BY_PATTERN = "^(lineno|filename|traceback)$"
+
+
+@router.get("/profiles", response_model=List[ProfileInfo])
+async def list_profiles(store=Depends(_profile_store)):
+    """List stored request profiles, newest first"""
+    return store.list()
+
+
+@router.get("/profiles/{profile_id}", responses={200: {"content": {"application/octet-stream": {}}}})
+async def get_profile(
+    profile_id: str,
+    format: str = Query("prof", pattern="^(prof|text)$",
+                        description="'prof' for the pstats file, 'text' for a summary"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$",
+                      description="Sort order of the text summary"),
+    store=Depends(_profile_store)
+):
+    """Download a profile, or read its top functions as text"""
+    path = store.path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+    if format == "text":
+        return PlainTextResponse(store.summary(profile_id, sort=sort))
+    return FileResponse(path, media_type="application/octet-stream",
+                        filename=f"{profile_id}.prof")
+
+
+@router.get("/queries", response_model=List[StatementStats])
+async def list_query_stats(
+    limit: int = Query(50, ge=1, le=1000, description="Number of statements"),
+    query_log=Depends(_query_log)
+):
+    """Get timings per statement fingerprint, highest total time first"""
+    return query_log.report(limit)
+
+
+@router.get("/queries/slow", response_model=List[SlowQuery])
+async def list_slow_queries(query_log=Depends(_query_log)):
+    """Get the latest statements over SLOW_QUERY_THRESHOLD_MS, newest first"""
+    return query_log.recent()
+
+
+@router.delete("/queries", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_stats(query_log=Depends(_query_log)):
+    """Reset statement timings and the slow statement list"""
+    query_log.reset()
+
+
+@router.post("/memory/snapshots", response_model=MemorySnapshotInfo,
+             status_code=status.HTTP_201_CREATED)
+async def take_memory_snapshot(
+    label: str = Query("", max_length=100, description="Name to recognise the snapshot by"),
+    tracker=Depends(_memory_tracker)
+):
+    """Take a tracemalloc snapshot, the oldest is dropped beyond MEMORY_TRACE_MAX_SNAPSHOTS"""
+    return tracker.take_snapshot(label)
+
+
+@router.get("/memory/snapshots", response_model=List[MemorySnapshotInfo])
+async def list_memory_snapshots(tracker=Depends(_memory_tracker)):
+    """List stored snapshots, oldest first"""
+    return tracker.list_snapshots()
+
+
+@router.get("/memory/snapshots/{snapshot_id}/top", response_model=List[AllocationSite])
+async def get_memory_top(
+    snapshot_id: int,
+    limit: int = Query(20, ge=1, le=200),
+    group_by: str = Query("lineno", pattern=GROUP_BY_PATTERN),
+    tracker=Depends(_memory_tracker)
+):
+    """Get the largest allocation sites of a snapshot"""
+    return top_stats(_snapshot(tracker, snapshot_id), limit, group_by)
+
+
+@router.get("/memory/diff", response_model=List[AllocationSite])
+async def get_memory_diff(
+    from_id: int = Query(..., alias="from", description="Older snapshot ID"),
+    to_id: int = Query(..., alias="to", description="Newer snapshot ID"),
+    limit: int = Query(20, ge=1, le=200),
+    group_by: str = Query("lineno", pattern=GROUP_BY_PATTERN),
+    tracker=Depends(_memory_tracker)
+):
+    """Get the allocation sites that grew the most between two snapshots"""
+    return diff_stats(_snapshot(tracker, from_id), _snapshot(tracker, to_id), limit, group_by)
+
+
+@router.get("/memory/requests", response_model=List[PeakAllocation])
+async def get_request_peaks(tracker=Depends(_memory_tracker)):
+    """Get peak allocations of sampled requests per route, largest first"""
+    return tracker.peak_stats()
+
+
+@router.delete("/memory", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_memory_stats(tracker=Depends(_memory_tracker)):
+    """Drop stored snapshots and request peaks"""
+    tracker.reset()
+
+
+@router.get("/coalescing", response_model=List[CoalescingStats])
+async def list_coalescing_stats(single_flight=Depends(_single_flight)):
+    """Coalesced reads with how many calls shared a query or hit the cache"""
+    return single_flight.stats_list()
+
+
+@router.delete("/coalescing", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_coalescing_stats(single_flight=Depends(_single_flight)):
+    """Reset coalescing stats and drop cached results"""
+    single_flight.reset()
+
+
+@router.post("/webhooks", response_model=WebhookInfo, status_code=status.HTTP_201_CREATED)
+async def create_webhook(webhook: WebhookCreate, outbox_repo=Depends(_outbox_repository)):
+    """Register an endpoint for outbox events, delivered by the webhook dispatcher"""
+    return outbox_repo.add_endpoint(webhook.url, webhook.event_types, webhook.from_start)
+
+
+@router.get("/webhooks", response_model=List[WebhookInfo])
+async def list_webhooks(outbox_repo=Depends(_outbox_repository)):
+    """List endpoints with their delivery state and undelivered event counts"""
+    pending = outbox_repo.pending_counts()
+    return [
+        WebhookInfo.model_validate(endpoint).model_copy(update={"pending": pending.get(endpoint.id, 0)})
+        for endpoint in outbox_repo.get_endpoints()
+    ]
+
+
+@router.delete("/webhooks/{endpoint_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_webhook(endpoint_id: int, outbox_repo=Depends(_outbox_repository)):
+    """Unregister an endpoint"""
+    if not outbox_repo.delete_endpoint(endpoint_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Webhook endpoint {endpoint_id} not found"
+        )
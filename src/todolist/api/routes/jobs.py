@@ -0,0 +1,72 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from ..dependencies.admin import require_admin
+from ..dependencies.database import get_db
+from ..schemas.job import JobCreate, JobResponse
+from ...commands.jobs import JOB_KINDS
+from ...models.job import Job
+from ...repositories.job_repository import JobRepository
+from ...services.job_service import JobService
+from ...exceptions.service_exceptions import ValidationError
+
+router = APIRouter()
+
+STATUS_PATTERN = f"^({'|'.join(Job.STATUSES)})$"
+
+
+def get_job_service(db: Session = Depends(get_db)):
+    """Dependency for job service"""
+    return JobService(JobRepository(db), JOB_KINDS)
+
+
+def _job_or_404(job: Optional[Job], job_id: int) -> Job:
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id {job_id} not found"
+        )
+    return job
+
+
+@router.post("/", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED,
+             dependencies=[Depends(require_admin)])
+async def submit_job(
+    job_data: JobCreate,
+    job_service: JobService = Depends(get_job_service)
+):
+    """Queue a command as a background job, follow it with GET /jobs/{id}"""
+    try:
+        return job_service.submit(job_data.kind, job_data.params)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/", response_model=List[JobResponse])
+async def list_jobs(
+    status_: Optional[str] = Query(None, alias="status", pattern=STATUS_PATTERN),
+    limit: int = Query(100, ge=1, le=1000),
+    job_service: JobService = Depends(get_job_service)
+):
+    """List jobs, newest first"""
+    return job_service.get_jobs(status_, limit)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    job_service: JobService = Depends(get_job_service)
+):
+    """Get the status, progress and result of a job"""
+    return _job_or_404(job_service.get_job(job_id), job_id)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse,
+             dependencies=[Depends(require_admin)])
+async def cancel_job(
+    job_id: int,
+    job_service: JobService = Depends(get_job_service)
+):
+    """Cancel a queued job, a running job stops at its next progress report"""
+    return _job_or_404(job_service.cancel_job(job_id), job_id)
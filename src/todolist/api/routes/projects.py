@@ -1,27 +1,46 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-
-from ..dependencies.database import get_db
-from ..schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats
-from ...repositories.project_repository import ProjectRepository
-from ...repositories.task_repository import TaskRepository
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import JSONResponse
+
+from ..dependencies.repositories import (
+    get_archive_repository, get_event_repository, get_project_repository, get_task_repository
+)
+from ..responses import (
+    PROJECT_FIELDS, FastJSONResponse, parse_ids, project_with_tasks, rows_response
+)
+from ..schemas.project import (
+    LeadTimeStats, ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats, ProjectWithTasks,
+    PurgeProgress, ThroughputDay,
+)
+from .jobs import get_job_service
+from ...models.job import Job
+from ...services.job_service import JobService
 from ...services.project_service import ProjectService
-from ...exceptions.service_exceptions import ValidationError
-from ...exceptions.repository_exceptions import NotFoundError, DuplicateError
+from ...exceptions.service_exceptions import ConflictError, ValidationError
+from ...exceptions.repository_exceptions import NotFoundError
+from ...utils.config import Config
 
 router = APIRouter()
 
+# Write endpoints are plain functions run in the threadpool: with the write
+# coordinator they wait for their batch's commit without blocking the event
+# loop, so concurrent writes share one commit
+
+INCLUDE_DESCRIPTION = "Set to 'tasks' to embed each project's tasks"
+
 
-def get_project_service(db: Session = Depends(get_db)):
+def get_project_service(
+    project_repo=Depends(get_project_repository),
+    task_repo=Depends(get_task_repository),
+    archive_repo=Depends(get_archive_repository),
+    event_repo=Depends(get_event_repository)
+):
     """Dependency for project service"""
-    project_repo = ProjectRepository(db)
-    task_repo = TaskRepository(db)
-    return ProjectService(project_repo, task_repo)
+    return ProjectService(project_repo, task_repo, archive_repo, event_repo)
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-async def create_project(
+def create_project(
     project_data: ProjectCreate,
     project_service: ProjectService = Depends(get_project_service)
 ):
@@ -32,37 +51,64 @@ async def create_project(
             description=project_data.description
         )
         return project
+    except ConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except DuplicateError as e:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
-@router.get("/", response_model=List[ProjectResponse])
-async def list_projects(
+@router.get(
+    "/", response_model=List[ProjectResponse],
+    responses={200: {"model": List[ProjectWithTasks], "description": "Projects, with tasks if included"}}
+)
+def list_projects(
+    ids: str = Query(None, description="Comma separated project IDs to fetch"),
+    include: str = Query(None, pattern="^tasks$", description=INCLUDE_DESCRIPTION),
     project_service: ProjectService = Depends(get_project_service)
 ):
-    """Get all projects"""
-    return project_service.get_all_projects()
-
-
-@router.get("/{project_id}", response_model=ProjectResponse)
+    """
+    Get all projects, or a batch of them with ``?ids=1,2,3``. With
+    ``include=tasks`` all tasks are loaded in one more query.
+    Runs in the threadpool, so identical concurrent lists are coalesced.
+    """
+    try:
+        project_ids = parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if include == "tasks":
+        return FastJSONResponse([
+            project_with_tasks(project, tasks)
+            for project, tasks in project_service.get_projects_with_tasks(project_ids)
+        ])
+    return rows_response(PROJECT_FIELDS, project_service.get_project_rows(PROJECT_FIELDS, project_ids))
+
+
+@router.get(
+    "/{project_id}", response_model=ProjectResponse,
+    responses={200: {"model": ProjectWithTasks, "description": "Project, with tasks if included"}}
+)
 async def get_project(
     project_id: int,
+    include: str = Query(None, pattern="^tasks$", description=INCLUDE_DESCRIPTION),
     project_service: ProjectService = Depends(get_project_service)
 ):
     """Get a specific project by ID"""
-    project = project_service.get_project(project_id)
+    if include == "tasks":
+        found = project_service.get_projects_with_tasks([project_id])
+        project = project_with_tasks(*found[0]) if found else None
+    else:
+        project = project_service.get_project(project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found"
         )
-    return project
+    return FastJSONResponse(project) if include == "tasks" else project
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
-async def update_project(
+def update_project(
     project_id: int,
     project_data: ProjectUpdate,
     project_service: ProjectService = Depends(get_project_service)
@@ -71,10 +117,12 @@ async def update_project(
     try:
         project = project_service.update_project(
             project_id=project_id,
-            name=project_data.name or "",
-            description=project_data.description or ""
+            name=project_data.name,
+            description=project_data.description
         )
         return project
+    except ConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except NotFoundError:
@@ -82,16 +130,46 @@ async def update_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project with id {project_id} not found"
         )
-    except DuplicateError as e:
-        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_project(
+# Job statuses as reported by the purge endpoints
+PURGE_STATUSES = {"queued": "scheduled", "running": "running", "succeeded": "done",
+                  "failed": "failed", "cancelled": "cancelled"}
+
+
+def _purge_progress(job: Job) -> dict:
+    status_ = PURGE_STATUSES[job.status]
+    if status_ == "done" and job.result and not job.result.get("found", True):
+        status_ = "not_found"
+    return {
+        "project_id": job.project_id,
+        "job_id": job.id,
+        "status": status_,
+        "deleted_tasks": job.progress_current,
+        "total_tasks": job.progress_total,
+        "error": job.error,
+    }
+
+
+@router.delete(
+    "/{project_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={202: {"model": PurgeProgress, "description": "Large project purge scheduled"}}
+)
+def delete_project(
     project_id: int,
-    project_service: ProjectService = Depends(get_project_service)
+    project_service: ProjectService = Depends(get_project_service),
+    job_service: JobService = Depends(get_job_service)
 ):
-    """Delete a project"""
+    """Delete a project, large projects are purged by a background job"""
+    if (Config.REPOSITORY_BACKEND == "sqlalchemy"
+            and project_service.requires_background_purge(project_id)):
+        job = job_service.get_latest_job("purge_project", project_id)
+        if job is None or job.finished:
+            job = job_service.submit("purge_project", {"project_id": project_id})
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=_purge_progress(job),
+                            headers={"Location": f"/api/v1/jobs/{job.id}"})
+    
     success = project_service.delete_project(project_id)
     if not success:
         raise HTTPException(
@@ -100,14 +178,66 @@ async def delete_project(
         )
 
 
+@router.get("/{project_id}/purge", response_model=PurgeProgress)
+async def get_project_purge(
+    project_id: int,
+    job_service: JobService = Depends(get_job_service)
+):
+    """Get the progress of the latest background purge of a project"""
+    job = job_service.get_latest_job("purge_project", project_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No purge found for project with id {project_id}"
+        )
+    return _purge_progress(job)
+
+
 @router.get("/{project_id}/stats", response_model=ProjectStats)
-async def get_project_statistics(
+def get_project_statistics(
     project_id: int,
+    include_archived: bool = Query(False, description="Add archived task totals"),
     project_service: ProjectService = Depends(get_project_service)
 ):
-    """Get statistics for a project"""
+    """Get statistics for a project, concurrent identical requests share one query"""
     try:
-        stats = project_service.get_project_stats(project_id)
+        stats = project_service.get_project_stats(project_id, include_archived=include_archived)
         return stats
     except ValidationError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/{project_id}/throughput", response_model=List[ThroughputDay])
+async def get_project_throughput(
+    project_id: int,
+    days: int = Query(30, ge=1, le=366, description="Number of days, today included"),
+    status_: str = Query("done", alias="status", pattern="^(todo|doing|done)$",
+                         description="Count tasks moving into this status"),
+    project_service: ProjectService = Depends(get_project_service)
+):
+    """Get the number of tasks reaching a status per day"""
+    try:
+        return project_service.get_throughput(project_id, days, status_)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/{project_id}/lead-time", response_model=LeadTimeStats)
+async def get_project_lead_time(
+    project_id: int,
+    days: int = Query(30, ge=1, le=366, description="Tasks completed in the last N days"),
+    percentiles: str = Query("50,90,95", pattern=r"^\d+(\.\d+)?(,\d+(\.\d+)?)*$",
+                             description="Comma separated percentiles"),
+    project_service: ProjectService = Depends(get_project_service)
+):
+    """Get lead time percentiles, in seconds from creation to done"""
+    values = [float(p) for p in percentiles.split(",")]
+    if any(not 0 < p <= 100 for p in values):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Percentiles must be greater than 0 and at most 100"
+        )
+    try:
+        return project_service.get_lead_time(project_id, days, values)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -1,46 +1,51 @@
+from datetime import datetime
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from starlette.status import HTTP_400_BAD_REQUEST
 
-from ..dependencies.database import get_db
-from ..schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskStatusUpdate
-from ...repositories.task_repository import TaskRepository
-from ...repositories.project_repository import ProjectRepository
+from ..dependencies.repositories import (
+    get_archive_repository, get_dependency_repository, get_rank_repository, get_tag_repository,
+    get_task_repository,
+)
+from ..responses import TASK_FIELDS, parse_fields, parse_ids, parse_tags, rows_response
+from ..schemas.task import (
+    TaskCreate, TaskUpdate, TaskResponse, TaskStatusUpdate, TaskDependencyCreate,
+    TaskDependencyResponse, TaskTagsUpdate, TaskTagsResult, TagCount, TaskMove,
+)
+from .jobs import get_job_service
+from ...repositories.task_query import SORTABLE_COLUMNS, TaskQuery, parse_sort
+from ...services.job_service import JobService
 from ...services.task_service import TaskService
-from ...services.project_service import ProjectService
 from ...exceptions.service_exceptions import ValidationError
-from ...exceptions.repository_exceptions import NotFoundError
+from ...exceptions.repository_exceptions import NotFoundError, RebalanceRequiredError
+from ...utils.config import Config
 
 router = APIRouter()
 
-def get_task_service(db: Session = Depends(get_db)):
-    """Dependency for task service"""
-    task_repo = TaskRepository(db)
-    return TaskService(task_repo)
+# Write endpoints are plain functions run in the threadpool: with the write
+# coordinator they wait for their batch's commit without blocking the event
+# loop, so concurrent writes share one commit
 
+STATUS_PATTERN = "(todo|doing|done)"
 
-def get_project_service(db: Session = Depends(get_db)):
-    """Dependency for project service"""
-    project_repo = ProjectRepository(db)
-    task_repo = TaskRepository(db)
-    return ProjectService(project_repo, task_repo)
+def get_task_service(
+    task_repo=Depends(get_task_repository),
+    archive_repo=Depends(get_archive_repository),
+    dependency_repo=Depends(get_dependency_repository),
+    tag_repo=Depends(get_tag_repository),
+    rank_repo=Depends(get_rank_repository)
+):
+    """Dependency for task service"""
+    return TaskService(task_repo, archive_repo, dependency_repo, tag_repo, rank_repo)
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(
+def create_task(
     task_data: TaskCreate,
-    task_service: TaskService = Depends(get_task_service),
-    project_service: ProjectService = Depends(get_project_service)
+    task_service: TaskService = Depends(get_task_service)
 ):
     """Create a new task"""
     try:
-        # Check if project exists
-        if not project_service.project_exists(task_data.project_id):
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Project with id {task_data.project_id} not found"
-            )
-        
         task = task_service.create_task(
             project_id=task_data.project_id,
             title=task_data.title,
@@ -50,35 +55,80 @@ async def create_task(
         return task
     except ValidationError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except NotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project with id {task_data.project_id} not found"
+        )
 
 
 @router.get("/", response_model=List[TaskResponse])
 async def list_tasks(
     project_id: int = Query(None, description="Filter by project ID"),
-    status: str = Query(None, description="Filter by status", pattern="^(todo|doing|done)$"),
+    ids: str = Query(None, description="Comma separated task IDs to fetch"),
+    status: str = Query(
+        None, description="Filter by status, comma separated for several",
+        pattern=f"^{STATUS_PATTERN}(,{STATUS_PATTERN})*$"
+    ),
+    deadline_from: datetime = Query(None, description="Deadline at or after"),
+    deadline_to: datetime = Query(None, description="Deadline before"),
+    created_from: datetime = Query(None, description="Created at or after"),
+    created_to: datetime = Query(None, description="Created before"),
+    updated_from: datetime = Query(None, description="Updated at or after"),
+    updated_to: datetime = Query(None, description="Updated before"),
+    overdue: bool = Query(False, description="Only unfinished tasks past their deadline"),
+    upcoming_days: int = Query(
+        None, ge=0, description="Only unfinished tasks due within this many days"
+    ),
+    tags: str = Query(None, description="Comma separated tag names"),
+    match: str = Query("any", pattern="^(any|all)$",
+                       description="Tasks with any or with all of the tags"),
+    sort: str = Query(
+        None, description=f"Comma separated sort columns, '-' for descending: "
+                          f"{', '.join(SORTABLE_COLUMNS)}; 'rank' is the manual board order"
+    ),
+    fields: str = Query(None, description="Comma separated response fields to return"),
+    limit: int = Query(None, ge=1, le=1000, description="Maximum number of tasks"),
+    offset: int = Query(0, ge=0, description="Number of tasks to skip"),
+    include_archived: bool = Query(False, description="Include archived tasks"),
     task_service: TaskService = Depends(get_task_service)
 ):
-    """Get tasks with optional filtering"""
-    if project_id is not None:
-        tasks = task_service.get_tasks_by_project(project_id)
-    else:
-        # For simplicity, get all tasks if no filter
-        # In real app, you might want pagination here
-        tasks = task_service.task_repo.get_all()
-    
-    if status:
-        tasks = [t for t in tasks if t.status == status]
+    """
+    Get tasks with filtering, sorting, paging and sparse fieldsets,
+    e.g. ``?upcoming_days=7&sort=deadline&limit=20&fields=id,title``.
+    ``?ids=1,2,3`` fetches a batch of tasks with one IN query and
+    ``?tags=a,b&match=all`` keeps tasks with both tags.
+    """
+    try:
+        query = TaskQuery(
+            project_id=project_id, ids=parse_ids(ids),
+            statuses=status.split(",") if status else None,
+            deadline_from=deadline_from, deadline_to=deadline_to,
+            created_from=created_from, created_to=created_to,
+            updated_from=updated_from, updated_to=updated_to,
+            overdue=overdue, upcoming_days=upcoming_days,
+            tags=parse_tags(tags), match_all_tags=match == "all",
+            sort=parse_sort(sort), limit=limit, offset=offset,
+        )
+        columns = parse_fields(fields, TASK_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
     
-    return tasks
+    try:
+        rows = task_service.get_task_rows(columns, query, include_archived=include_archived)
+    except ValidationError as e:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail=str(e))
+    return rows_response(columns, rows)
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
+    include_archived: bool = Query(False, description="Also look in archived tasks"),
     task_service: TaskService = Depends(get_task_service)
 ):
     """Get a specific task by ID"""
-    task = task_service.get_task(task_id)
+    task = task_service.get_task(task_id, include_archived=include_archived)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -88,24 +138,19 @@ async def get_task(
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
-async def update_task(
+def update_task(
     task_id: int,
     task_data: TaskUpdate,
     task_service: TaskService = Depends(get_task_service)
 ):
-    """Update a task"""
+    """Update a task, fields left out of the request are preserved"""
     try:
-        # Get current task to preserve fields not being updated
-        current_task = task_service.get_task(task_id)
-        if not current_task:
-            raise NotFoundError("Task", task_id)
-        
         task = task_service.update_task(
             task_id=task_id,
-            title=task_data.title or current_task.title,
-            description=task_data.description or current_task.description,
-            status=task_data.status or current_task.status,
-            deadline=task_data.deadline if task_data.deadline is not None else current_task.deadline
+            title=task_data.title,
+            description=task_data.description,
+            status=task_data.status,
+            deadline=task_data.deadline
         )
         return task
     except ValidationError as e:
@@ -118,7 +163,7 @@ async def update_task(
 
 
 @router.patch("/{task_id}/status", response_model=TaskResponse)
-async def update_task_status(
+def update_task_status(
     task_id: int,
     status_update: TaskStatusUpdate,
     task_service: TaskService = Depends(get_task_service)
@@ -137,7 +182,7 @@ async def update_task_status(
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(
+def delete_task(
     task_id: int,
     task_service: TaskService = Depends(get_task_service)
 ):
@@ -151,9 +196,169 @@ async def delete_task(
 
 
 @router.get("/overdue/", response_model=List[TaskResponse])
-async def get_overdue_tasks(
+def get_overdue_tasks(
     project_id: int = Query(None, description="Filter by project ID"),
     task_service: TaskService = Depends(get_task_service)
 ):
-    """Get overdue tasks"""
-    return task_service.get_overdue_tasks(project_id)
\ No newline at end of file
+    """Get overdue tasks, concurrent identical requests share one query"""
+    query = TaskQuery(project_id=project_id, overdue=True)
+    return rows_response(TASK_FIELDS, task_service.get_task_rows(TASK_FIELDS, query))
+
+
+def _queue_rebalance(job_service: JobService, project_id: int, status_: str = None):
+    """Queue a rebalance of the project's columns unless one is pending"""
+    job = job_service.get_latest_job("rebalance_ranks", project_id)
+    if job is None or job.finished:
+        params = {"project_id": project_id}
+        if status_ is not None:
+            params["status"] = status_
+        job_service.submit("rebalance_ranks", params)
+
+
+@router.post("/{task_id}/move", response_model=TaskResponse)
+def move_task(
+    task_id: int,
+    move_data: TaskMove,
+    task_service: TaskService = Depends(get_task_service),
+    job_service: JobService = Depends(get_job_service)
+):
+    """
+    Move a task right before or after another task of its project and
+    status, or to the end of the column; list the column with ``sort=rank``
+    """
+    try:
+        task = task_service.move_task(task_id, move_data.before_id, move_data.after_id)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except RebalanceRequiredError as e:
+        # Too long to respace during the request, retry once the job is done
+        _queue_rebalance(job_service, e.details["project_id"], e.details["status"])
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    
+    if len(task.rank) > Config.RANK_MAX_LENGTH:
+        # Keys grow when many tasks are moved into one gap, respace the column
+        _queue_rebalance(job_service, task.project_id)
+    return task
+
+
+@router.get("/ready/", response_model=List[TaskResponse])
+async def get_ready_tasks(
+    project_id: int = Query(..., description="Project to list ready tasks of"),
+    limit: int = Query(None, ge=1, le=1000),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Get tasks still to do whose blockers are all done"""
+    try:
+        return task_service.get_ready_tasks(project_id, limit)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/{task_id}/blockers", response_model=TaskDependencyResponse,
+             status_code=status.HTTP_201_CREATED)
+def add_task_blocker(
+    task_id: int,
+    dependency_data: TaskDependencyCreate,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Make a task wait for another task of its project"""
+    try:
+        return task_service.add_blocker(task_id, dependency_data.blocker_id)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except NotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.delete("/{task_id}/blockers/{blocker_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_task_blocker(
+    task_id: int,
+    blocker_id: int,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Remove a blocker from a task"""
+    try:
+        removed = task_service.remove_blocker(task_id, blocker_id)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not removed:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task {task_id} is not blocked by task {blocker_id}"
+        )
+
+
+@router.get("/{task_id}/blockers", response_model=List[TaskResponse])
+async def get_task_blockers(
+    task_id: int,
+    transitive: bool = Query(True, description="Include blockers of blockers"),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Get the tasks a task waits for"""
+    try:
+        return task_service.get_blockers(task_id, transitive)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{task_id}/dependents", response_model=List[TaskResponse])
+async def get_task_dependents(
+    task_id: int,
+    transitive: bool = Query(True, description="Include dependents of dependents"),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Get the tasks waiting for a task"""
+    try:
+        return task_service.get_dependents(task_id, transitive)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/tags/add", response_model=TaskTagsResult)
+def tag_tasks(
+    tags_data: TaskTagsUpdate,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Add tags to many tasks, unknown tags are created and unknown tasks skipped"""
+    try:
+        return {"changed": task_service.tag_tasks(tags_data.task_ids, tags_data.tags)}
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/tags/remove", response_model=TaskTagsResult)
+def untag_tasks(
+    tags_data: TaskTagsUpdate,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Remove tags from many tasks"""
+    try:
+        return {"changed": task_service.untag_tasks(tags_data.task_ids, tags_data.tags)}
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/tags/counts", response_model=List[TagCount])
+async def get_tag_counts(
+    project_id: int = Query(None, description="Filter by project ID"),
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Get the number of tasks per tag and project"""
+    try:
+        return task_service.get_tag_counts(project_id)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{task_id}/tags", response_model=List[str])
+async def get_task_tags(
+    task_id: int,
+    task_service: TaskService = Depends(get_task_service)
+):
+    """Get the tag names of a task"""
+    try:
+        return task_service.get_task_tags(task_id)
+    except ValidationError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -1,11 +1,20 @@
-from .project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats
+from .job import JobCreate, JobResponse
+from .project import (
+    LeadTimeStats, ProjectCreate, ProjectUpdate, ProjectResponse, ProjectStats, PurgeProgress,
+    ThroughputDay,
+)
 from .task import TaskCreate, TaskUpdate, TaskResponse, TaskStatusUpdate
 
 __all__ = [
+    "JobCreate",
+    "JobResponse",
     "ProjectCreate",
     "ProjectUpdate", 
     "ProjectResponse",
     "ProjectStats",
+    "PurgeProgress",
+    "ThroughputDay",
+    "LeadTimeStats",
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
@@ -0,0 +1,100 @@
+from datetime import datetime
+from typing import Any, List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ProfileInfo(BaseModel):
+    """Schema for a stored request profile"""
+    id: str
+    method: str
+    path: str
+    status: Optional[int] = None
+    duration_ms: float
+    created_at: datetime
+
+
+class StatementStats(BaseModel):
+    """Schema for the timings of one statement fingerprint"""
+    fingerprint: str
+    statement: str
+    count: int
+    total_ms: float
+    mean_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    max_ms: float
+
+
+class SlowQuery(BaseModel):
+    """Schema for a statement slower than the threshold"""
+    time: datetime
+    fingerprint: str
+    duration_ms: float
+    statement: str
+    parameters: Any = None
+    caller: Optional[str] = None
+    plan: Optional[List[str]] = None
+
+
+class MemorySnapshotInfo(BaseModel):
+    """Schema for a stored tracemalloc snapshot"""
+    id: int
+    label: str
+    created_at: datetime
+    traced_bytes: int
+    peak_bytes: int
+    max_rss_kb: Optional[int] = None
+
+
+class AllocationSite(BaseModel):
+    """Schema for memory allocated at one site, or its change between snapshots"""
+    site: str
+    traceback: Optional[List[str]] = None
+    size: int
+    count: int
+    size_diff: Optional[int] = None
+    count_diff: Optional[int] = None
+
+
+class PeakAllocation(BaseModel):
+    """Schema for sampled peak allocations of one route"""
+    name: str
+    count: int
+    total_bytes: int
+    mean_bytes: int
+    max_bytes: int
+    last_bytes: int
+
+
+class CoalescingStats(BaseModel):
+    """Single-flight outcomes of one coalesced read"""
+    name: str
+    calls: int
+    executions: int = Field(..., description="Calls that ran the query")
+    shared: int = Field(..., description="Calls that waited for an identical one in flight")
+    cached: int = Field(..., description="Calls served from the micro-cache")
+    in_flight: int
+    saved_ratio: Optional[float] = None
+
+
+class WebhookCreate(BaseModel):
+    """Schema for registering a webhook endpoint"""
+    url: str = Field(..., max_length=500, pattern=r"^https?://")
+    event_types: Optional[str] = Field(
+        None, max_length=200, description="Comma separated event types or prefixes, e.g. 'task.'"
+    )
+    from_start: bool = Field(False, description="Also deliver the events already in the outbox")
+
+
+class WebhookInfo(BaseModel):
+    """Schema for a webhook endpoint and its delivery state"""
+    id: int
+    url: str
+    event_types: Optional[str] = None
+    cursor: int
+    failures: int
+    next_attempt_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    pending: int = 0
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class JobCreate(BaseModel):
+    """Schema for submitting a background job"""
+    kind: str = Field(..., min_length=1, max_length=50)
+    params: Dict[str, Any] = Field(default_factory=dict,
+                                   description="Arguments of the job's command function")
+
+
+class JobResponse(BaseModel):
+    """Schema for a background job and its progress"""
+    id: int
+    kind: str
+    params: Dict[str, Any]
+    project_id: Optional[int] = None
+    status: str
+    progress_current: int
+    progress_total: Optional[int] = None
+    cancel_requested: bool
+    result: Optional[Dict[str, Any]] = None
+    result_location: Optional[str] = None
+    error: Optional[str] = None
+    worker: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,8 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
+from .task import TaskResponse
 from ...utils.config import Config
 
 
@@ -31,10 +32,40 @@ class ProjectResponse(ProjectBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProjectWithTasks(ProjectResponse):
+    """Schema for a project response with its tasks embedded"""
+    tasks: List[TaskResponse]
+
+
 class ProjectStats(BaseModel):
     """Schema for project statistics"""
     project: ProjectResponse
     total_tasks: int
     status_count: dict[str, int]
     
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PurgeProgress(BaseModel):
+    """Schema for the progress of a background project purge"""
+    project_id: int
+    job_id: Optional[int] = None
+    status: str
+    deleted_tasks: int = 0
+    total_tasks: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ThroughputDay(BaseModel):
+    """Schema for the number of tasks reaching a status on one day"""
+    day: date
+    count: int
+
+
+class LeadTimeStats(BaseModel):
+    """Schema for lead times (seconds from creation to done) of a project"""
+    project_id: int
+    days: int
+    count: int
+    mean_seconds: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]
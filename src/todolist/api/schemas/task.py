@@ -1,10 +1,16 @@
 from datetime import datetime, date
-from typing import Optional
+from typing import Annotated, List, Optional
 from pydantic import BaseModel, Field, ConfigDict
 
 from ...utils.config import Config
 
 
+# Tag names are used in comma separated filters
+TagName = Annotated[str, Field(
+    min_length=1, max_length=Config.MAX_TAG_NAME_LENGTH, pattern=r"^[^,\s]([^,]*[^,\s])?$"
+)]
+
+
 class TaskBase(BaseModel):
     """Base schema for task data"""
     title: str = Field(..., min_length=1, max_length=Config.MAX_TASK_TITLE_LENGTH)
@@ -39,4 +45,42 @@ class TaskResponse(TaskBase):
     created_at: datetime
     updated_at: datetime
     
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskTagsUpdate(BaseModel):
+    """Schema for adding tags to, or removing them from, many tasks"""
+    task_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    tags: List[TagName] = Field(..., min_length=1, max_length=20)
+
+
+class TaskTagsResult(BaseModel):
+    """Schema for the result of a bulk tag operation"""
+    changed: int
+
+
+class TagCount(BaseModel):
+    """Schema for the number of tasks with a tag in a project"""
+    project_id: int
+    tag: str
+    count: int
+
+
+class TaskMove(BaseModel):
+    """Schema for moving a task within its board column"""
+    before_id: Optional[int] = Field(None, description="Place the task right before this one")
+    after_id: Optional[int] = Field(None, description="Place the task right after this one")
+
+
+class TaskDependencyCreate(BaseModel):
+    """Schema for adding a blocker to a task"""
+    blocker_id: int
+
+
+class TaskDependencyResponse(BaseModel):
+    """Schema for a blocking relationship"""
+    task_id: int
+    blocker_id: int
+    created_at: datetime
+    
     model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
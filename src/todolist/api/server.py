@@ -0,0 +1,94 @@
+"""
+Production server entry point
+
+Runs the API under uvicorn with one worker process per CPU. The app is
+passed as an import string, so the supervisor never imports it and every
+worker creates its own database engine and connection pool after it starts.
+"""
+import importlib.util
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import uvicorn
+
+from ..utils.config import Config
+from ..utils.log import configure_logging
+
+
+logger = logging.getLogger(__name__)
+
+APP = "src.todolist.api.main:app"
+
+
+def worker_count(workers: Optional[int] = None) -> int:
+    """Resolve the number of worker processes, 0 meaning one per CPU"""
+    workers = Config.API_WORKERS if workers is None else workers
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    # Each process would hold its own copy of the in-memory store
+    if Config.REPOSITORY_BACKEND == "memory" and workers > 1:
+        logger.warning("memory backend keeps data per process, running a single worker")
+        workers = 1
+    return workers
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def server_options(host: Optional[str] = None, port: Optional[int] = None,
+                   workers: Optional[int] = None) -> Dict[str, Any]:
+    """Build uvicorn.run() keyword arguments from Config"""
+    options = {
+        "host": host or Config.API_HOST,
+        "port": port or Config.API_PORT,
+        "workers": worker_count(workers),
+        "loop": Config.API_LOOP,
+        "http": Config.API_HTTP,
+        "timeout_graceful_shutdown": Config.API_GRACEFUL_TIMEOUT,
+        "timeout_keep_alive": Config.API_KEEPALIVE_TIMEOUT,
+        "proxy_headers": True,
+        "access_log": False,
+    }
+    if Config.API_MAX_REQUESTS > 0:
+        # The worker exits after this many requests, see run()
+        options["limit_max_requests"] = Config.API_MAX_REQUESTS
+    return options
+
+
+def run(host: Optional[str] = None, port: Optional[int] = None,
+        workers: Optional[int] = None):
+    """
+    Serve the API with multiple workers
+
+    On SIGTERM in-flight requests get API_GRACEFUL_TIMEOUT seconds to finish
+    and shutdown hooks run in every worker. The uvicorn 0.24 supervisor does
+    not restart workers that exit, so API_MAX_REQUESTS shrinks the pool
+    unless an external supervisor (systemd, gunicorn with uvicorn workers)
+    restarts them.
+    """
+    options = server_options(host, port, workers)
+    loop = "uvloop" if options["loop"] == "auto" and _available("uvloop") else options["loop"]
+    http = "httptools" if options["http"] == "auto" and _available("httptools") else options["http"]
+    logger.info("serving", extra={"app": APP, "host": options["host"], "port": options["port"],
+                                  "workers": options["workers"], "loop": loop, "http": http})
+    uvicorn.run(APP, **options)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the ToDoList API server")
+    parser.add_argument("--host", help=f"Bind address (default: {Config.API_HOST})")
+    parser.add_argument("--port", type=int, help=f"Port (default: {Config.API_PORT})")
+    parser.add_argument("--workers", type=int,
+                        help="Worker processes, 0 for one per CPU (default: API_WORKERS)")
+
+    args = parser.parse_args()
+    configure_logging()
+    run(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
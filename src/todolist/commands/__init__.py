@@ -1,4 +1,22 @@
+from .analytics_report import analytics_report
+from .archive_done_tasks import archive_done_tasks
 from .autoclose_overdue import auto_close_overdue_tasks
+from .dispatch_webhooks import add_webhook, dispatch_webhooks
+from .jobs import JOB_KINDS, run_job_worker
+from .purge_project import purge_project
 from .scheduler import run_scheduler
+from .shards import init_shards, move_project
 
-__all__ = ["auto_close_overdue_tasks", "run_scheduler"]
\ No newline at end of file
+__all__ = [
+    "analytics_report",
+    "archive_done_tasks",
+    "auto_close_overdue_tasks",
+    "add_webhook",
+    "dispatch_webhooks",
+    "init_shards",
+    "JOB_KINDS",
+    "move_project",
+    "purge_project",
+    "run_job_worker",
+    "run_scheduler",
+]
\ No newline at end of file
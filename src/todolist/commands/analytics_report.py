@@ -0,0 +1,94 @@
+"""
+Command to build deadline and backlog reports for capacity planning
+"""
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+
+from ..analytics.task_arrays import require_numpy
+from ..db.session import SessionLocal
+from ..utils.log import configure_logging, log_job
+from ..utils.memory import trace_memory
+
+
+logger = logging.getLogger(__name__)
+
+
+def analytics_report(output: str = "todolist-report.npz", fmt: str = "npz",
+                     burn_down_days: int = 30, horizon_days: int = 28,
+                     project_id: int = None,
+                     progress: Optional[Callable[[int, Optional[int]], None]] = None) -> dict:
+    """
+    Write burn-down, overdue-age and deadline heatmap reports per project
+    
+    Task columns are loaded once into NumPy arrays and every report is
+    computed with vectorised operations.
+    
+    Args:
+        output: .npz file, or directory for CSV files
+        fmt: "npz" or "csv"
+        burn_down_days: Days of burn-down history, today included
+        horizon_days: Days ahead covered by the deadline heatmap
+        project_id: Optional project ID to report on
+        progress: Optional callback receiving (steps done, 3): load, compute, write
+    
+    Returns:
+        Summary with the written paths and timings
+    """
+    # NumPy is optional, only this command needs it
+    from ..analytics import load_task_arrays, write_csv, write_npz
+    from ..analytics.reports import build_reports
+    
+    require_numpy()
+    db: Session = SessionLocal()
+    try:
+        with log_job(logger, "analytics_report", project_id=project_id) as summary:
+            start = time.perf_counter()
+            arrays = load_task_arrays(db, project_id=project_id)
+            loaded = time.perf_counter()
+            if progress:
+                progress(1, 3)
+            reports = build_reports(arrays, datetime.now(), burn_down_days, horizon_days)
+            computed = time.perf_counter()
+            if progress:
+                progress(2, 3)
+            
+            summary["paths"] = write_csv(reports, output) if fmt == "csv" else [write_npz(reports, output)]
+            summary.update(tasks=len(arrays), load_ms=round((loaded - start) * 1000, 3),
+                           compute_ms=round((computed - loaded) * 1000, 3))
+            if progress:
+                progress(3, 3)
+        return summary
+        
+    finally:
+        db.close()
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build task analytics reports")
+    parser.add_argument("--output", default="todolist-report.npz",
+                        help=".npz file, or directory for --format csv")
+    parser.add_argument("--format", choices=["npz", "csv"], default="npz")
+    parser.add_argument("--burn-down-days", type=int, default=30)
+    parser.add_argument("--horizon-days", type=int, default=28)
+    parser.add_argument("--project-id", type=int, help="Report on one project")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Log peak memory and top allocation sites")
+    
+    args = parser.parse_args()
+    try:
+        require_numpy()
+    except ImportError as exc:
+        parser.exit(1, f"{exc}\n")
+    configure_logging()
+    with trace_memory("analytics_report", args.trace_memory):
+        analytics_report(args.output, args.format, args.burn_down_days,
+                         args.horizon_days, args.project_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Command to archive completed tasks
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+
+from ..db.session import SessionLocal
+from ..repositories.archive_repository import TaskArchiveRepository
+from ..repositories.task_repository import TaskRepository
+from ..services.task_service import TaskService
+from ..utils.config import Config
+from ..utils.log import configure_logging, log_job
+from ..utils.memory import trace_memory
+
+
+logger = logging.getLogger(__name__)
+
+
+def archive_done_tasks(older_than_days: int = None, chunk_size: int = None,
+                       dry_run: bool = False,
+                       progress: Optional[Callable[[int, Optional[int]], None]] = None) -> dict:
+    """
+    Move done tasks not updated for older_than_days into 'tasks_archive'
+    
+    Each chunk is copied with INSERT ... SELECT and removed from 'tasks' in
+    its own short transaction, so the writer lock is never held for long.
+    
+    Args:
+        older_than_days: Minimum age in days (default: ARCHIVE_AFTER_DAYS)
+        chunk_size: Tasks moved per transaction (default: ARCHIVE_CHUNK_SIZE)
+        dry_run: If True, only count what would be archived
+        progress: Optional callback receiving (archived, total to archive)
+    
+    Returns:
+        Summary with the number of archived tasks
+    """
+    older_than_days = Config.ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    chunk_size = chunk_size or Config.ARCHIVE_CHUNK_SIZE
+    cutoff = datetime.now() - timedelta(days=older_than_days)
+    
+    db: Session = SessionLocal()
+    try:
+        archive_repo = TaskArchiveRepository(db)
+        task_service = TaskService(TaskRepository(db), archive_repo)
+        
+        with log_job(logger, "archive_done_tasks", cutoff=cutoff, dry_run=dry_run) as summary:
+            if dry_run:
+                summary["would_archive"] = archive_repo.count_done_before(cutoff)
+                return summary
+            
+            total = archive_repo.count_done_before(cutoff) if progress else None
+            summary["archived"] = 0
+            while True:
+                moved = task_service.archive_done_tasks(cutoff, chunk_size)
+                if not moved:
+                    break
+                summary["archived"] += moved
+                logger.debug("archived chunk", extra={"archived": summary["archived"]})
+                if progress:
+                    progress(summary["archived"], total)
+        return summary
+        
+    finally:
+        db.close()
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Archive completed tasks")
+    parser.add_argument("--older-than-days", type=int,
+                        help=f"Minimum age in days (default: {Config.ARCHIVE_AFTER_DAYS})")
+    parser.add_argument("--chunk-size", type=int,
+                        help=f"Tasks per transaction (default: {Config.ARCHIVE_CHUNK_SIZE})")
+    parser.add_argument("--dry-run", action="store_true", help="Dry run mode")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Log peak memory and top allocation sites")
+    
+    args = parser.parse_args()
+    configure_logging()
+    with trace_memory("archive_done_tasks", args.trace_memory):
+        archive_done_tasks(args.older_than_days, args.chunk_size, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,63 +1,97 @@
 """
 Command to auto-close overdue tasks
 """
-from datetime import datetime
+import logging
+from typing import Callable, Optional
 from sqlalchemy.orm import Session
 
 from ..db.session import SessionLocal
+from ..repositories.read_models import TaskReadRepository
 from ..repositories.task_repository import TaskRepository
 from ..services.task_service import TaskService
+from ..utils.log import configure_logging, log_job
+from ..utils.memory import trace_memory
 
 
-def auto_close_overdue_tasks(project_id: int = None, dry_run: bool = False):
+logger = logging.getLogger(__name__)
+
+
+def auto_close_overdue_tasks(project_id: int = None, dry_run: bool = False,
+                             batch_size: int = 500,
+                             progress: Optional[Callable[[int, Optional[int]], None]] = None) -> dict:
     """
     Auto-close overdue tasks (deadline passed and not 'done')
     
+    Overdue tasks are streamed as lightweight records in batches and each
+    batch is closed with a single UPDATE, so memory stays flat however many
+    tasks are overdue.
+    
     Args:
         project_id: Optional project ID to filter tasks
-        dry_run: If True, only show what would be closed
+        dry_run: If True, only count what would be closed (listed at DEBUG level)
+        batch_size: Number of tasks read and closed per batch
+        progress: Optional callback receiving (overdue tasks handled, None)
+    
+    Returns:
+        Summary with the numbers of tasks found, closed and failed
+    
+    One summary record is logged per run, a record per task only at DEBUG.
     """
     db: Session = SessionLocal()
     try:
-        task_repo = TaskRepository(db)
-        task_service = TaskService(task_repo)
-        
-        overdue_tasks = task_service.get_overdue_tasks(project_id)
-        
-        if not overdue_tasks:
-            print(f"{datetime.now()}: No overdue tasks found.")
-            return
+        task_service = TaskService(TaskRepository(db))
+        read_repo = TaskReadRepository(db)
+        per_task = logger.isEnabledFor(logging.DEBUG)
         
-        print(f"{datetime.now()}: Found {len(overdue_tasks)} overdue task(s)")
-        
-        if dry_run:
-            print("Dry run - would close:")
-            for task in overdue_tasks:
-                print(f"  Task {task.id}: {task.title} (deadline: {task.deadline})")
-            return
-        
-        closed_count = 0
-        for task in overdue_tasks:
-            try:
-                task_service.change_task_status(task.id, "done")
-                closed_count += 1
-                print(f"  Closed task {task.id}: {task.title}")
-            except Exception as e:
-                print(f"  Failed to close task {task.id}: {e}")
-        
-        db.commit()
-        print(f"Successfully closed {closed_count} overdue task(s)")
+        with log_job(logger, "auto_close_overdue_tasks", project_id=project_id,
+                     dry_run=dry_run) as summary:
+            summary.update(found=0, closed=0, failed=0)
+            for batch in read_repo.iter_batches(batch_size, project_id=project_id, overdue=True):
+                summary["found"] += len(batch)
+                
+                if dry_run:
+                    if per_task:
+                        for task in batch:
+                            logger.debug("would close task", extra={
+                                "task_id": task.id, "title": task.title, "deadline": task.deadline
+                            })
+                    continue
+                
+                try:
+                    summary["closed"] += task_service.change_tasks_status(
+                        [task.id for task in batch], "done"
+                    )
+                    if per_task:
+                        for task in batch:
+                            logger.debug("closed task", extra={"task_id": task.id, "title": task.title})
+                except Exception as e:
+                    db.rollback()
+                    summary["failed"] += len(batch)
+                    logger.error("failed to close batch", extra={"tasks": len(batch), "error": str(e)})
+                if progress:
+                    progress(summary["found"], None)
+        return summary
         
     finally:
         db.close()
 
 
-if __name__ == "__main__":
+def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Auto-close overdue tasks")
     parser.add_argument("--project-id", type=int, help="Project ID (optional)")
     parser.add_argument("--dry-run", action="store_true", help="Dry run mode")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="Tasks closed per transaction (default: 500)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Log peak memory and top allocation sites")
     
     args = parser.parse_args()
-    auto_close_overdue_tasks(args.project_id, args.dry_run)
\ No newline at end of file
+    configure_logging()
+    with trace_memory("auto_close_overdue_tasks", args.trace_memory):
+        auto_close_overdue_tasks(args.project_id, args.dry_run, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
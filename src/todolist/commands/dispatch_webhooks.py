@@ -0,0 +1,108 @@
+"""
+Command to deliver outbox events to webhook endpoints and manage endpoints
+"""
+import logging
+import signal
+import threading
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from ..db.session import SessionLocal
+from ..repositories.outbox_repository import OutboxRepository
+from ..services.webhook_dispatcher import WebhookDispatcher
+from ..utils.config import Config
+from ..utils.log import configure_logging, log_job
+
+
+logger = logging.getLogger(__name__)
+
+
+def dispatch_webhooks(once: bool = False, stop: Optional[threading.Event] = None):
+    """
+    Deliver outbox events to the registered endpoints
+
+    Args:
+        once: Deliver one batch per endpoint and return, instead of polling
+            every WEBHOOK_POLL_INTERVAL seconds until stopped
+        stop: Event ending the polling loop (set on SIGTERM when run as a command)
+    """
+    db: Session = SessionLocal()
+    dispatcher = WebhookDispatcher(
+        OutboxRepository(db),
+        batch_size=Config.WEBHOOK_BATCH_SIZE,
+        concurrency=Config.WEBHOOK_CONCURRENCY,
+        timeout=Config.WEBHOOK_TIMEOUT,
+        max_backoff=Config.WEBHOOK_MAX_BACKOFF,
+    )
+    try:
+        if once:
+            with log_job(logger, "dispatch_webhooks") as summary:
+                summary.update(dispatcher.dispatch_once())
+                summary["pruned"] = dispatcher.prune(Config.OUTBOX_RETENTION_DAYS)
+            return
+
+        logger.info("webhook dispatcher started", extra={"poll_interval": Config.WEBHOOK_POLL_INTERVAL})
+        dispatcher.run(stop, Config.WEBHOOK_POLL_INTERVAL, Config.OUTBOX_RETENTION_DAYS)
+        logger.info("webhook dispatcher stopped")
+    finally:
+        dispatcher.close()
+        db.close()
+
+
+def add_webhook(url: str, event_types: Optional[str] = None, from_start: bool = False):
+    """Register an endpoint receiving new events (or all stored ones with from_start)"""
+    with SessionLocal() as db:
+        endpoint = OutboxRepository(db).add_endpoint(url, event_types, from_start)
+        logger.info("webhook registered", extra={"endpoint_id": endpoint.id, "url": url,
+                                                  "cursor": endpoint.cursor})
+        return endpoint
+
+
+def list_webhooks():
+    """Print registered endpoints with their undelivered event counts"""
+    with SessionLocal() as db:
+        repo = OutboxRepository(db)
+        pending = repo.pending_counts()
+        for endpoint in repo.get_endpoints():
+            print(f"  #{endpoint.id} {endpoint.url} events={endpoint.event_types or '*'} "
+                  f"pending={pending.get(endpoint.id, 0)} failures={endpoint.failures}")
+            if endpoint.last_error:
+                print(f"      last error: {endpoint.last_error}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Deliver outbox events to webhook endpoints")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Deliver events")
+    run.add_argument("--once", action="store_true", help="Deliver one batch per endpoint and exit")
+    add = commands.add_parser("add", help="Register an endpoint")
+    add.add_argument("url", help="URL receiving POSTed event batches")
+    add.add_argument("--events", help="Comma separated event types or prefixes, e.g. 'task.'")
+    add.add_argument("--from-start", action="store_true",
+                     help="Also deliver the events already in the outbox")
+    commands.add_parser("list", help="Show endpoints and pending events")
+    remove = commands.add_parser("remove", help="Unregister an endpoint")
+    remove.add_argument("endpoint_id", type=int, help="Endpoint ID")
+
+    args = parser.parse_args()
+    configure_logging()
+    if args.command == "run":
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        try:
+            dispatch_webhooks(args.once, stop)
+        except KeyboardInterrupt:
+            pass
+    elif args.command == "add":
+        add_webhook(args.url, args.events, args.from_start)
+    elif args.command == "list":
+        list_webhooks()
+    else:
+        with SessionLocal() as db:
+            OutboxRepository(db).delete_endpoint(args.endpoint_id)
+
+
+if __name__ == "__main__":
+    main()
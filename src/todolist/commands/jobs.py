@@ -0,0 +1,93 @@
+"""
+Commands that can be submitted as background jobs, and the job worker
+"""
+import logging
+import signal
+import threading
+from functools import lru_cache
+from typing import Optional
+
+from .analytics_report import analytics_report
+from .archive_done_tasks import archive_done_tasks
+from .autoclose_overdue import auto_close_overdue_tasks
+from .purge_project import purge_project
+from .rebalance_ranks import rebalance_ranks
+from ..db.session import SessionLocal
+from ..services.job_runner import JobKind, JobRunner
+from ..utils.config import Config
+from ..utils.log import configure_logging
+
+
+logger = logging.getLogger(__name__)
+
+
+# Job kinds accepted by POST /api/v1/jobs, params are the function arguments
+JOB_KINDS = {
+    "purge_project": JobKind(purge_project),
+    "archive_done_tasks": JobKind(archive_done_tasks),
+    "auto_close_overdue_tasks": JobKind(auto_close_overdue_tasks),
+    "rebalance_ranks": JobKind(rebalance_ranks),
+    # Reports are written to JOB_RESULTS_DIR/job-<id>
+    "analytics_report": JobKind(analytics_report, writes_output=True),
+}
+
+
+def create_job_runner(workers: int = None, mode: str = None) -> JobRunner:
+    return JobRunner(
+        JOB_KINDS, SessionLocal,
+        # JOB_WORKERS=0 only keeps the API from running jobs
+        workers=workers or Config.JOB_WORKERS or 1,
+        mode=mode or Config.JOB_WORKER_MODE,
+        poll_interval=Config.JOB_POLL_INTERVAL,
+        stale_after=Config.JOB_STALE_AFTER,
+        results_dir=Config.JOB_RESULTS_DIR,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_job_runner() -> JobRunner:
+    """Process-wide runner started with the API when JOB_WORKERS is set"""
+    return create_job_runner()
+
+
+def run_job_worker(workers: int = None, mode: str = None, once: bool = False,
+                   stop: Optional[threading.Event] = None):
+    """
+    Run queued jobs until ``stop`` is set, or until the queue is empty
+    with ``once``
+    """
+    runner = create_job_runner(workers, mode)
+    logger.info("job worker started", extra={"workers": runner.workers, "mode": runner.mode})
+    try:
+        if once:
+            runner.run_until_idle()
+            return
+        runner.start()
+        (stop or threading.Event()).wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Let running jobs finish, they are queued again if the process is killed
+        runner.stop()
+        logger.info("job worker stopped")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument("--workers", type=int,
+                        help=f"Jobs run at once (default: JOB_WORKERS={Config.JOB_WORKERS})")
+    parser.add_argument("--mode", choices=["thread", "process"],
+                        help=f"Worker pool (default: JOB_WORKER_MODE={Config.JOB_WORKER_MODE})")
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+
+    args = parser.parse_args()
+    configure_logging()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    run_job_worker(args.workers, args.mode, args.once, stop)
+
+
+if __name__ == "__main__":
+    main()
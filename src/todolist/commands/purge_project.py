@@ -0,0 +1,78 @@
+"""
+Command to purge a large project in chunks
+"""
+import logging
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+
+from ..db.session import SessionLocal
+from ..db.sharding import get_shard_router
+from ..repositories.project_repository import ProjectRepository
+from ..repositories.sharded_repository import ShardedProjectRepository, ShardedTaskRepository
+from ..repositories.task_repository import TaskRepository
+from ..services.project_service import ProjectService
+from ..utils.config import Config
+from ..utils.log import configure_logging, log_job
+from ..utils.memory import trace_memory
+
+
+logger = logging.getLogger(__name__)
+
+
+def purge_project(project_id: int, chunk_size: int = None,
+                  progress: Optional[Callable[[int, Optional[int]], None]] = None) -> dict:
+    """
+    Delete a project and its tasks, chunk_size tasks per transaction
+    
+    Args:
+        project_id: Project to delete
+        chunk_size: Tasks deleted per transaction (default: DELETE_CHUNK_SIZE)
+        progress: Optional callback receiving (deleted_tasks, total_tasks)
+    
+    Returns:
+        Summary with the number of deleted tasks and whether the project existed
+    """
+    db: Session = SessionLocal()
+    shards = get_shard_router().sessions() if Config.SHARD_URLS else None
+    try:
+        if shards is not None:
+            project_service = ProjectService(
+                ShardedProjectRepository(shards), ShardedTaskRepository(shards)
+            )
+        else:
+            project_service = ProjectService(ProjectRepository(db), TaskRepository(db))
+        
+        with log_job(logger, "purge_project", project_id=project_id) as summary:
+            summary.update(deleted_tasks=0, total_tasks=None)
+            
+            def report(deleted: int, total: int):
+                summary.update(deleted_tasks=deleted, total_tasks=total)
+                logger.debug("purge progress", extra={"deleted": deleted, "total": total})
+                if progress:
+                    progress(deleted, total)
+            
+            summary["found"] = project_service.purge_project(project_id, chunk_size, report)
+        return summary
+    
+    except Exception:
+        db.rollback()
+        raise
+    
+    finally:
+        db.close()
+        if shards is not None:
+            shards.close()
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Purge a project and its tasks in chunks")
+    parser.add_argument("project_id", type=int, help="Project ID")
+    parser.add_argument("--chunk-size", type=int, help="Tasks deleted per transaction")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Log peak memory and top allocation sites")
+    
+    args = parser.parse_args()
+    configure_logging()
+    with trace_memory("purge_project", args.trace_memory):
+        purge_project(args.project_id, args.chunk_size)
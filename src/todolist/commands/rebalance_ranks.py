@@ -0,0 +1,80 @@
+"""
+Command to respace the manual order keys of board columns
+"""
+import logging
+from typing import Callable, Optional
+from sqlalchemy.orm import Session
+
+from ..db.session import SessionLocal
+from ..repositories.rank_repository import TaskRankRepository
+from ..repositories.task_repository import TaskRepository
+from ..services.task_service import TaskService
+from ..utils.config import Config
+from ..utils.log import configure_logging, log_job
+
+
+logger = logging.getLogger(__name__)
+
+
+def rebalance_ranks(project_id: int = None, status: str = None, max_length: int = None,
+                    progress: Optional[Callable[[int, Optional[int]], None]] = None) -> dict:
+    """
+    Rewrite the ranks of (project, status) columns evenly spaced
+    
+    Moves only ever write the moved task, so keys get longer when many
+    tasks are put into the same gap; this gives the column short keys
+    again without changing its order.
+    
+    Args:
+        project_id: Only rebalance columns of this project
+        status: With project_id, rebalance this column whatever its key length
+        max_length: Rebalance columns with a longer key (default: RANK_MAX_LENGTH)
+        progress: Optional callback receiving (columns done, columns to do)
+    
+    Returns:
+        Summary with the numbers of columns and tasks rebalanced
+    """
+    max_length = Config.RANK_MAX_LENGTH if max_length is None else max_length
+    
+    db: Session = SessionLocal()
+    try:
+        rank_repo = TaskRankRepository(db)
+        task_service = TaskService(TaskRepository(db), rank_repo=rank_repo)
+        
+        with log_job(logger, "rebalance_ranks", project_id=project_id, status=status) as summary:
+            if project_id is not None and status is not None:
+                columns = [(project_id, status)]
+            else:
+                columns = rank_repo.long_columns(max_length, project_id)
+            summary["columns"] = 0
+            summary["tasks"] = 0
+            for column_project_id, column_status in columns:
+                summary["tasks"] += task_service.rebalance_ranks(column_project_id, column_status)
+                summary["columns"] += 1
+                if progress:
+                    progress(summary["columns"], len(columns))
+        return summary
+        
+    finally:
+        db.close()
+
+
+def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Respace the manual order keys of board columns")
+    parser.add_argument("--project-id", type=int, help="Only columns of this project")
+    parser.add_argument("--status", choices=Config.VALID_TASK_STATUSES,
+                        help="With --project-id, rebalance this column regardless of key length")
+    parser.add_argument("--max-length", type=int,
+                        help=f"Rebalance columns with longer keys (default: {Config.RANK_MAX_LENGTH})")
+    
+    args = parser.parse_args()
+    if args.status and args.project_id is None:
+        parser.error("--status requires --project-id")
+    configure_logging()
+    rebalance_ranks(args.project_id, args.status, args.max_length)
+
+
+if __name__ == "__main__":
+    main()
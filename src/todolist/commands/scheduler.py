@@ -1,31 +1,37 @@
 """
 Task scheduler using schedule library
 """
+import logging
 import schedule
 import time
-from datetime import datetime
 
 from .autoclose_overdue import auto_close_overdue_tasks
+from ..utils.log import configure_logging
+from ..utils.memory import trace_memory
 
 
-def run_scheduler(interval_minutes: int = 15):
+logger = logging.getLogger(__name__)
+
+
+def run_scheduler(interval_minutes: int = 15, trace_allocations: bool = False):
     """
     Run scheduled task auto-closing
     
     Args:
         interval_minutes: Interval in minutes between checks
+        trace_allocations: Log peak memory and top allocation sites of every run
     """
-    print(f"🚀 Starting task scheduler (checking every {interval_minutes} minutes)")
-    print(f"Started at: {datetime.now()}")
+    def auto_close():
+        with trace_memory("auto_close_overdue_tasks", trace_allocations):
+            auto_close_overdue_tasks(dry_run=False)
+    
+    logger.info("scheduler started", extra={"interval_minutes": interval_minutes})
     
     # Schedule the auto-close task
-    schedule.every(interval_minutes).minutes.do(
-        lambda: auto_close_overdue_tasks(dry_run=False)
-    )
+    schedule.every(interval_minutes).minutes.do(auto_close)
     
     # Run immediately once
-    print("\n🔍 Running initial check...")
-    auto_close_overdue_tasks(dry_run=False)
+    auto_close()
     
     # Keep running
     try:
@@ -33,15 +39,22 @@ def run_scheduler(interval_minutes: int = 15):
             schedule.run_pending()
             time.sleep(60)  # Check every minute
     except KeyboardInterrupt:
-        print("\n\n🛑 Scheduler stopped by user")
+        logger.info("scheduler stopped by user")
 
 
-if __name__ == "__main__":
+def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="Run scheduled tasks")
     parser.add_argument("--interval", type=int, default=15, 
                        help="Interval in minutes (default: 15)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Log peak memory and top allocation sites of every run")
     
     args = parser.parse_args()
-    run_scheduler(args.interval)
\ No newline at end of file
+    configure_logging()
+    run_scheduler(args.interval, args.trace_memory)
+
+
+if __name__ == "__main__":
+    main()
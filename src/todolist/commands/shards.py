@@ -0,0 +1,191 @@
+"""
+Commands to set up shards and move projects between them
+"""
+import logging
+
+from sqlalchemy import delete, func, insert, select
+
+from ..db.sharding import get_shard_router
+from ..models.project import Project
+from ..models.tag import Tag, TaskTag
+from ..models.task import Task
+from ..models.task_archive import TaskArchive, TaskArchiveTotal
+from ..models.task_dependency import TaskDependency
+from ..models.task_status_event import TaskStatusEvent
+from ..utils.log import configure_logging, log_job
+
+
+logger = logging.getLogger(__name__)
+
+
+# Tables copied when a project moves, parents first
+_PROJECT_TABLES = (Task.__table__, TaskArchive.__table__, TaskArchiveTotal.__table__)
+
+
+def init_shards():
+    """Create directory and shard schemas, registering existing projects"""
+    router = get_shard_router()
+    router.init_schema()
+    logger.info("shards initialised", extra={"shards": len(router.engines)})
+    shard_status()
+
+
+def shard_status():
+    """Log the number of projects and tasks on every shard"""
+    router = get_shard_router()
+    projects = router.project_ids()
+    for shard, make_session in enumerate(router.sessionmakers):
+        with make_session() as db:
+            tasks = db.execute(select(func.count(Task.id))).scalar_one()
+        count = sum(1 for s in projects.values() if s == shard)
+        logger.info("shard status", extra={"shard": shard, "url": router.shard_urls[shard],
+                                           "projects": count, "tasks": tasks})
+
+
+def _insert_all(source, target, table, query, chunk_size: int, convert=None) -> int:
+    result = source.execute(query.execution_options(yield_per=chunk_size))
+    copied = 0
+    for rows in result.partitions():
+        target.execute(insert(table), [
+            convert(row) if convert else row._asdict() for row in rows
+        ])
+        copied += len(rows)
+    return copied
+
+
+def _copy_rows(source, target, table, project_id: int, chunk_size: int,
+               exclude=()):
+    columns = [c for c in table.columns if c.name not in exclude]
+    query = select(*columns).where(table.c.project_id == project_id)
+    return _insert_all(source, target, table, query, chunk_size)
+
+
+def _copy_dependencies(source, target, project_id: int, chunk_size: int) -> int:
+    """Edges between the project's tasks, blockers are always in the same project"""
+    query = select(*TaskDependency.__table__.columns).join(
+        Task, Task.id == TaskDependency.task_id
+    ).where(Task.project_id == project_id)
+    return _insert_all(source, target, TaskDependency.__table__, query, chunk_size)
+
+
+def _copy_tags(source, target, project_id: int, chunk_size: int) -> int:
+    """Tags of the project's tasks, matched by name to the target's tag IDs"""
+    tagged = select(TaskTag.task_id, Tag.name).join(Tag, Tag.id == TaskTag.tag_id).join(
+        Task, Task.id == TaskTag.task_id
+    ).where(Task.project_id == project_id)
+    names = source.execute(
+        select(tagged.subquery().c.name).distinct()
+    ).scalars().all()
+    if not names:
+        return 0
+    existing = set(target.execute(select(Tag.name).where(Tag.name.in_(names))).scalars())
+    missing = [name for name in names if name not in existing]
+    if missing:
+        target.execute(insert(Tag), [{"name": name} for name in missing])
+    tag_ids = dict(target.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+    return _insert_all(source, target, TaskTag.__table__, tagged, chunk_size,
+                       convert=lambda row: {"task_id": row.task_id, "tag_id": tag_ids[row.name]})
+
+
+def _fingerprint(db, project_id: int):
+    """Task count and latest change, to detect writes that raced the copy"""
+    return db.execute(
+        select(func.count(Task.id), func.max(Task.updated_at)).where(Task.project_id == project_id)
+    ).one()
+
+
+def move_project(project_id: int, target: int, chunk_size: int = 1000):
+    """
+    Move a project with its tasks, their dependencies and tags, archive and
+    status history to another shard
+
+    Writes to the project are refused (503) while it moves. The copy is
+    committed on the target before the directory is switched over, and the
+    source rows are deleted last, so an interrupted move can simply be rerun.
+
+    Args:
+        project_id: Project to move
+        target: Index of the destination shard
+        chunk_size: Rows copied per INSERT
+    """
+    router = get_shard_router()
+    source = router.shard_of(project_id)
+    if not 0 <= target < len(router.engines):
+        raise ValueError(f"Shard {target} does not exist")
+    if source == target:
+        logger.info("project already on target shard", extra={"project_id": project_id, "shard": target})
+        return
+
+    with log_job(logger, "move_project", project_id=project_id, source=source, target=target) as summary:
+        _move(router, project_id, source, target, chunk_size, summary)
+
+
+def _move(router, project_id: int, source: int, target: int, chunk_size: int, summary: dict):
+    router.set_shard(project_id, moving=True)
+    try:
+        with router.sessionmakers[source]() as src, router.sessionmakers[target]() as dst:
+            for attempt in range(3):
+                # Leftovers of an interrupted move
+                dst.execute(delete(Project.__table__).where(Project.id == project_id))
+                project = src.execute(
+                    select(Project.__table__).where(Project.id == project_id)
+                ).mappings().one()
+                dst.execute(insert(Project.__table__), [dict(project)])
+                copied = {
+                    table.name: _copy_rows(src, dst, table, project_id, chunk_size)
+                    for table in _PROJECT_TABLES
+                }
+                copied[TaskDependency.__tablename__] = _copy_dependencies(
+                    src, dst, project_id, chunk_size
+                )
+                copied[TaskTag.__tablename__] = _copy_tags(src, dst, project_id, chunk_size)
+                # The insert trigger logged a creation event per copied task,
+                # replace those with the real history
+                dst.execute(delete(TaskStatusEvent).where(TaskStatusEvent.project_id == project_id))
+                copied[TaskStatusEvent.__tablename__] = _copy_rows(
+                    src, dst, TaskStatusEvent.__table__, project_id, chunk_size, exclude=("id",)
+                )
+                dst.flush()
+                if _fingerprint(src, project_id) == _fingerprint(dst, project_id):
+                    break
+                dst.rollback()
+                logger.warning("project changed during the copy, copying again")
+            else:
+                raise RuntimeError(f"Project {project_id} kept changing, move aborted")
+            dst.commit()
+            summary.update(copied=copied, attempts=attempt + 1)
+
+        router.set_shard(project_id, shard=target, moving=False)
+        with router.sessionmakers[source]() as src:
+            src.execute(delete(Project.__table__).where(Project.id == project_id))
+            src.commit()
+
+    except Exception:
+        router.set_shard(project_id, moving=False)
+        raise
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage project shards")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("init", help="Create schemas and register existing projects")
+    commands.add_parser("status", help="Show projects and tasks per shard")
+    move = commands.add_parser("move", help="Move a project to another shard")
+    move.add_argument("project_id", type=int, help="Project ID")
+    move.add_argument("shard", type=int, help="Destination shard index")
+    move.add_argument("--chunk-size", type=int, default=1000, help="Rows per INSERT")
+
+    args = parser.parse_args()
+    configure_logging()
+    if args.command == "init":
+        init_shards()
+    elif args.command == "status":
+        shard_status()
+    else:
+        move_project(args.project_id, args.shard, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,22 @@ from .base import Base
 from .session import engine
 
 
-def init_database():
-    """Create all tables in the database"""
+def import_models():
+    """Import all models so their tables are registered on Base.metadata"""
     # Import models inside function to avoid circular imports
     from ..models.project import Project
     from ..models.task import Task
+    from ..models.task_archive import TaskArchive, TaskArchiveTotal
+    from ..models.task_status_event import TaskStatusEvent
+    from ..models.task_dependency import TaskDependency
+    from ..models.tag import Tag, TaskTag
+    from ..models.outbox import OutboxEvent, WebhookEndpoint
+    from ..models.job import Job
+
+
+def init_database():
+    """Create all tables in the database"""
+    import_models()
     
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
@@ -14,4 +25,4 @@ def init_database():
 
 
 if __name__ == "__main__":
-    init_database()
\ No newline at end of file
+    init_database()
@@ -0,0 +1,211 @@
+"""
+Statement timing and slow-query log
+
+Every statement sent through an instrumented engine is timed and aggregated
+per fingerprint (the SQL with whitespace collapsed and ``IN`` lists folded),
+keeping the count, total time and a window of recent durations for the p95.
+Statements slower than the threshold are also logged with their parameters
+(optionally redacted), the repository method that issued them and the
+query plan (``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN`` elsewhere) to a
+rotating JSON-lines file and a short in-memory list.
+
+Stats are per process; with several workers each reports its own.
+"""
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..utils.config import Config
+
+
+_WHITESPACE = re.compile(r"\s+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)|\(\s*%\(\w+\)s(?:\s*,\s*%\(\w+\)s)+\s*\)")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+
+
+def normalize(statement: str) -> str:
+    """Collapse whitespace and fold IN lists, so one query has one fingerprint"""
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode()).hexdigest()[:12]
+
+
+def _caller() -> Optional[str]:
+    """Repository method on the stack that issued the statement"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if "repositories" in frame.f_code.co_filename:
+            owner = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(owner).__name__}.{name}" if owner is not None else name
+        frame = frame.f_back
+    return None
+
+
+class StatementStats:
+    """Count, total time and recent durations of one fingerprint"""
+
+    def __init__(self, statement: str, window: int):
+        self.statement = normalize(statement)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.durations = deque(maxlen=window)
+
+    def add(self, duration_ms: float):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.durations.append(duration_ms)
+
+    def as_dict(self, key: str) -> dict:
+        durations = sorted(self.durations)
+        # Nearest-rank p95 over the recent window
+        p95 = durations[max(0, -(-len(durations) * 95 // 100) - 1)] if durations else None
+        return {
+            "fingerprint": key,
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p95_ms": round(p95, 3) if p95 is not None else None,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class QueryLog:
+    """Times statements of instrumented engines and records the slow ones"""
+
+    def __init__(self, threshold_ms: float = 100, log_path: Optional[str] = None,
+                 max_bytes: int = 10 * 1024 * 1024, backups: int = 5,
+                 redact: bool = True, explain: bool = True,
+                 max_fingerprints: int = 1000, window: int = 1000, recent: int = 100):
+        self.threshold_ms = threshold_ms
+        self.redact = redact
+        self.explain = explain
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self.stats: "OrderedDict[str, StatementStats]" = OrderedDict()
+        self.slow = deque(maxlen=recent)
+        self._lock = threading.Lock()
+        self.logger = None
+        if log_path:
+            self.logger = logging.getLogger(f"{__name__}.{id(self)}")
+            self.logger.propagate = False
+            self.logger.setLevel(logging.INFO)
+            handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger.addHandler(handler)
+
+    def instrument(self, engine: Engine):
+        """Time every statement executed by ``engine``"""
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def remove(self, engine: Engine):
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+        self.record(statement, duration_ms)
+        if duration_ms >= self.threshold_ms:
+            self._log_slow(conn, statement, parameters, executemany, duration_ms)
+
+    def record(self, statement: str, duration_ms: float):
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self.stats.get(key)
+            if stats is None:
+                stats = self.stats[key] = StatementStats(statement, self.window)
+                # Forget the least recently seen statements
+                while len(self.stats) > self.max_fingerprints:
+                    self.stats.popitem(last=False)
+            else:
+                self.stats.move_to_end(key)
+            stats.add(duration_ms)
+
+    def _log_slow(self, conn, statement, parameters, executemany, duration_ms):
+        entry = {
+            "time": datetime.now().isoformat(),
+            "fingerprint": fingerprint(statement),
+            "duration_ms": round(duration_ms, 3),
+            "statement": statement,
+            "parameters": self._parameters(parameters),
+            "caller": _caller(),
+            "plan": None,
+        }
+        if self.explain and not executemany:
+            entry["plan"] = self._plan(conn, statement, parameters)
+        self.slow.append(entry)
+        if self.logger is not None:
+            self.logger.info(json.dumps(entry, default=str))
+
+    def _parameters(self, parameters):
+        if not self.redact:
+            return parameters
+        if isinstance(parameters, dict):
+            return {name: f"<{type(value).__name__}>" for name, value in parameters.items()}
+        if isinstance(parameters, (list, tuple)):
+            return [f"<{type(value).__name__}>" for value in parameters]
+        return "<redacted>"
+
+    @staticmethod
+    def _plan(conn, statement: str, parameters) -> Optional[List[str]]:
+        """Query plan, run on the raw DBAPI connection so it is not timed itself"""
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [" ".join(str(column) for column in row) for row in cursor.fetchall()]
+        except Exception as e:  # the plan is best effort
+            return [f"EXPLAIN failed: {e}"]
+        finally:
+            cursor.close()
+
+    def report(self, limit: int = 50) -> List[dict]:
+        """Per-fingerprint stats, slowest in total first"""
+        with self._lock:
+            rows = [stats.as_dict(key) for key, stats in self.stats.items()]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)[:limit]
+
+    def recent(self) -> List[dict]:
+        """Latest slow statements, newest first"""
+        return list(reversed(self.slow))
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.slow.clear()
+
+
+@lru_cache(maxsize=None)
+def get_query_log() -> QueryLog:
+    """Process-wide query log configured from SLOW_QUERY_* settings"""
+    return QueryLog(
+        threshold_ms=Config.SLOW_QUERY_THRESHOLD_MS,
+        log_path=Config.SLOW_QUERY_LOG_PATH,
+        max_bytes=Config.SLOW_QUERY_LOG_MAX_BYTES,
+        backups=Config.SLOW_QUERY_LOG_BACKUPS,
+        redact=Config.SLOW_QUERY_REDACT_PARAMS,
+        explain=Config.SLOW_QUERY_EXPLAIN,
+    )
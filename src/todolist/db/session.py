@@ -1,14 +1,30 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 import os
+import sqlite3
 from typing import Iterator
 
+from .query_log import get_query_log
+from ..utils.config import Config
+from ..utils.log import track_db_time
+
 
 DATABASE_URL = os.getenv(
     "DATABASE_URL", 
     "sqlite:///todolist.db"
 )
 
+
+@event.listens_for(Engine, "connect")
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """SQLite ignores FOREIGN KEY constraints unless enabled per connection"""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 engine = create_engine(
     DATABASE_URL,
     echo=False,
@@ -16,6 +32,24 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 )
 
+if Config.LOG_REQUESTS:
+    track_db_time(engine)
+if Config.SLOW_QUERY_LOG_ENABLED:
+    get_query_log().instrument(engine)
+
+
+def _dispose_pool_in_child():
+    """
+    Drop connections inherited from the parent process after a fork,
+    so that each worker opens its own instead of sharing sockets
+    """
+    engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_pool_in_child)
+
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -29,4 +63,4 @@ def get_db() -> Iterator[Session]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,262 @@
+"""
+Per-project sharding across several databases
+
+A small directory database maps every project to the shard holding it and
+its tasks, keeps project names globally unique and hands out blocks of task
+IDs, so IDs stay unique across shards and survive moving a project. Each
+shard is a complete database with the normal schema.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import (
+    Boolean, Column, Integer, String, create_engine, func, insert, select, update
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+
+from ..exceptions.repository_exceptions import DuplicateError, NotFoundError
+from ..utils.config import Config
+from . import session  # noqa: F401 - enables SQLite foreign keys
+
+
+DirectoryBase = declarative_base()
+
+T = TypeVar("T")
+
+
+class ProjectShard(DirectoryBase):
+    """Shard map entry, also the source of project IDs"""
+
+    __tablename__ = "project_shards"
+
+    project_id = Column(Integer, primary_key=True)
+    name = Column(String(Config.MAX_PROJECT_NAME_LENGTH), nullable=False, unique=True)
+    shard = Column(Integer, nullable=False, index=True)
+    # Writes are refused while the project is copied to another shard
+    moving = Column(Boolean, default=False, nullable=False)
+
+
+class IdBlock(DirectoryBase):
+    """Next free ID of a sequence shared by all shards"""
+
+    __tablename__ = "id_blocks"
+
+    name = Column(String(50), primary_key=True)
+    next_id = Column(Integer, nullable=False)
+
+
+class ProjectMovingError(Exception):
+    """Raised on writes to a project that is being moved between shards"""
+
+    def __init__(self, project_id: int):
+        super().__init__(f"Project {project_id} is being moved, retry later")
+        self.project_id = project_id
+
+
+def _engine(url: str):
+    return create_engine(
+        url, future=True,
+        connect_args={"check_same_thread": False} if "sqlite" in url else {},
+    )
+
+
+class IdAllocator:
+    """Hands out IDs from blocks reserved in the directory (hi/lo)"""
+
+    def __init__(self, directory: sessionmaker, name: str, block_size: int):
+        self.directory = directory
+        self.name = name
+        self.block_size = block_size
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            if self._next >= self._end:
+                self._next = self._reserve()
+                self._end = self._next + self.block_size
+            value = self._next
+            self._next += 1
+            return value
+
+    def _reserve(self) -> int:
+        """Reserve the next block with one UPDATE ... RETURNING"""
+        with self.directory() as db:
+            end = db.execute(
+                update(IdBlock).where(IdBlock.name == self.name)
+                .values(next_id=IdBlock.next_id + self.block_size)
+                .returning(IdBlock.next_id)
+            ).scalar_one_or_none()
+            if end is None:
+                raise RuntimeError(f"Sequence '{self.name}' missing, run the shards init command")
+            db.commit()
+        return end - self.block_size
+
+
+class ShardSessions:
+    """Sessions of one unit of work, opened lazily per shard"""
+
+    def __init__(self, router: "ShardRouter"):
+        self.router = router
+        self._sessions: Dict[int, Session] = {}
+
+    def get(self, shard: int) -> Session:
+        if shard not in self._sessions:
+            self._sessions[shard] = self.router.sessionmakers[shard]()
+        return self._sessions[shard]
+
+    def for_project(self, project_id: int, write: bool = False) -> Session:
+        return self.get(self.router.shard_of(project_id, write=write))
+
+    def all(self) -> List[Tuple[int, Session]]:
+        return [(shard, self.get(shard)) for shard in range(len(self.router.sessionmakers))]
+
+    def fan_out(self, operation: Callable[[Session], T]) -> List[T]:
+        """Run ``operation`` on every shard concurrently, results in shard order"""
+        sessions = [db for _, db in self.all()]
+        if len(sessions) == 1:
+            return [operation(sessions[0])]
+        return list(self.router.executor.map(operation, sessions))
+
+    def close(self):
+        for db in self._sessions.values():
+            db.close()
+        self._sessions.clear()
+
+
+class ShardRouter:
+    """Engines of all shards plus the directory that maps projects to them"""
+
+    def __init__(self, shard_urls: Sequence[str], directory_url: str,
+                 id_block_size: int = 1000):
+        if not shard_urls:
+            raise ValueError("At least one shard URL is required")
+        self.shard_urls = list(shard_urls)
+        self.engines = [_engine(url) for url in self.shard_urls]
+        self.sessionmakers = [
+            sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+            for engine in self.engines
+        ]
+        self.directory_engine = _engine(directory_url)
+        self.directory = sessionmaker(bind=self.directory_engine, expire_on_commit=False)
+        self.task_ids = IdAllocator(self.directory, "tasks", id_block_size)
+        self.executor = ThreadPoolExecutor(
+            max_workers=len(self.engines), thread_name_prefix="shard"
+        )
+
+    def sessions(self) -> ShardSessions:
+        return ShardSessions(self)
+
+    def shard_of(self, project_id: int, write: bool = False) -> int:
+        """Shard holding a project, NotFoundError when unknown"""
+        with self.directory() as db:
+            entry = db.get(ProjectShard, project_id)
+        if entry is None:
+            raise NotFoundError("Project", project_id)
+        if write and entry.moving:
+            raise ProjectMovingError(project_id)
+        return entry.shard
+
+    def find_project(self, name: str) -> Optional[int]:
+        with self.directory() as db:
+            return db.execute(
+                select(ProjectShard.project_id).where(ProjectShard.name == name)
+            ).scalar_one_or_none()
+
+    def project_ids(self) -> Dict[int, int]:
+        """All project IDs with their shard"""
+        with self.directory() as db:
+            return dict(db.execute(select(ProjectShard.project_id, ProjectShard.shard)).all())
+
+    def register_project(self, name: str) -> Tuple[int, int]:
+        """
+        Reserve an ID and a shard for a new project, placing it on the
+        shard with the fewest projects
+        """
+        with self.directory() as db:
+            counts = dict(db.execute(
+                select(ProjectShard.shard, func.count()).group_by(ProjectShard.shard)
+            ).all())
+            shard = min(range(len(self.engines)), key=lambda s: (counts.get(s, 0), s))
+            entry = ProjectShard(name=name, shard=shard)
+            db.add(entry)
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                raise DuplicateError("Project", "name", name)
+            return entry.project_id, shard
+
+    def rename_project(self, project_id: int, name: str):
+        with self.directory() as db:
+            try:
+                db.execute(
+                    update(ProjectShard).where(ProjectShard.project_id == project_id)
+                    .values(name=name)
+                )
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                raise DuplicateError("Project", "name", name)
+
+    def unregister_project(self, project_id: int):
+        with self.directory() as db:
+            db.query(ProjectShard).filter(ProjectShard.project_id == project_id).delete()
+            db.commit()
+
+    def set_shard(self, project_id: int, shard: Optional[int] = None,
+                  moving: Optional[bool] = None):
+        values = {}
+        if shard is not None:
+            values["shard"] = shard
+        if moving is not None:
+            values["moving"] = moving
+        with self.directory() as db:
+            db.execute(
+                update(ProjectShard).where(ProjectShard.project_id == project_id).values(**values)
+            )
+            db.commit()
+
+    def init_schema(self):
+        """Create the directory and shard schemas and seed the ID sequences"""
+        from .base import Base
+        from .init_db import import_models
+        from ..models.project import Project
+        from ..models.task import Task
+
+        import_models()
+        DirectoryBase.metadata.create_all(bind=self.directory_engine)
+        for engine in self.engines:
+            Base.metadata.create_all(bind=engine)
+
+        # Register projects already present in the shards, and start the
+        # task sequence above every existing task ID
+        max_task_id = 0
+        with self.directory() as directory:
+            known = set(directory.execute(select(ProjectShard.project_id)).scalars())
+            for shard, make_session in enumerate(self.sessionmakers):
+                with make_session() as db:
+                    for project_id, name in db.execute(select(Project.id, Project.name)):
+                        if project_id not in known:
+                            directory.add(ProjectShard(project_id=project_id, name=name, shard=shard))
+                    max_task_id = max(max_task_id, db.execute(
+                        select(func.coalesce(func.max(Task.id), 0))
+                    ).scalar_one())
+            if directory.get(IdBlock, "tasks") is None:
+                directory.execute(insert(IdBlock).values(name="tasks", next_id=max_task_id + 1))
+            directory.commit()
+
+    def dispose(self):
+        self.executor.shutdown(wait=False)
+        for engine in self.engines + [self.directory_engine]:
+            engine.dispose()
+
+
+@lru_cache(maxsize=None)
+def get_shard_router() -> ShardRouter:
+    """Process-wide router built from SHARD_URLS and SHARD_DIRECTORY_URL"""
+    return ShardRouter(Config.SHARD_URLS, Config.SHARD_DIRECTORY_URL, Config.SHARD_ID_BLOCK_SIZE)
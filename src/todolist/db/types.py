@@ -0,0 +1,77 @@
+"""
+Compact column types for the task tables
+
+``StatusCode`` stores a task status as a small integer and ``EpochDateTime``
+stores timestamps as integer microseconds since the epoch on SQLite (which
+otherwise keeps them as 26-character text); both map back to the usual
+Python values, so models, schemas and queries keep using status strings
+and datetimes. Naive datetimes are converted as if they were UTC, so the
+stored value changes with neither the server's time zone nor DST.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, SmallInteger
+from sqlalchemy.types import TypeDecorator
+
+
+# Codes follow the workflow order, so sorting by status sorts todo, doing, done
+STATUS_CODES = {"todo": 0, "doing": 1, "done": 2}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def status_check(column: str, name: str) -> CheckConstraint:
+    """CHECK constraint limiting ``column`` to the known status codes"""
+    codes = ", ".join(str(code) for code in sorted(STATUS_NAMES))
+    return CheckConstraint(f"{column} IN ({codes})", name=name)
+
+
+class StatusCode(TypeDecorator):
+    """Task status stored as a SMALLINT code"""
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return STATUS_CODES[value]
+        except KeyError:
+            raise ValueError(f"Unknown task status '{value}'") from None
+
+    def process_result_value(self, value, dialect):
+        return STATUS_NAMES[value] if value is not None else None
+
+
+def to_epoch_us(value: datetime) -> int:
+    """Microseconds since the epoch of a naive datetime"""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_us(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class EpochDateTime(TypeDecorator):
+    """DATETIME, stored as BIGINT microseconds since the epoch on SQLite"""
+
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(BigInteger())
+        return dialect.type_descriptor(DateTime())
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return to_epoch_us(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name != "sqlite":
+            return value
+        return from_epoch_us(value)
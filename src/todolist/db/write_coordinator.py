@@ -0,0 +1,170 @@
+"""
+Group commit for SQLite deployments
+
+Concurrent requests hand their write operations to one writer thread. The
+writer collects whatever is pending (up to ``max_batch`` operations, waiting
+at most ``max_delay`` seconds for more), runs each operation inside its own
+SAVEPOINT and commits the whole batch once. A failing operation only rolls
+back its savepoint; every caller gets its own result or exception, and only
+after the batch has been committed.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..utils.config import Config
+from . import session  # noqa: F401 - enables SQLite foreign keys
+
+
+_STOP = object()
+
+
+class BatchSession(Session):
+    """
+    Session handed to batched operations
+
+    Repositories commit and roll back after each write; inside a batch
+    those calls only release or roll back the operation's savepoint.
+    """
+
+    def commit(self):
+        if self.in_nested_transaction():
+            self.flush()
+        else:
+            super().commit()
+
+    def rollback(self):
+        if self.in_nested_transaction():
+            self.get_nested_transaction().rollback()
+        else:
+            super().rollback()
+
+
+def create_writer_engine(url: str):
+    """
+    Engine for the writer thread
+
+    pysqlite starts transactions lazily and releasing the outermost SAVEPOINT
+    would commit; emitting BEGIN ourselves makes savepoints nest inside one
+    transaction, and IMMEDIATE takes the write lock up front.
+    """
+    sqlite = url.startswith("sqlite")
+    engine = create_engine(
+        url, future=True,
+        connect_args={"check_same_thread": False} if sqlite else {},
+        pool_size=1, max_overflow=0,
+    )
+    if sqlite:
+        @event.listens_for(engine, "connect")
+        def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(engine, "begin")
+        def _begin_immediate(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+    return engine
+
+
+class WriteCoordinator:
+    """Single writer thread applying queued operations in group commits"""
+
+    def __init__(self, url: Optional[str] = None, max_batch: int = 128,
+                 max_delay: float = 0.002):
+        self.engine = create_writer_engine(url or Config.DATABASE_URL)
+        self.sessionmaker = sessionmaker(
+            bind=self.engine, class_=BatchSession,
+            autoflush=False, expire_on_commit=False,
+        )
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.operations = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, operation: Callable[[Session], Any]) -> Any:
+        """Run ``operation(session)`` in the next batch and wait for its result"""
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((operation, future))
+        return future.result()
+
+    def stop(self):
+        """Apply everything already queued, then stop the writer thread"""
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self.engine.dispose()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="write-coordinator", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    timeout = deadline - time.monotonic()
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._apply(batch)
+
+    def _apply(self, batch: List[Tuple[Callable, Future]]):
+        """Run a batch in one transaction, then resolve the callers' futures"""
+        done, failed = [], []
+        db = self.sessionmaker()
+        try:
+            for operation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                savepoint = db.begin_nested()
+                try:
+                    result = operation(db)
+                    if savepoint.is_active:
+                        savepoint.commit()
+                    done.append((future, result))
+                except Exception as e:
+                    if savepoint.is_active:
+                        savepoint.rollback()
+                    failed.append((future, e))
+            db.commit()
+        except Exception as e:
+            # The commit itself failed: nothing in the batch was written
+            db.rollback()
+            failed.extend((future, e) for future, _ in done)
+            done = []
+        finally:
+            db.close()
+
+        self.batches += 1
+        self.operations += len(batch)
+        for future, result in done:
+            future.set_result(result)
+        for future, error in failed:
+            future.set_exception(error)
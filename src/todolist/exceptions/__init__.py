@@ -1,10 +1,11 @@
 from .repository_exceptions import RepositoryError, NotFoundError, DuplicateError
-from .service_exceptions import ServiceError, ValidationError
+from .service_exceptions import ServiceError, ValidationError, ConflictError
 
 __all__ = [
     "RepositoryError",
     "NotFoundError", 
     "DuplicateError",
     "ServiceError",
-    "ValidationError"
+    "ValidationError",
+    "ConflictError"
 ]
\ No newline at end of file
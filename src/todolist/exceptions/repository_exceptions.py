@@ -21,4 +21,12 @@ class DuplicateError(RepositoryError):
     
     def __init__(self, entity_type: str, field: str, value: str):
         message = f"{entity_type} with {field} '{value}' already exists"
-        super().__init__(message, {"entity_type": entity_type, "field": field, "value": value})
\ No newline at end of file
+        super().__init__(message, {"entity_type": entity_type, "field": field, "value": value})
+
+
+class RebalanceRequiredError(RepositoryError):
+    """Raised when a board column must be rebalanced before a task can be placed"""
+    
+    def __init__(self, project_id: int, status: str):
+        message = f"Column '{status}' of project {project_id} must be rebalanced first"
+        super().__init__(message, {"project_id": project_id, "status": status})
@@ -11,4 +11,9 @@ class ValidationError(ServiceError):
     
     def __init__(self, message: str, field: str = None):
         details = {"field": field} if field else {}
-        super().__init__(message, details)
\ No newline at end of file
+        super().__init__(message, details)
+
+
+class ConflictError(ValidationError):
+    """Raised when a value conflicts with existing data, e.g. a taken name"""
+    pass
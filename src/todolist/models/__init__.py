@@ -1 +1,4 @@
-__all__ = ["Project", "Task"]
\ No newline at end of file
+__all__ = [
+    "Job", "OutboxEvent", "Project", "Tag", "Task", "TaskArchive", "TaskArchiveTotal",
+    "TaskDependency", "TaskStatusEvent", "TaskTag", "WebhookEndpoint",
+]
\ No newline at end of file
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, Column, DateTime, Index, Integer, String, Text
+
+from ..db.base import Base
+
+
+class Job(Base):
+    """
+    SQLAlchemy ORM model for a background job
+    Maps to 'jobs' table; workers claim queued jobs, report progress on the
+    row and store the result when done
+    """
+
+    __tablename__ = "jobs"
+    # Workers look for the oldest queued job
+    __table_args__ = (Index("ix_jobs_status_id", "status", "id"),)
+
+    STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+    FINISHED = ("succeeded", "failed", "cancelled")
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    params = Column(JSON, nullable=False)
+    # Project the job works on, if any, to find e.g. its purge
+    project_id = Column(Integer, nullable=True, index=True)
+    status = Column(String(20), default="queued", nullable=False)
+    progress_current = Column(Integer, default=0, nullable=False)
+    progress_total = Column(Integer, nullable=True)
+    cancel_requested = Column(Boolean, default=False, nullable=False)
+    result = Column(JSON, nullable=True)
+    # File or directory written by the job, e.g. a report
+    result_location = Column(String(500), nullable=True)
+    error = Column(Text, nullable=True)
+    # host:pid of the worker running the job, which refreshes heartbeat_at
+    # while it runs; jobs with a stale heartbeat are queued again
+    worker = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in self.FINISHED
+
+    def __str__(self):
+        return f"Job(id={self.id}, kind='{self.kind}', status='{self.status}')"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,126 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Integer, String, Text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from ..db.base import Base
+
+
+class current_transaction_id(FunctionElement):
+    """ID of the writing transaction on PostgreSQL, 0 elsewhere"""
+    type = BigInteger()
+    inherit_cache = True
+
+
+class oldest_open_transaction(FunctionElement):
+    """
+    Lowest transaction ID still running on PostgreSQL: every transaction
+    below it has committed or rolled back. 1 elsewhere, where writers are
+    serialized and events commit in ID order.
+    """
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(current_transaction_id)
+def _current_transaction_id(element, compiler, **kw):
+    return "0"
+
+
+@compiles(current_transaction_id, "postgresql")
+def _current_transaction_id_pg(element, compiler, **kw):
+    return "pg_current_xact_id()::text::bigint"
+
+
+@compiles(oldest_open_transaction)
+def _oldest_open_transaction(element, compiler, **kw):
+    return "1"
+
+
+@compiles(oldest_open_transaction, "postgresql")
+def _oldest_open_transaction_pg(element, compiler, **kw):
+    return "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
+class OutboxEvent(Base):
+    """
+    SQLAlchemy ORM model for the transactional outbox
+    Maps to 'outbox_events' table, written in the same transaction as the
+    project or task change it describes
+    """
+
+    __tablename__ = "outbox_events"
+
+    # Events are delivered in (transaction_id, id) order. On PostgreSQL IDs
+    # are taken before commit, so a later ID can become visible first; an
+    # event is only read once its transaction is older than every open one.
+    id = Column(Integer, primary_key=True)
+    transaction_id = Column(BigInteger, default=current_transaction_id(), nullable=False)
+    event_type = Column(String(50), nullable=False)
+    # No foreign key: events of deleted projects must still be delivered
+    project_id = Column(Integer, nullable=True)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    @property
+    def position(self) -> tuple:
+        """Place of the event in the delivery order"""
+        return self.transaction_id, self.id
+
+    def as_message(self) -> dict:
+        """Body of the event as sent to webhook endpoints"""
+        return {
+            "id": self.id,
+            "type": self.event_type,
+            "project_id": self.project_id,
+            "created_at": self.created_at.isoformat(),
+            "data": self.payload,
+        }
+
+    def __str__(self):
+        return f"OutboxEvent(id={self.id}, type='{self.event_type}')"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class WebhookEndpoint(Base):
+    """
+    SQLAlchemy ORM model for a registered webhook receiver
+    Maps to 'webhook_endpoints' table. ``cursor_transaction`` and
+    ``cursor`` are the position of the last outbox event delivered to the
+    endpoint; they only move forward on success, so every endpoint gets the
+    events in order.
+    """
+
+    __tablename__ = "webhook_endpoints"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String(500), nullable=False)
+    # Comma separated event types or prefixes ('task.'), NULL for all
+    event_types = Column(String(200), nullable=True)
+    cursor = Column(Integer, default=0, nullable=False)
+    cursor_transaction = Column(BigInteger, default=0, nullable=False)
+    # Consecutive failed deliveries and when to try again
+    failures = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+
+    @property
+    def position(self) -> tuple:
+        return self.cursor_transaction, self.cursor
+
+    def wants(self, event_type: str) -> bool:
+        """Whether events of ``event_type`` are delivered to this endpoint"""
+        if not self.event_types:
+            return True
+        return any(event_type.startswith(pattern.strip())
+                   for pattern in self.event_types.split(",") if pattern.strip())
+
+    def __str__(self):
+        return f"WebhookEndpoint(id={self.id}, url='{self.url}')"
+
+    def __repr__(self):
+        return self.__str__()
@@ -15,6 +15,8 @@ class Project(Base):
     """
     
     __tablename__ = "projects"
+    # Fetch server-generated columns with RETURNING at INSERT/UPDATE time
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(Config.MAX_PROJECT_NAME_LENGTH), unique=True, nullable=False)
@@ -22,8 +24,11 @@ class Project(Base):
     created_at = Column(DateTime, default=datetime.now, nullable=False)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
     
-    # One-to-many relationship with Task
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+    # One-to-many relationship with Task. Deleting a project relies on the
+    # ON DELETE CASCADE of tasks.project_id instead of loading every task.
+    tasks = relationship(
+        "Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
     
     def __init__(self, name: str, description: str):
         self.name = name
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from ..db.base import Base
+from ..utils.config import Config
+
+
+class Tag(Base):
+    """
+    SQLAlchemy ORM model for a tag
+    Maps to 'tags' table; names are unique across projects
+    """
+
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(Config.MAX_TAG_NAME_LENGTH), nullable=False, unique=True)
+
+    def __str__(self):
+        return f"Tag(id={self.id}, name='{self.name}')"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+class TaskTag(Base):
+    """
+    SQLAlchemy ORM model for the tags of a task
+    Maps to 'task_tags' table, indexed in both directions
+    """
+
+    __tablename__ = "task_tags"
+    __table_args__ = (
+        # Tasks of a tag, the primary key covers the tags of a task
+        Index("ix_task_tags_tag_id_task_id", "tag_id", "task_id"),
+    )
+
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
+
+    def __str__(self):
+        return f"TaskTag(task_id={self.task_id}, tag_id={self.tag_id})"
+
+    def __repr__(self):
+        return self.__str__()
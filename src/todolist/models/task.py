@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from ..db.base import Base
+from ..db.types import EpochDateTime, StatusCode, status_check
 from ..utils.config import Config
 
 
@@ -15,17 +16,32 @@ class Task(Base):
     """
     
     __tablename__ = "tasks"
+    # Fetch server-generated columns with RETURNING at INSERT/UPDATE time
+    __mapper_args__ = {"eager_defaults": True}
+    # Task lists filter by project and status together, boards also order
+    # each (project, status) column by rank
+    __table_args__ = (
+        Index("ix_tasks_project_id_status_rank", "project_id", "status", "rank"),
+        status_check("status", "ck_tasks_status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(Config.MAX_TASK_TITLE_LENGTH), nullable=False)
-    description = Column(String, nullable=False) 
-    status = Column(String(20), default="todo", nullable=False)
-    deadline = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.now, nullable=False)
-    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+    description = Column(String(Config.MAX_TASK_DESCRIPTION_LENGTH), nullable=False)
+    # Stored as a small integer code, read and written as 'todo' / 'doing' / 'done'
+    status = Column(StatusCode, default="todo", nullable=False)
+    deadline = Column(EpochDateTime, nullable=True, index=True)
+    # Fractional key for the manual order within its column, see utils.ranks
+    rank = Column(String, nullable=True)
+    created_at = Column(EpochDateTime, default=datetime.now, nullable=False, index=True)
+    updated_at = Column(
+        EpochDateTime, default=datetime.now, onupdate=datetime.now, nullable=False, index=True
+    )
     
     # Foreign key to Project
-    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     
     # Many-to-one relationship with Project
     project = relationship("Project", back_populates="tasks")
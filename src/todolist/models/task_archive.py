@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, ForeignKey
+
+from ..db.base import Base
+from ..db.types import EpochDateTime, StatusCode, status_check
+from ..utils.config import Config
+
+
+class TaskArchive(Base):
+    """
+    SQLAlchemy ORM model for archived tasks
+    Maps to 'tasks_archive' table, same shape as 'tasks' plus archived_at
+    """
+    
+    __tablename__ = "tasks_archive"
+    __table_args__ = (status_check("status", "ck_tasks_archive_status"),)
+    
+    # Keeps the id the task had in 'tasks'
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(Config.MAX_TASK_TITLE_LENGTH), nullable=False)
+    description = Column(String(Config.MAX_TASK_DESCRIPTION_LENGTH), nullable=False)
+    status = Column(StatusCode, nullable=False)
+    deadline = Column(EpochDateTime, nullable=True)
+    rank = Column(String, nullable=True)
+    created_at = Column(EpochDateTime, nullable=False)
+    updated_at = Column(EpochDateTime, nullable=False)
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    archived_at = Column(EpochDateTime, default=datetime.now, nullable=False)
+    
+    def __str__(self):
+        return f"TaskArchive(id={self.id}, title='{self.title}', status='{self.status}')"
+    
+    def __repr__(self):
+        return self.__str__()
+
+
+class TaskArchiveTotal(Base):
+    """
+    Precomputed number of archived tasks per project and status
+    Maps to 'tasks_archive_totals', maintained by the archive command
+    """
+    
+    __tablename__ = "tasks_archive_totals"
+    
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    status = Column(StatusCode, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy import CheckConstraint, Column, ForeignKey, Index, Integer
+
+from ..db.base import Base
+from ..db.types import EpochDateTime
+
+
+class TaskDependency(Base):
+    """
+    SQLAlchemy ORM model for a blocking relationship between two tasks
+    Maps to 'task_dependencies' table; ``task_id`` cannot start before
+    ``blocker_id`` is done
+    """
+
+    __tablename__ = "task_dependencies"
+    __table_args__ = (
+        # Dependents of a task, the primary key covers its blockers
+        Index("ix_task_dependencies_blocker_id", "blocker_id"),
+        CheckConstraint("task_id <> blocker_id", name="ck_task_dependencies_not_self"),
+    )
+
+    task_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    blocker_id = Column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    created_at = Column(EpochDateTime, default=datetime.now, nullable=False)
+
+    def __str__(self):
+        return f"TaskDependency(task_id={self.task_id}, blocker_id={self.blocker_id})"
+
+    def __repr__(self):
+        return self.__str__()
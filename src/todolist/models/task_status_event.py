@@ -0,0 +1,88 @@
+from datetime import datetime
+
+from sqlalchemy import DDL, Column, ForeignKey, Index, Integer, event
+
+from ..db.base import Base
+from ..db.types import EpochDateTime, StatusCode
+
+
+class TaskStatusEvent(Base):
+    """
+    SQLAlchemy ORM model for the append-only task status log
+    Maps to 'task_status_events' table, written by triggers on 'tasks'
+    """
+
+    __tablename__ = "task_status_events"
+    __table_args__ = (
+        # Throughput: done events of a project in a time range
+        Index("ix_task_status_events_project_status_time", "project_id", "to_status", "changed_at"),
+        # Lead time: first event of each task
+        Index("ix_task_status_events_task_time", "task_id", "changed_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    # No foreign key: history outlives archived and deleted tasks
+    task_id = Column(Integer, nullable=False)
+    project_id = Column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
+    )
+    # NULL for the event recorded when the task is created
+    # Same types as the 'tasks' columns the triggers copy from
+    from_status = Column(StatusCode, nullable=True)
+    to_status = Column(StatusCode, nullable=False)
+    changed_at = Column(EpochDateTime, default=datetime.now, nullable=False)
+
+    def __str__(self):
+        return (f"TaskStatusEvent(task_id={self.task_id}, "
+                f"'{self.from_status}' -> '{self.to_status}')")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+# Status changes are logged by the database in the same transaction as the
+# write, whichever path made it: ORM flush, UPDATE ... RETURNING, bulk updates
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_status_event_insert AFTER INSERT ON tasks
+    BEGIN
+        INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+        VALUES (NEW.id, NEW.project_id, NULL, NEW.status, NEW.created_at);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_status_event_update AFTER UPDATE OF status ON tasks
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+        VALUES (NEW.id, NEW.project_id, OLD.status, NEW.status, NEW.updated_at);
+    END
+    """,
+]
+
+POSTGRESQL_TRIGGERS = [
+    """
+    CREATE OR REPLACE FUNCTION record_task_status_event() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+            VALUES (NEW.id, NEW.project_id, NULL, NEW.status, NEW.created_at);
+        ELSIF NEW.status IS DISTINCT FROM OLD.status THEN
+            INSERT INTO task_status_events (task_id, project_id, from_status, to_status, changed_at)
+            VALUES (NEW.id, NEW.project_id, OLD.status, NEW.status, NEW.updated_at);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS tasks_status_event ON tasks",
+    """
+    CREATE TRIGGER tasks_status_event AFTER INSERT OR UPDATE OF status ON tasks
+    FOR EACH ROW EXECUTE FUNCTION record_task_status_event()
+    """,
+]
+
+for statement in SQLITE_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+for statement in POSTGRESQL_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -1,5 +1,32 @@
 from .base import BaseRepository
+from .archive_repository import TaskArchiveRepository
+from .coordinated_repository import CoordinatedRepository
 from .project_repository import ProjectRepository
 from .task_repository import TaskRepository
+from .task_dependency_repository import TaskDependencyRepository
+from .tag_repository import TagRepository
+from .rank_repository import TaskRankRepository
+from .job_repository import JobRepository
+from .outbox_repository import OutboxRepository
+from .memory_repository import InMemoryProjectRepository, InMemoryStore, InMemoryTaskRepository
+from .read_models import ProjectReadRepository, ProjectRecord, TaskReadRepository, TaskRecord
 
-__all__ = ["BaseRepository", "ProjectRepository", "TaskRepository"]
\ No newline at end of file
+__all__ = [
+    "BaseRepository",
+    "ProjectRepository",
+    "TaskRepository",
+    "TaskArchiveRepository",
+    "TaskDependencyRepository",
+    "TagRepository",
+    "TaskRankRepository",
+    "CoordinatedRepository",
+    "InMemoryStore",
+    "InMemoryProjectRepository",
+    "InMemoryTaskRepository",
+    "JobRepository",
+    "OutboxRepository",
+    "ProjectReadRepository",
+    "ProjectRecord",
+    "TaskReadRepository",
+    "TaskRecord",
+]
\ No newline at end of file
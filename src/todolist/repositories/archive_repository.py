@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import func, insert, literal, select, union_all, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..models.task import Task
+from ..models.task_archive import TaskArchive, TaskArchiveTotal
+from .task_query import TaskQuery
+
+
+# Columns copied from 'tasks' into 'tasks_archive'
+ARCHIVED_COLUMNS = (
+    "id", "title", "description", "status", "deadline", "rank",
+    "created_at", "updated_at", "project_id",
+)
+
+
+class TaskArchiveRepository:
+    """
+    Repository for archived tasks using SQLAlchemy
+    
+    Done tasks are moved from 'tasks' to 'tasks_archive' in chunks, each in
+    its own transaction, and per-project totals are kept up to date so stats
+    never have to scan the archive.
+    """
+    
+    def __init__(self, db_session: Session):
+        self.db = db_session
+    
+    def archive_done_before(self, cutoff: datetime, limit: int) -> int:
+        """
+        Move up to ``limit`` done tasks last updated before ``cutoff`` into
+        the archive with INSERT ... SELECT and DELETE in one transaction
+        """
+        ids = self.db.execute(
+            select(Task.id).where(Task.status == "done", Task.updated_at < cutoff)
+            .order_by(Task.id).limit(limit)
+        ).scalars().all()
+        if not ids:
+            return 0
+        
+        totals = self.db.execute(
+            select(Task.project_id, Task.status, func.count(Task.id))
+            .where(Task.id.in_(ids)).group_by(Task.project_id, Task.status)
+        ).all()
+        
+        columns = [getattr(Task, name) for name in ARCHIVED_COLUMNS]
+        # Typed, so it is stored like the other timestamps
+        archived_at = literal(datetime.now(), TaskArchive.archived_at.type)
+        self.db.execute(
+            insert(TaskArchive).from_select(
+                list(ARCHIVED_COLUMNS) + ["archived_at"],
+                select(*columns, archived_at).where(Task.id.in_(ids))
+            )
+        )
+        for project_id, status, count in totals:
+            self._add_to_total(project_id, status, count)
+        self.db.query(Task).filter(Task.id.in_(ids)).delete(synchronize_session=False)
+        self.db.commit()
+        return len(ids)
+    
+    def count_done_before(self, cutoff: datetime) -> int:
+        """Count done tasks that would be archived for ``cutoff``"""
+        return self.db.query(Task).filter(
+            Task.status == "done", Task.updated_at < cutoff
+        ).count()
+    
+    def get(self, id: int) -> Optional[TaskArchive]:
+        """Get archived task by ID"""
+        return self.db.query(TaskArchive).filter(TaskArchive.id == id).first()
+    
+    def get_rows(self, columns: Sequence[str],
+                 query: Optional[TaskQuery] = None) -> List[Row]:
+        """Get selected archived task columns as plain rows"""
+        columns = [getattr(TaskArchive, name) for name in columns]
+        return (query or TaskQuery()).apply(self.db.query(*columns), TaskArchive).all()
+    
+    def get_rows_with_live(self, columns: Sequence[str],
+                           query: Optional[TaskQuery] = None) -> List[Row]:
+        """
+        Get selected columns of live and archived tasks with one UNION ALL,
+        sorted and paged across both tables
+        """
+        query = query or TaskQuery()
+        # Sort columns must be selected inside the union to order by them
+        names = list(dict.fromkeys(list(columns) + [n for n, _ in query.sort] + ["id"]))
+        union = union_all(
+            query.apply_filters(select(*[getattr(Task, n) for n in names]), Task),
+            query.apply_filters(select(*[getattr(TaskArchive, n) for n in names]), TaskArchive),
+        ).subquery()
+        
+        statement = select(*[union.c[name] for name in columns])
+        statement = query.apply_page(statement.order_by(*query.order_by(union.c)))
+        return self.db.execute(statement).all()
+    
+    def totals_by_status(self, project_id: int) -> Dict[str, int]:
+        """Get precomputed archived task counts per status for a project"""
+        rows = self.db.query(TaskArchiveTotal.status, TaskArchiveTotal.count).filter(
+            TaskArchiveTotal.project_id == project_id
+        ).all()
+        return {status: count for status, count in rows}
+    
+    def _add_to_total(self, project_id: int, status: str, count: int):
+        updated = self.db.execute(
+            update(TaskArchiveTotal).where(
+                TaskArchiveTotal.project_id == project_id,
+                TaskArchiveTotal.status == status
+            ).values(count=TaskArchiveTotal.count + count)
+        ).rowcount
+        if not updated:
+            self.db.add(TaskArchiveTotal(project_id=project_id, status=status, count=count))
+            self.db.flush()
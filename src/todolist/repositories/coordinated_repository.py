@@ -0,0 +1,49 @@
+from typing import Callable, FrozenSet
+
+from sqlalchemy.orm import Session
+
+from ..db.write_coordinator import WriteCoordinator
+
+
+# Repository methods that write and commit, run through the coordinator:
+# task and project writes, tag/untag, dependency add/delete and rank moves.
+# Not coordinated:
+# - update(): it flushes changes to ORM objects tracked by the caller's
+#   session, which the writer's session cannot see. The API only uses
+#   update_by_id.
+# - archive_done_before(): only the archive job calls it, in the job
+#   runner's own session and off the request path.
+# - job and outbox bookkeeping: it writes only its own tables.
+WRITE_METHODS = frozenset({
+    "add", "update_by_id", "delete", "bulk_change_status", "delete_chunk_by_project",
+    "tag", "untag", "move", "rebalance",
+})
+
+
+class CoordinatedRepository:
+    """
+    Wraps a SQLAlchemy repository so that its write methods are applied by
+    the write coordinator in group commits, while reads use the request session
+    """
+
+    def __init__(self, repository, coordinator: WriteCoordinator,
+                 write_methods: FrozenSet[str] = WRITE_METHODS):
+        self._repository = repository
+        self._coordinator = coordinator
+        self._write_methods = write_methods
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._repository, name)
+        if name not in self._write_methods:
+            return attribute
+        return self._write(name)
+
+    def _write(self, name: str) -> Callable:
+        repository_class = type(self._repository)
+
+        def write(*args, **kwargs):
+            def operation(db: Session):
+                return getattr(repository_class(db), name)(*args, **kwargs)
+            return self._coordinator.submit(operation)
+
+        return write
@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from ..models.job import Job
+
+
+class JobRepository:
+    """
+    Repository for background jobs
+
+    State changes are single UPDATE statements guarded by the current
+    status, so API processes and workers can share the table safely.
+    """
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def add(self, kind: str, params: dict) -> Job:
+        """Queue a job"""
+        job = Job(kind=kind, params=params, project_id=params.get("project_id"))
+        self.db.add(job)
+        self.db.commit()
+        return job
+
+    def get(self, id: int) -> Optional[Job]:
+        # Workers update the row from other sessions
+        return self.db.get(Job, id, populate_existing=True)
+
+    def get_all(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        """Newest jobs first, optionally in one status"""
+        query = self.db.query(Job)
+        if status:
+            query = query.filter(Job.status == status)
+        return query.order_by(Job.id.desc()).limit(limit).all()
+
+    def get_latest(self, kind: str, project_id: int) -> Optional[Job]:
+        """Most recent job of ``kind`` for a project"""
+        return self.db.query(Job).filter(
+            Job.kind == kind, Job.project_id == project_id
+        ).order_by(Job.id.desc()).populate_existing().first()
+
+    def claim_next(self, worker: str) -> Optional[Job]:
+        """Atomically mark the oldest queued job as running, None if there is none"""
+        now = datetime.now()
+        oldest = select(Job.id).where(Job.status == "queued").order_by(Job.id).limit(1)
+        job = self.db.execute(
+            update(Job).where(Job.id == oldest.scalar_subquery(), Job.status == "queued")
+            .values(status="running", worker=worker, started_at=now, heartbeat_at=now)
+            .returning(Job)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).scalar_one_or_none()
+        self.db.commit()
+        return job
+
+    def report_progress(self, id: int, current: int, total: Optional[int] = None) -> bool:
+        """Store progress, returns whether cancellation was requested"""
+        cancel_requested = self.db.execute(
+            update(Job).where(Job.id == id)
+            .values(progress_current=current, progress_total=total)
+            .returning(Job.cancel_requested)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        self.db.commit()
+        return bool(cancel_requested)
+
+    def request_cancel(self, id: int) -> Optional[Job]:
+        """
+        Cancel a queued job at once, or ask a running one to stop at its
+        next progress report
+        """
+        now = datetime.now()
+        self.db.execute(
+            update(Job).where(Job.id == id, Job.status == "queued")
+            .values(status="cancelled", cancel_requested=True, finished_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            update(Job).where(Job.id == id, Job.status == "running")
+            .values(cancel_requested=True)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return self.get(id)
+
+    def finish(self, id: int, status: str, result: Optional[dict] = None,
+               result_location: Optional[str] = None, error: Optional[str] = None):
+        self.db.execute(
+            update(Job).where(Job.id == id).values(
+                status=status, result=result, result_location=result_location,
+                error=error, finished_at=datetime.now(),
+            ).execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def heartbeat(self, ids: Sequence[int]):
+        """Mark running jobs as alive"""
+        if not ids:
+            return
+        self.db.execute(
+            update(Job).where(Job.id.in_(ids), Job.status == "running")
+            .values(heartbeat_at=datetime.now())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def requeue_stale(self, before: datetime) -> int:
+        """Queue again running jobs whose worker has not been heard of since ``before``"""
+        requeued = self.db.execute(
+            update(Job).where(Job.status == "running", Job.heartbeat_at < before)
+            .values(status="queued", worker=None, heartbeat_at=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return requeued
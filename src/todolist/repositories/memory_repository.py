@@ -0,0 +1,464 @@
+"""
+In-memory repository backend
+
+Keeps projects and tasks in process memory behind the same interface as the
+SQLAlchemy repositories, for ephemeral preview environments and fast test
+runs. ``InMemoryStore`` holds the data and its secondary indexes:
+
+- unique project name -> id map
+- tasks by project, by status and by (project, status), as insertion-ordered
+  dict-sets (dicts with ``None`` values)
+- a min-heap of (deadline, task id) for overdue lookups
+
+Every public method takes the store lock, so one store can be shared between
+request threads. The store can optionally be snapshotted to a JSON file and
+restored from it on startup.
+"""
+import heapq
+import json
+import os
+import threading
+from datetime import datetime
+from functools import wraps
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .base import BaseRepository
+from .task_query import TaskQuery
+from ..models.project import Project
+from ..models.task import Task
+from ..exceptions.repository_exceptions import NotFoundError, DuplicateError
+
+
+PROJECT_COLUMNS = ("id", "name", "description", "created_at", "updated_at")
+TASK_COLUMNS = (
+    "id", "title", "description", "status", "deadline",
+    "project_id", "created_at", "updated_at",
+)
+
+
+def _locked(method):
+    """Run a repository method while holding the store lock"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.store.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class InMemoryStore:
+    """Shared state and indexes for the in-memory repositories"""
+
+    def __init__(self, snapshot_path: Optional[str] = None):
+        self.lock = threading.RLock()
+        self.snapshot_path = snapshot_path
+        self.clear()
+
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.load_snapshot(snapshot_path)
+
+    def clear(self):
+        """Drop all data and indexes"""
+        self.projects: Dict[int, Project] = {}
+        self.project_ids_by_name: Dict[str, int] = {}
+        self.tasks: Dict[int, Task] = {}
+        self.tasks_by_project: Dict[int, Dict[int, None]] = {}
+        self.tasks_by_status: Dict[str, Dict[int, None]] = {}
+        self.tasks_by_project_status: Dict[Tuple[int, str], Dict[int, None]] = {}
+        self.deadline_heap: List[Tuple[datetime, int]] = []
+
+        # Index keys a task was last indexed under, to unindex after mutation
+        self._task_keys: Dict[int, Tuple[int, str, Optional[datetime]]] = {}
+        self._project_names: Dict[int, str] = {}
+        self._next_project_id = 1
+        self._next_task_id = 1
+
+    # Project indexes
+
+    def insert_project(self, project: Project):
+        if project.name in self.project_ids_by_name:
+            raise DuplicateError("Project", "name", project.name)
+        if project.id is None:
+            project.id = self._next_project_id
+        self._next_project_id = max(self._next_project_id, project.id + 1)
+        now = datetime.now()
+        project.created_at = project.created_at or now
+        project.updated_at = project.updated_at or now
+
+        self.projects[project.id] = project
+        self.project_ids_by_name[project.name] = project.id
+        self._project_names[project.id] = project.name
+
+    def reindex_project(self, project: Project):
+        old_name = self._project_names[project.id]
+        if project.name == old_name:
+            return
+        owner = self.project_ids_by_name.get(project.name)
+        if owner is not None and owner != project.id:
+            raise DuplicateError("Project", "name", project.name)
+        del self.project_ids_by_name[old_name]
+        self.project_ids_by_name[project.name] = project.id
+        self._project_names[project.id] = project.name
+
+    def remove_project(self, project_id: int) -> bool:
+        project = self.projects.pop(project_id, None)
+        if project is None:
+            return False
+        del self.project_ids_by_name[self._project_names.pop(project_id)]
+        for task_id in list(self.tasks_by_project.get(project_id, ())):
+            self.remove_task(task_id)
+        self.tasks_by_project.pop(project_id, None)
+        return True
+
+    # Task indexes
+
+    def insert_task(self, task: Task):
+        if task.project_id not in self.projects:
+            raise NotFoundError("Project", task.project_id)
+        if task.id is None:
+            task.id = self._next_task_id
+        self._next_task_id = max(self._next_task_id, task.id + 1)
+        now = datetime.now()
+        task.status = task.status or "todo"
+        task.created_at = task.created_at or now
+        task.updated_at = task.updated_at or now
+
+        self.tasks[task.id] = task
+        self._index_task(task)
+
+    def reindex_task(self, task: Task):
+        project_id, status, deadline = self._task_keys[task.id]
+        if (project_id, status) != (task.project_id, task.status):
+            self._unindex_task(task.id)
+            self._index_task(task)
+        elif task.deadline != deadline:
+            self._task_keys[task.id] = (project_id, status, task.deadline)
+            self._push_deadline(task)
+
+    def remove_task(self, task_id: int) -> bool:
+        if self.tasks.pop(task_id, None) is None:
+            return False
+        # Heap entries of removed tasks are skipped lazily and compacted later
+        self._unindex_task(task_id)
+        return True
+
+    def _index_task(self, task: Task):
+        self.tasks_by_project.setdefault(task.project_id, {})[task.id] = None
+        self.tasks_by_status.setdefault(task.status, {})[task.id] = None
+        self.tasks_by_project_status.setdefault((task.project_id, task.status), {})[task.id] = None
+        self._task_keys[task.id] = (task.project_id, task.status, task.deadline)
+        self._push_deadline(task)
+
+    def _unindex_task(self, task_id: int):
+        project_id, status, _ = self._task_keys.pop(task_id)
+        self.tasks_by_project[project_id].pop(task_id, None)
+        self.tasks_by_status[status].pop(task_id, None)
+        self.tasks_by_project_status[(project_id, status)].pop(task_id, None)
+
+    def _push_deadline(self, task: Task):
+        if task.deadline is None or task.status == "done":
+            return
+        heapq.heappush(self.deadline_heap, (task.deadline, task.id))
+        if len(self.deadline_heap) > 2 * len(self.tasks) + 64:
+            self._compact_heap()
+
+    def _compact_heap(self):
+        self.deadline_heap = [
+            (task.deadline, task.id) for task in self.tasks.values()
+            if task.deadline is not None and task.status != "done"
+        ]
+        heapq.heapify(self.deadline_heap)
+
+    def overdue_tasks(self, now: datetime) -> List[Task]:
+        """
+        Walk the heap from the root, descending only into entries before
+        ``now``: cost is proportional to the number of overdue entries
+        """
+        heap = self.deadline_heap
+        found: Dict[int, Task] = {}
+        stack = [0] if heap else []
+        while stack:
+            index = stack.pop()
+            deadline, task_id = heap[index]
+            if deadline >= now:
+                continue
+            task = self.tasks.get(task_id)
+            if task is not None and task.deadline == deadline and task.status != "done":
+                found[task_id] = task
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    stack.append(child)
+        return [found[task_id] for task_id in sorted(found)]
+
+    # Snapshots
+
+    def save_snapshot(self, path: Optional[str] = None):
+        """Write all projects and tasks to a JSON file atomically"""
+        path = path or self.snapshot_path
+        with self.lock:
+            data = {
+                "projects": [_dump(p, PROJECT_COLUMNS) for p in self.projects.values()],
+                "tasks": [_dump(t, TASK_COLUMNS) for t in self.tasks.values()],
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: str):
+        """Replace the store contents with a snapshot written by save_snapshot"""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        with self.lock:
+            self.clear()
+            for values in data["projects"]:
+                project = Project(name=values["name"], description=values["description"])
+                _load(project, values, ("id", "created_at", "updated_at"))
+                self.insert_project(project)
+            for values in data["tasks"]:
+                task = Task(title=values["title"], description=values["description"])
+                _load(task, values, ("id", "status", "deadline", "project_id",
+                                     "created_at", "updated_at"))
+                self.insert_task(task)
+
+
+def _dump(entity, columns: Sequence[str]) -> dict:
+    values = {}
+    for column in columns:
+        value = getattr(entity, column)
+        values[column] = value.isoformat() if isinstance(value, datetime) else value
+    return values
+
+
+def _load(entity, values: dict, columns: Sequence[str]):
+    for column in columns:
+        value = values[column]
+        if column in ("deadline", "created_at", "updated_at") and value is not None:
+            value = datetime.fromisoformat(value)
+        setattr(entity, column, value)
+
+
+def _rows(entities: Iterable, columns: Sequence[str]) -> List[tuple]:
+    return [tuple(getattr(entity, column) for column in columns) for entity in entities]
+
+
+class InMemoryProjectRepository(BaseRepository[Project]):
+    """Repository for Project entities kept in an InMemoryStore"""
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    @_locked
+    def add(self, project: Project) -> Project:
+        """Add a new project"""
+        self.store.insert_project(project)
+        return project
+
+    @_locked
+    def get(self, id: int) -> Optional[Project]:
+        """Get project by ID"""
+        return self.store.projects.get(id)
+
+    @_locked
+    def get_by_name(self, name: str) -> Optional[Project]:
+        """Get project by name"""
+        project_id = self.store.project_ids_by_name.get(name)
+        return self.store.projects.get(project_id) if project_id is not None else None
+
+    @_locked
+    def get_all(self) -> List[Project]:
+        """Get all projects"""
+        return list(self.store.projects.values())
+
+    @_locked
+    def get_rows(self, columns: Sequence[str],
+                 ids: Optional[Sequence[int]] = None) -> List[tuple]:
+        """Get selected project columns as plain tuples, optionally only ``ids``"""
+        return _rows(self._projects(ids), columns)
+
+    @_locked
+    def get_with_tasks(self, ids: Optional[Sequence[int]] = None) -> List[Tuple[Project, List[Task]]]:
+        """Get projects, optionally only ``ids``, each with its tasks in ID order"""
+        tasks = self.store.tasks
+        return [
+            (project, [tasks[id] for id in sorted(self.store.tasks_by_project.get(project.id, {}))])
+            for project in self._projects(ids)
+        ]
+
+    @_locked
+    def update(self, project: Project) -> Project:
+        """Reindex a project changed in place"""
+        if project.id not in self.store.projects:
+            raise NotFoundError("Project", project.id)
+        self.store.reindex_project(project)
+        return project
+
+    @_locked
+    def update_by_id(self, id: int, values: dict) -> Project:
+        """Update project fields by ID"""
+        project = self.store.projects.get(id)
+        if project is None:
+            raise NotFoundError("Project", id)
+        name = values.get("name", project.name)
+        owner = self.store.project_ids_by_name.get(name)
+        if owner is not None and owner != id:
+            raise DuplicateError("Project", "name", name)
+
+        for column, value in values.items():
+            setattr(project, column, value)
+        project.updated_at = datetime.now()
+        self.store.reindex_project(project)
+        return project
+
+    @_locked
+    def delete(self, id: int) -> bool:
+        """Delete project and its tasks by ID"""
+        return self.store.remove_project(id)
+
+    @_locked
+    def count(self) -> int:
+        """Get total number of projects"""
+        return len(self.store.projects)
+
+    def _projects(self, ids: Optional[Sequence[int]]) -> List[Project]:
+        projects = self.store.projects
+        if ids is None:
+            return list(projects.values())
+        return [projects[id] for id in sorted(set(ids)) if id in projects]
+
+
+class InMemoryTaskRepository(BaseRepository[Task]):
+    """Repository for Task entities kept in an InMemoryStore"""
+
+    def __init__(self, store: InMemoryStore):
+        self.store = store
+
+    @_locked
+    def add(self, task: Task) -> Task:
+        """Add a new task"""
+        self.store.insert_task(task)
+        return task
+
+    @_locked
+    def get(self, id: int) -> Optional[Task]:
+        """Get task by ID"""
+        return self.store.tasks.get(id)
+
+    @_locked
+    def get_by_project_id(self, project_id: int) -> List[Task]:
+        """Get all tasks for a specific project"""
+        return self._tasks(self.store.tasks_by_project.get(project_id, {}))
+
+    @_locked
+    def get_by_status(self, project_id: int, status: str) -> List[Task]:
+        """Get tasks by status for a project"""
+        return self._tasks(self.store.tasks_by_project_status.get((project_id, status), {}))
+
+    @_locked
+    def get_overdue_tasks(self, project_id: Optional[int] = None) -> List[Task]:
+        """Get overdue tasks (deadline passed and status not 'done')"""
+        tasks = self.store.overdue_tasks(datetime.now())
+        if project_id:
+            tasks = [task for task in tasks if task.project_id == project_id]
+        return tasks
+
+    @_locked
+    def get_rows(self, columns: Sequence[str],
+                 query: Optional[TaskQuery] = None) -> List[tuple]:
+        """
+        Get selected task columns as plain tuples, filtered, sorted and paged
+        by ``query``. Candidates come from the narrowest index available.
+        """
+        query = query or TaskQuery()
+        now = datetime.now()
+        if query.ids is not None:
+            candidates = [self.store.tasks[id] for id in query.ids if id in self.store.tasks]
+        elif query.overdue:
+            candidates = self.store.overdue_tasks(now)
+        elif query.project_id is not None and len(query.statuses) == 1:
+            candidates = self._tasks(self.store.tasks_by_project_status.get(
+                (query.project_id, query.statuses[0]), {}
+            ))
+        elif query.project_id is not None:
+            candidates = self._tasks(self.store.tasks_by_project.get(query.project_id, {}))
+        elif query.statuses:
+            candidates = [
+                task for status in query.statuses
+                for task in self._tasks(self.store.tasks_by_status.get(status, {}))
+            ]
+        else:
+            candidates = self.store.tasks.values()
+        tasks = [task for task in candidates if query.matches(task, now)]
+        return _rows(query.sort_and_page(tasks), columns)
+
+    @_locked
+    def get_all(self) -> List[Task]:
+        """Get all tasks"""
+        return list(self.store.tasks.values())
+
+    @_locked
+    def update(self, task: Task) -> Task:
+        """Reindex a task changed in place"""
+        if task.id not in self.store.tasks:
+            raise NotFoundError("Task", task.id)
+        self.store.reindex_task(task)
+        return task
+
+    @_locked
+    def update_by_id(self, id: int, values: dict) -> Task:
+        """Update task fields by ID"""
+        task = self.store.tasks.get(id)
+        if task is None:
+            raise NotFoundError("Task", id)
+        for column, value in values.items():
+            setattr(task, column, value)
+        task.updated_at = datetime.now()
+        self.store.reindex_task(task)
+        return task
+
+    @_locked
+    def bulk_change_status(self, ids: Sequence[int], status: str) -> int:
+        """Set the status of many tasks, returns the number changed"""
+        updated = 0
+        for task_id in ids:
+            if task_id in self.store.tasks:
+                self.update_by_id(task_id, {"status": status})
+                updated += 1
+        return updated
+
+    @_locked
+    def delete(self, id: int) -> bool:
+        """Delete task by ID"""
+        return self.store.remove_task(id)
+
+    @_locked
+    def delete_chunk_by_project(self, project_id: int, limit: int) -> int:
+        """Delete up to ``limit`` tasks of a project"""
+        ids = list(islice(self.store.tasks_by_project.get(project_id, {}), limit))
+        for task_id in ids:
+            self.store.remove_task(task_id)
+        return len(ids)
+
+    @_locked
+    def count(self) -> int:
+        """Get total number of tasks"""
+        return len(self.store.tasks)
+
+    @_locked
+    def count_by_project(self, project_id: int) -> int:
+        """Count tasks for a specific project"""
+        return len(self.store.tasks_by_project.get(project_id, ()))
+
+    @_locked
+    def count_by_status(self, project_id: int) -> Dict[str, int]:
+        """Count tasks per status for a project"""
+        counts = {}
+        for status in self.store.tasks_by_status:
+            ids = self.store.tasks_by_project_status.get((project_id, status))
+            if ids:
+                counts[status] = len(ids)
+        return counts
+
+    def _tasks(self, ids: Iterable[int]) -> List[Task]:
+        tasks = self.store.tasks
+        return [tasks[task_id] for task_id in ids]
@@ -0,0 +1,159 @@
+"""
+Transactional outbox
+
+Repositories record an event for every project and task change in the
+session of the write, so it is committed or rolled back with it; nothing
+downstream is called while the request waits. ``WebhookDispatcher`` reads
+the events afterwards and delivers them.
+
+Delivery follows (transaction_id, id) and only reads events whose
+transaction is older than every open one, so an event taking an ID before
+a slower transaction commits an earlier one cannot make a cursor skip it.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, tuple_
+from sqlalchemy.orm import Session
+
+from ..models.outbox import OutboxEvent, WebhookEndpoint, oldest_open_transaction
+from ..utils.config import Config
+
+
+TASK_FIELDS = ("id", "project_id", "title", "description", "status", "deadline",
+               "created_at", "updated_at")
+PROJECT_FIELDS = ("id", "name", "description", "created_at", "updated_at")
+
+_EVENT_POSITION = tuple_(OutboxEvent.transaction_id, OutboxEvent.id)
+_ENDPOINT_POSITION = tuple_(WebhookEndpoint.cursor_transaction, WebhookEndpoint.cursor)
+# Events of transactions that can no longer commit anything new before them
+_SETTLED = OutboxEvent.transaction_id < oldest_open_transaction()
+
+
+def _payload(entity, fields: Sequence[str]) -> dict:
+    payload = {}
+    for name in fields:
+        value = getattr(entity, name, None)
+        payload[name] = value.isoformat() if isinstance(value, datetime) else value
+    return payload
+
+
+def task_payload(task) -> dict:
+    return _payload(task, TASK_FIELDS)
+
+
+def project_payload(project) -> dict:
+    return _payload(project, PROJECT_FIELDS)
+
+
+def record_event(db: Session, event_type: str, payload: dict,
+                 project_id: Optional[int] = None):
+    """Add an event to the pending transaction, when OUTBOX_ENABLED is set"""
+    if Config.OUTBOX_ENABLED:
+        db.add(OutboxEvent(event_type=event_type, project_id=project_id, payload=payload))
+
+
+def record_events(db: Session, event_type: str, payloads: Sequence[dict],
+                  project_ids: Sequence[Optional[int]]):
+    """Add one event per payload with a single INSERT"""
+    if Config.OUTBOX_ENABLED and payloads:
+        now = datetime.now()
+        db.execute(insert(OutboxEvent), [
+            {"event_type": event_type, "project_id": project_id,
+             "payload": payload, "created_at": now}
+            for payload, project_id in zip(payloads, project_ids)
+        ])
+
+
+class OutboxRepository:
+    """Repository for outbox events and the webhook endpoints they go to"""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def add_endpoint(self, url: str, event_types: Optional[str] = None,
+                     from_start: bool = False) -> WebhookEndpoint:
+        """
+        Register an endpoint. It receives events recorded from now on, or
+        every event still in the outbox with ``from_start``.
+        """
+        transaction_id, cursor = (0, 0) if from_start else self.last_position()
+        endpoint = WebhookEndpoint(url=url, event_types=event_types or None,
+                                   cursor=cursor, cursor_transaction=transaction_id)
+        self.db.add(endpoint)
+        self.db.commit()
+        return endpoint
+
+    def get_endpoints(self) -> List[WebhookEndpoint]:
+        return self.db.query(WebhookEndpoint).order_by(WebhookEndpoint.id).all()
+
+    def get_due_endpoints(self, now: datetime) -> List[WebhookEndpoint]:
+        """Endpoints not waiting out a retry backoff"""
+        return self.db.query(WebhookEndpoint).filter(
+            (WebhookEndpoint.next_attempt_at.is_(None)) | (WebhookEndpoint.next_attempt_at <= now)
+        ).order_by(WebhookEndpoint.id).all()
+
+    def delete_endpoint(self, id: int) -> bool:
+        deleted = self.db.query(WebhookEndpoint).filter(WebhookEndpoint.id == id).delete(
+            synchronize_session=False
+        )
+        self.db.commit()
+        return deleted > 0
+
+    def get_events_after(self, position: Tuple[int, int], limit: int) -> List[OutboxEvent]:
+        """The next ``limit`` settled events after ``position``, in order"""
+        return self.db.query(OutboxEvent).filter(
+            _EVENT_POSITION > tuple_(*position), _SETTLED
+        ).order_by(OutboxEvent.transaction_id, OutboxEvent.id).limit(limit).all()
+
+    def last_position(self) -> Tuple[int, int]:
+        """Position of the last settled event, (0, 0) when there is none"""
+        last = self.db.query(OutboxEvent.transaction_id, OutboxEvent.id).filter(
+            _SETTLED
+        ).order_by(OutboxEvent.transaction_id.desc(), OutboxEvent.id.desc()).first()
+        return tuple(last) if last else (0, 0)
+
+    def mark_delivered(self, endpoint: WebhookEndpoint, position: Tuple[int, int]):
+        endpoint.cursor_transaction, endpoint.cursor = position
+        endpoint.failures = 0
+        endpoint.next_attempt_at = None
+        endpoint.last_error = None
+        self.db.commit()
+
+    def mark_failed(self, endpoint: WebhookEndpoint, error: str, retry_at: datetime):
+        endpoint.failures += 1
+        endpoint.next_attempt_at = retry_at
+        endpoint.last_error = error[:1000]
+        self.db.commit()
+
+    def pending_counts(self) -> Dict[int, int]:
+        """Events not yet delivered, per endpoint ID"""
+        return {
+            endpoint_id: count for endpoint_id, count in self.db.query(
+                WebhookEndpoint.id, func.count(OutboxEvent.id)
+            ).outerjoin(OutboxEvent, _EVENT_POSITION > _ENDPOINT_POSITION)
+            .group_by(WebhookEndpoint.id).all()
+        }
+
+    def prune_delivered(self) -> int:
+        """Delete events every endpoint has received"""
+        low = self.db.query(
+            WebhookEndpoint.cursor_transaction, WebhookEndpoint.cursor
+        ).order_by(WebhookEndpoint.cursor_transaction, WebhookEndpoint.cursor).first()
+        if low is None:
+            # Nobody to deliver to: keep events until an endpoint is registered
+            # with from_start, or trimmed by age
+            return 0
+        deleted = self.db.query(OutboxEvent).filter(
+            _EVENT_POSITION <= tuple_(*low)
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
+
+    def prune_older_than(self, cutoff: datetime) -> int:
+        """Delete events recorded before ``cutoff``, delivered or not"""
+        deleted = self.db.query(OutboxEvent).filter(OutboxEvent.created_at < cutoff).delete(
+            synchronize_session=False
+        )
+        self.db.commit()
+        return deleted
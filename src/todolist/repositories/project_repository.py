@@ -1,26 +1,34 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import delete, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
 from .base import BaseRepository
+from .outbox_repository import project_payload, record_event
 from ..models.project import Project
+from ..models.task import Task
 from ..exceptions.repository_exceptions import NotFoundError, DuplicateError
 
 
 class ProjectRepository(BaseRepository[Project]):
-    """Repository for Project entities using SQLAlchemy"""
+    """
+    Repository for Project entities using SQLAlchemy
+    
+    Name uniqueness is enforced by the database constraint and existence by
+    affected-row counts, so writes never pre-query the table. Every change
+    is recorded in the outbox in the same transaction.
+    """
     
     def __init__(self, db_session: Session):
         self.db = db_session
     
     def add(self, project: Project) -> Project:
         """Add a new project to database"""
-        # Check for duplicate name
-        if self.get_by_name(project.name):
-            raise DuplicateError("Project", "name", project.name)
-        
         self.db.add(project)
-        self.db.commit()
-        self.db.refresh(project)
+        self._commit(project, "project.created")
         return project
     
     def get(self, id: int) -> Optional[Project]:
@@ -35,32 +43,81 @@ class ProjectRepository(BaseRepository[Project]):
         """Get all projects"""
         return self.db.query(Project).all()
     
+    def get_rows(self, columns: Sequence[str],
+                 ids: Optional[Sequence[int]] = None) -> List[Row]:
+        """
+        Get selected project columns as plain rows, without building ORM
+        objects. ``ids`` restricts the result with a single IN query.
+        """
+        query = self.db.query(*[getattr(Project, name) for name in columns])
+        if ids is not None:
+            query = query.filter(Project.id.in_(set(ids)))
+        return query.order_by(Project.id).all()
+    
+    def get_with_tasks(self, ids: Optional[Sequence[int]] = None) -> List[Tuple[Project, List[Task]]]:
+        """
+        Get projects, optionally only ``ids``, each with its tasks in ID order.
+        Tasks are loaded with ``selectinload``: two queries whatever the
+        number of projects.
+        """
+        query = self.db.query(Project).options(selectinload(Project.tasks))
+        if ids is not None:
+            query = query.filter(Project.id.in_(set(ids)))
+        return [
+            (project, sorted(project.tasks, key=lambda task: task.id))
+            for project in query.order_by(Project.id)
+        ]
+    
     def update(self, project: Project) -> Project:
         """Update project in database"""
-        # Check if project exists
-        existing = self.get(project.id)
-        if not existing:
+        try:
+            self._commit(project, "project.updated")
+        except StaleDataError:
+            self.db.rollback()
             raise NotFoundError("Project", project.id)
+        return project
+    
+    def update_by_id(self, id: int, values: dict) -> Project:
+        """Update project columns with one UPDATE ... RETURNING statement"""
+        values = dict(values, updated_at=datetime.now())
+        statement = update(Project).where(Project.id == id).values(**values)
+        try:
+            project = self.db.execute(statement.returning(Project)).scalar_one_or_none()
+        except IntegrityError:
+            self.db.rollback()
+            raise DuplicateError("Project", "name", values.get("name"))
         
-        # Check for duplicate name (excluding current project)
-        duplicate = self.get_by_name(project.name)
-        if duplicate and duplicate.id != project.id:
-            raise DuplicateError("Project", "name", project.name)
-        
+        if project is None:
+            self.db.commit()
+            raise NotFoundError("Project", id)
+        record_event(self.db, "project.updated", project_payload(project), project.id)
         self.db.commit()
-        self.db.refresh(project)
         return project
     
     def delete(self, id: int) -> bool:
-        """Delete project by ID"""
-        project = self.get(id)
-        if not project:
-            return False
-        
-        self.db.delete(project)
+        """Delete project by ID, its tasks are removed by ON DELETE CASCADE"""
+        deleted = self.db.execute(
+            delete(Project).where(Project.id == id).returning(Project.id)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        if deleted is not None:
+            record_event(self.db, "project.deleted", {"id": id}, id)
         self.db.commit()
-        return True
+        return deleted is not None
     
     def count(self) -> int:
         """Get total number of projects"""
-        return self.db.query(Project).count()
\ No newline at end of file
+        return self.db.query(Project).count()
+    
+    def _commit(self, project: Project, event_type: str):
+        """
+        Flush, record the change and commit, mapping a unique-name violation
+        to DuplicateError
+        """
+        try:
+            self.db.flush()
+        except IntegrityError:
+            self.db.rollback()
+            raise DuplicateError("Project", "name", project.name)
+        record_event(self.db, event_type, project_payload(project), project.id)
+        self.db.commit()
\ No newline at end of file
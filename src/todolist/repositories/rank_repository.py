@@ -0,0 +1,172 @@
+"""
+Manual order of tasks within their (project, status) column
+
+Every lookup here is a seek on the (project_id, status, rank) index: a move
+reads at most the neighbour it lands next to and updates only the moved
+row (plus its outbox event). Rebalancing rewrites the keys of one column
+and is left to the background ``rebalance_ranks`` job; a move only
+rebalances inline when the column is small.
+"""
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from .outbox_repository import record_event, task_payload
+from ..exceptions.repository_exceptions import RebalanceRequiredError
+from ..models.task import Task
+from ..utils.config import Config
+from ..utils.ranks import rank_between, spaced_ranks
+
+
+REBALANCE_BATCH_SIZE = 1000
+
+
+def _column(project_id: int, status: str):
+    return and_(Task.project_id == project_id, Task.status == status)
+
+
+def next_rank(db: Session, project_id: int, status: str) -> str:
+    """Rank placing a new task at the end of its column"""
+    last = db.execute(
+        select(func.max(Task.rank)).where(_column(project_id, status))
+    ).scalar()
+    return rank_between(last, None)
+
+
+def next_ranks(db: Session, status: str, tasks: Sequence[Tuple[int, int]]) -> Dict[int, str]:
+    """
+    Ranks placing ``tasks`` ((id, project_id) pairs) at the end of their
+    project's ``status`` column, in ID order, with one query
+    """
+    project_ids = {project_id for _, project_id in tasks}
+    last = dict(db.execute(
+        select(Task.project_id, func.max(Task.rank))
+        .where(Task.project_id.in_(project_ids), Task.status == status)
+        .group_by(Task.project_id)
+    ).all())
+    ranks = {}
+    for id, project_id in sorted(tasks):
+        last[project_id] = ranks[id] = rank_between(last.get(project_id), None)
+    return ranks
+
+
+class TaskRankRepository:
+    """Repository for the manual order of tasks using SQLAlchemy"""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def _neighbour(self, task: Task, anchor: Task, after: bool) -> Optional[str]:
+        """Rank of the task next to ``anchor`` on one side, ``task`` excluded"""
+        # The plain range on rank lets the index seek straight to the anchor
+        if after:
+            beyond = and_(Task.rank >= anchor.rank, or_(Task.rank > anchor.rank, Task.id > anchor.id))
+            order = (Task.rank, Task.id)
+        else:
+            beyond = and_(Task.rank <= anchor.rank, or_(Task.rank < anchor.rank, Task.id < anchor.id))
+            order = (Task.rank.desc(), Task.id.desc())
+        return self.db.execute(
+            select(Task.rank).where(
+                _column(anchor.project_id, anchor.status), Task.id != task.id, beyond
+            ).order_by(*order).limit(1)
+        ).scalar()
+
+    def _bounds(self, task: Task, before: Optional[Task],
+                after: Optional[Task]) -> Tuple[Optional[str], Optional[str]]:
+        if after is not None:
+            return after.rank, self._neighbour(task, after, after=True)
+        if before is not None:
+            return self._neighbour(task, before, after=False), before.rank
+        last = self.db.execute(
+            select(func.max(Task.rank)).where(
+                _column(task.project_id, task.status), Task.id != task.id
+            )
+        ).scalar()
+        return last, None
+
+    def _has_unranked(self, project_id: int, status: str) -> bool:
+        return self.db.execute(
+            select(Task.id).where(_column(project_id, status), Task.rank.is_(None)).limit(1)
+        ).first() is not None
+
+    def _rebalance_inline(self, project_id: int, status: str):
+        """Rebalance a small column now, larger ones must go to the background job"""
+        limit = Config.RANK_INLINE_REBALANCE_MAX
+        size = self.db.execute(
+            select(func.count()).select_from(
+                select(Task.id).where(_column(project_id, status)).limit(limit + 1).subquery()
+            )
+        ).scalar()
+        if size > limit:
+            raise RebalanceRequiredError(project_id, status)
+        self.rebalance(project_id, status)
+
+    def move(self, task_id: int, before_id: Optional[int] = None,
+             after_id: Optional[int] = None) -> Task:
+        """
+        Give a task a rank right before ``before_id`` or right after
+        ``after_id`` (the end of the column when neither is given), updating
+        only its row. Takes IDs so the move can run in another session.
+        Raises RebalanceRequiredError when the column has unranked or tied
+        keys and is too long to respace inline.
+        """
+        task = self.db.get(Task, task_id)
+        before = self.db.get(Task, before_id) if before_id is not None else None
+        after = self.db.get(Task, after_id) if after_id is not None else None
+        if self._has_unranked(task.project_id, task.status):
+            self._rebalance_inline(task.project_id, task.status)
+        for anchor in (before, after):
+            if anchor is not None:
+                self.db.refresh(anchor, ["rank"])
+        low, high = self._bounds(task, before, after)
+        if low is not None and high is not None and low >= high:
+            # Equal neighbours leave no key in between, spread the column out
+            self._rebalance_inline(task.project_id, task.status)
+            for anchor in (before, after):
+                if anchor is not None:
+                    self.db.refresh(anchor, ["rank"])
+            low, high = self._bounds(task, before, after)
+
+        task = self.db.execute(
+            update(Task).where(Task.id == task.id)
+            .values(rank=rank_between(low, high), updated_at=datetime.now())
+            .returning(Task)
+        ).scalar_one()
+        record_event(self.db, "task.updated", task_payload(task), task.project_id)
+        self.db.commit()
+        return task
+
+    def rebalance(self, project_id: int, status: str) -> int:
+        """
+        Rewrite the ranks of a column evenly spaced, keeping its order;
+        unranked tasks go first, as they sort. Returns the number of tasks
+        """
+        ids = self.db.execute(
+            select(Task.id).where(_column(project_id, status))
+            .order_by(Task.rank.is_not(None), Task.rank, Task.id)
+        ).scalars().all()
+        statement = update(Task.__table__).where(
+            Task.__table__.c.id == bindparam("task_id")
+        ).values(rank=bindparam("new_rank"), updated_at=Task.__table__.c.updated_at)
+        ranks = spaced_ranks(len(ids))
+        for start in range(0, len(ids), REBALANCE_BATCH_SIZE):
+            self.db.execute(statement, [
+                {"task_id": id, "new_rank": rank}
+                for id, rank in zip(ids[start:start + REBALANCE_BATCH_SIZE],
+                                    ranks[start:start + REBALANCE_BATCH_SIZE])
+            ])
+        self.db.commit()
+        return len(ids)
+
+    def long_columns(self, max_length: int,
+                     project_id: Optional[int] = None) -> List[Tuple[int, str]]:
+        """(project_id, status) of the columns with a rank longer than ``max_length``"""
+        query = select(Task.project_id, Task.status).group_by(Task.project_id, Task.status)
+        if project_id is not None:
+            query = query.where(Task.project_id == project_id)
+        return self.db.execute(
+            query.having(func.max(func.length(Task.rank)) > max_length)
+            .order_by(Task.project_id, Task.status)
+        ).all()
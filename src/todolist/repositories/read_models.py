@@ -0,0 +1,114 @@
+"""
+Lightweight read models for bulk reads
+
+These repositories run Core ``select()`` statements over plain columns and
+return compact named tuples, so no mapped instances, instrumentation or
+identity-map entries are created. ``iter_batches`` pages through the table
+with keyset pagination on the primary key, keeping memory flat regardless of
+table size and staying safe to use while the caller commits between batches.
+"""
+from datetime import datetime
+from typing import Iterator, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..models.project import Project
+from ..models.task import Task
+
+
+class TaskRecord(NamedTuple):
+    """Read-only task row"""
+    id: int
+    title: str
+    description: str
+    status: str
+    deadline: Optional[datetime]
+    project_id: int
+    created_at: datetime
+    updated_at: datetime
+
+
+class ProjectRecord(NamedTuple):
+    """Read-only project row"""
+    id: int
+    name: str
+    description: str
+    created_at: datetime
+    updated_at: datetime
+
+
+class _ReadRepository:
+    """Shared select/paging logic for read-model repositories"""
+    
+    model = None
+    record = None
+    
+    def __init__(self, db_session: Session):
+        self.db = db_session
+    
+    def _select(self):
+        return select(*[getattr(self.model, name) for name in self.record._fields])
+    
+    def _filter(self, stmt, **filters):
+        return stmt
+    
+    def list(self, **filters) -> List:
+        """Get all matching records"""
+        stmt = self._filter(self._select(), **filters).order_by(self.model.id)
+        return [self.record._make(row) for row in self.db.execute(stmt)]
+    
+    def iter_batches(self, batch_size: int = 1000, **filters) -> Iterator[List]:
+        """Yield matching records in batches of at most ``batch_size``"""
+        last_id = 0
+        while True:
+            stmt = self._filter(self._select(), **filters).where(
+                self.model.id > last_id
+            ).order_by(self.model.id).limit(batch_size)
+            batch = [self.record._make(row) for row in self.db.execute(stmt)]
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
+    
+    def iter_all(self, batch_size: int = 1000, **filters) -> Iterator:
+        """Yield matching records one by one, fetched in batches"""
+        for batch in self.iter_batches(batch_size, **filters):
+            yield from batch
+
+
+class TaskReadRepository(_ReadRepository):
+    """Read-only task queries returning ``TaskRecord`` tuples"""
+    
+    model = Task
+    record = TaskRecord
+    
+    def _filter(self, stmt, project_id: Optional[int] = None,
+                status: Optional[str] = None, overdue: bool = False):
+        if project_id is not None:
+            stmt = stmt.where(Task.project_id == project_id)
+        if status:
+            stmt = stmt.where(Task.status == status)
+        if overdue:
+            stmt = stmt.where(Task.deadline < datetime.now(), Task.status != "done")
+        return stmt
+    
+    def list(self, project_id: Optional[int] = None, status: Optional[str] = None,
+             overdue: bool = False) -> List[TaskRecord]:
+        """Get tasks as records, optionally filtered"""
+        return super().list(project_id=project_id, status=status, overdue=overdue)
+    
+    def iter_batches(self, batch_size: int = 1000, project_id: Optional[int] = None,
+                     status: Optional[str] = None,
+                     overdue: bool = False) -> Iterator[List[TaskRecord]]:
+        """Stream tasks as batches of records, optionally filtered"""
+        return super().iter_batches(
+            batch_size, project_id=project_id, status=status, overdue=overdue
+        )
+
+
+class ProjectReadRepository(_ReadRepository):
+    """Read-only project queries returning ``ProjectRecord`` tuples"""
+    
+    model = Project
+    record = ProjectRecord
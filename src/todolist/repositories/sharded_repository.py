@@ -0,0 +1,239 @@
+"""
+Repositories spreading projects over several databases
+
+Calls that name a project are routed to its shard through the directory;
+calls that do not (lists, counts, lookups by task ID) fan out to every shard
+concurrently and merge the results. Each shard is accessed through the
+regular SQLAlchemy repositories.
+"""
+import copy
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+
+from ..db.sharding import ShardSessions
+from ..exceptions.repository_exceptions import NotFoundError
+from ..models.project import Project
+from ..models.task import Task
+from .project_repository import ProjectRepository
+from .task_event_repository import TaskEventRepository
+from .task_query import TaskQuery
+from .task_repository import TaskRepository
+
+
+def _by_id(items: list) -> list:
+    return sorted(items, key=lambda item: item.id)
+
+
+class ShardedProjectRepository:
+    """Project repository over all shards, names kept unique by the directory"""
+
+    def __init__(self, sessions: ShardSessions):
+        self.sessions = sessions
+        self.router = sessions.router
+
+    def add(self, project: Project) -> Project:
+        """Register the project in the directory, then insert it in its shard"""
+        project.id, shard = self.router.register_project(project.name)
+        try:
+            return ProjectRepository(self.sessions.get(shard)).add(project)
+        except Exception:
+            self.router.unregister_project(project.id)
+            raise
+
+    def get(self, id: int) -> Optional[Project]:
+        try:
+            return ProjectRepository(self.sessions.for_project(id)).get(id)
+        except NotFoundError:
+            return None
+
+    def get_by_name(self, name: str) -> Optional[Project]:
+        project_id = self.router.find_project(name)
+        return self.get(project_id) if project_id is not None else None
+
+    def get_all(self) -> List[Project]:
+        results = self.sessions.fan_out(lambda db: ProjectRepository(db).get_all())
+        return _by_id([project for projects in results for project in projects])
+
+    def get_rows(self, columns: Sequence[str], ids: Optional[Sequence[int]] = None) -> list:
+        results = self.sessions.fan_out(lambda db: ProjectRepository(db).get_rows(columns, ids))
+        rows = [row for shard_rows in results for row in shard_rows]
+        if "id" in columns:
+            index = list(columns).index("id")
+            rows.sort(key=lambda row: row[index])
+        return rows
+
+    def get_with_tasks(self, ids: Optional[Sequence[int]] = None) -> List[Tuple[Project, List[Task]]]:
+        results = self.sessions.fan_out(lambda db: ProjectRepository(db).get_with_tasks(ids))
+        return sorted((pair for pairs in results for pair in pairs), key=lambda pair: pair[0].id)
+
+    def update_by_id(self, id: int, values: dict) -> Project:
+        db = self.sessions.for_project(id, write=True)
+        old_name = None
+        if "name" in values:
+            old_name = ProjectRepository(db).get(id).name
+            self.router.rename_project(id, values["name"])
+        try:
+            return ProjectRepository(db).update_by_id(id, values)
+        except Exception:
+            if old_name is not None:
+                self.router.rename_project(id, old_name)
+            raise
+
+    def delete(self, id: int) -> bool:
+        try:
+            db = self.sessions.for_project(id, write=True)
+        except NotFoundError:
+            return False
+        deleted = ProjectRepository(db).delete(id)
+        self.router.unregister_project(id)
+        return deleted
+
+    def count(self) -> int:
+        return len(self.router.project_ids())
+
+
+class ShardedTaskRepository:
+    """Task repository over all shards, task IDs allocated by the directory"""
+
+    def __init__(self, sessions: ShardSessions):
+        self.sessions = sessions
+        self.router = sessions.router
+
+    def _repo(self, project_id: int, write: bool = False) -> TaskRepository:
+        return TaskRepository(self.sessions.for_project(project_id, write=write))
+
+    def _locate(self, task_id: int, write: bool = False) -> Optional[TaskRepository]:
+        """Repository of the shard holding a task, None when no shard has it"""
+        def project_of(db):
+            return db.execute(select(Task.project_id).where(Task.id == task_id)).scalar()
+
+        for project_id in self.sessions.fan_out(project_of):
+            if project_id is not None:
+                return self._repo(project_id, write=write)
+        return None
+
+    def add(self, task: Task) -> Task:
+        repo = self._repo(task.project_id, write=True)
+        task.id = self.router.task_ids.next_id()
+        return repo.add(task)
+
+    def get(self, id: int) -> Optional[Task]:
+        found = [task for task in self.sessions.fan_out(lambda db: TaskRepository(db).get(id)) if task]
+        return found[0] if found else None
+
+    def get_by_project_id(self, project_id: int) -> List[Task]:
+        try:
+            return self._repo(project_id).get_by_project_id(project_id)
+        except NotFoundError:
+            return []
+
+    def get_by_status(self, project_id: int, status: str) -> List[Task]:
+        try:
+            return self._repo(project_id).get_by_status(project_id, status)
+        except NotFoundError:
+            return []
+
+    def get_overdue_tasks(self, project_id: Optional[int] = None) -> List[Task]:
+        if project_id is not None:
+            try:
+                return self._repo(project_id).get_overdue_tasks(project_id)
+            except NotFoundError:
+                return []
+        results = self.sessions.fan_out(lambda db: TaskRepository(db).get_overdue_tasks())
+        return _by_id([task for tasks in results for task in tasks])
+
+    def get_rows(self, columns: Sequence[str], query: Optional[TaskQuery] = None) -> List[tuple]:
+        """
+        Rows of one shard when the query names a project, otherwise the first
+        offset + limit rows of every shard merged in query order
+        """
+        query = query or TaskQuery()
+        if query.project_id is not None:
+            try:
+                return self._repo(query.project_id).get_rows(columns, query)
+            except NotFoundError:
+                return []
+
+        # Sort keys are fetched too, to merge in the same order as SQL
+        names = list(dict.fromkeys(list(columns) + [n for n, _ in query.sort] + ["id"]))
+        shard_query = copy.copy(query)
+        shard_query.offset = 0
+        shard_query.limit = query.offset + query.limit if query.limit is not None else None
+        results = self.sessions.fan_out(lambda db: TaskRepository(db).get_rows(names, shard_query))
+        rows = query.sort_and_page([row for shard_rows in results for row in shard_rows])
+        return [tuple(getattr(row, name) for name in columns) for row in rows]
+
+    def get_all(self) -> List[Task]:
+        results = self.sessions.fan_out(lambda db: TaskRepository(db).get_all())
+        return _by_id([task for tasks in results for task in tasks])
+
+    def update_by_id(self, id: int, values: dict) -> Task:
+        repo = self._locate(id, write=True)
+        if repo is None:
+            raise NotFoundError("Task", id)
+        return repo.update_by_id(id, values)
+
+    def bulk_change_status(self, ids: Sequence[int], status: str) -> int:
+        """
+        Tasks are grouped by project and written through each project's write
+        route, so nothing is written when one of them is being moved.
+
+        Not atomic across shards: each shard commits its own part, so when
+        one fails the tasks on shards that already committed stay changed
+        """
+        def projects_of(db):
+            return db.execute(select(Task.id, Task.project_id).where(Task.id.in_(ids))).all()
+
+        by_project: Dict[int, set] = {}
+        for rows in self.sessions.fan_out(projects_of):
+            for task_id, project_id in rows:
+                by_project.setdefault(project_id, set()).add(task_id)
+        # Resolve every route first, a moving project fails before any commit
+        repos = {project_id: self._repo(project_id, write=True) for project_id in by_project}
+        return sum(
+            repos[project_id].bulk_change_status(sorted(task_ids), status)
+            for project_id, task_ids in by_project.items()
+        )
+
+    def delete(self, id: int) -> bool:
+        repo = self._locate(id, write=True)
+        return repo.delete(id) if repo is not None else False
+
+    def delete_chunk_by_project(self, project_id: int, limit: int) -> int:
+        return self._repo(project_id, write=True).delete_chunk_by_project(project_id, limit)
+
+    def count(self) -> int:
+        return sum(self.sessions.fan_out(lambda db: TaskRepository(db).count()))
+
+    def count_by_project(self, project_id: int) -> int:
+        try:
+            return self._repo(project_id).count_by_project(project_id)
+        except NotFoundError:
+            return 0
+
+    def count_by_status(self, project_id: int) -> Dict[str, int]:
+        try:
+            return self._repo(project_id).count_by_status(project_id)
+        except NotFoundError:
+            return {}
+
+
+class ShardedTaskEventRepository:
+    """Status log queries routed to the shard of the project"""
+
+    def __init__(self, sessions: ShardSessions):
+        self.sessions = sessions
+
+    def _repo(self, project_id: int) -> TaskEventRepository:
+        return TaskEventRepository(self.sessions.for_project(project_id))
+
+    def get_by_task(self, task_id: int) -> list:
+        results = self.sessions.fan_out(lambda db: TaskEventRepository(db).get_by_task(task_id))
+        return [event for events in results for event in events]
+
+    def daily_throughput(self, project_id: int, *args, **kwargs) -> List[Tuple]:
+        return self._repo(project_id).daily_throughput(project_id, *args, **kwargs)
+
+    def lead_time_percentiles(self, project_id: int, *args, **kwargs) -> dict:
+        return self._repo(project_id).lead_time_percentiles(project_id, *args, **kwargs)
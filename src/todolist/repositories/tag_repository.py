@@ -0,0 +1,84 @@
+"""
+Tags of tasks
+
+Tagging and untagging are single set-based statements over ``task_tags``
+however many tasks and tags they name; tag filters for task lists live in
+``task_query.tagged_task_ids``.
+"""
+from typing import List, Optional, Sequence
+
+from sqlalchemy import and_, delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.tag import Tag, TaskTag
+from ..models.task import Task
+
+
+class TagRepository:
+    """Repository for tags and the 'task_tags' association using SQLAlchemy"""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def _tag_ids(self, names: Sequence[str]) -> List[int]:
+        return self.db.execute(select(Tag.id).where(Tag.name.in_(names))).scalars().all()
+
+    def _ensure_tags(self, names: Sequence[str]) -> List[int]:
+        """IDs of the named tags, creating the missing ones"""
+        existing = set(self.db.execute(
+            select(Tag.name).where(Tag.name.in_(names))
+        ).scalars())
+        missing = [name for name in names if name not in existing]
+        if missing:
+            try:
+                self.db.execute(insert(Tag), [{"name": name} for name in missing])
+                self.db.commit()
+            except IntegrityError:
+                # Created concurrently by another request
+                self.db.rollback()
+        return self._tag_ids(names)
+
+    def tag(self, task_ids: Sequence[int], names: Sequence[str]) -> int:
+        """Add tags to tasks, returns the number of new (task, tag) pairs"""
+        tag_ids = self._ensure_tags(names)
+        already = select(TaskTag.task_id).where(
+            TaskTag.task_id == Task.id, TaskTag.tag_id == Tag.id
+        ).exists()
+        pairs = select(Task.id, Tag.id).join(Tag, and_(
+            Tag.id.in_(tag_ids), Task.id.in_(task_ids)
+        )).where(~already)
+        result = self.db.execute(
+            insert(TaskTag).from_select(["task_id", "tag_id"], pairs)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def untag(self, task_ids: Sequence[int], names: Sequence[str]) -> int:
+        """Remove tags from tasks, returns the number of (task, tag) pairs removed"""
+        result = self.db.execute(
+            delete(TaskTag).where(
+                TaskTag.task_id.in_(task_ids),
+                TaskTag.tag_id.in_(select(Tag.id).where(Tag.name.in_(names))),
+            )
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def get_task_tags(self, task_id: int) -> List[str]:
+        """Names of the tags of a task"""
+        return self.db.execute(
+            select(Tag.name).join(TaskTag, TaskTag.tag_id == Tag.id)
+            .where(TaskTag.task_id == task_id).order_by(Tag.name)
+        ).scalars().all()
+
+    def counts(self, project_id: Optional[int] = None) -> list:
+        """(project_id, tag, task count) rows from one grouped query"""
+        query = select(Task.project_id, Tag.name, func.count()).select_from(TaskTag).join(
+            Task, Task.id == TaskTag.task_id
+        ).join(Tag, Tag.id == TaskTag.tag_id)
+        if project_id is not None:
+            query = query.where(Task.project_id == project_id)
+        return self.db.execute(
+            query.group_by(Task.project_id, Tag.name).order_by(Task.project_id, Tag.name)
+        ).all()
@@ -0,0 +1,112 @@
+"""
+Blocking relationships between tasks
+
+Transitive blockers and dependents are walked with recursive CTEs over
+``task_dependencies``, one statement however deep the graph is. The walk
+uses UNION, so every task is visited once and cycles cannot loop.
+"""
+from typing import List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from ..models.task import Task
+from ..models.task_dependency import TaskDependency
+from ..utils.config import Config
+from .outbox_repository import record_events
+
+
+def _walk(start_id: int, blockers: bool, transitive: bool = True):
+    """Subquery of the IDs reachable from a task along its blockers or dependents"""
+    dependency = TaskDependency
+    source, target = ((dependency.task_id, dependency.blocker_id) if blockers
+                      else (dependency.blocker_id, dependency.task_id))
+    first = select(target.label("id")).where(source == start_id)
+    if not transitive:
+        return first.subquery()
+    walk = first.cte("walk", recursive=True)
+    return walk.union(select(target).join(walk, source == walk.c.id))
+
+
+def _has_unfinished_blocker():
+    """EXISTS clause for a ``Task`` with a blocker that is not done"""
+    blocker = aliased(Task)
+    return select(TaskDependency.task_id).join(
+        blocker, blocker.id == TaskDependency.blocker_id
+    ).where(TaskDependency.task_id == Task.id, blocker.status != "done").exists()
+
+
+def ready_dependents(db: Session, done_ids: Sequence[int]) -> list:
+    """
+    (id, project_id) of the direct dependents of ``done_ids`` that are now
+    ready to start, with one query
+    """
+    if not done_ids:
+        return []
+    return db.execute(
+        select(Task.id, Task.project_id).join(
+            TaskDependency, TaskDependency.task_id == Task.id
+        ).where(
+            TaskDependency.blocker_id.in_(done_ids),
+            Task.status == "todo",
+            ~_has_unfinished_blocker(),
+        ).distinct().order_by(Task.id)
+    ).all()
+
+
+def record_ready_events(db: Session, done_ids: Sequence[int]):
+    """Record a 'task.ready' event for each task unblocked by ``done_ids``"""
+    if not Config.OUTBOX_ENABLED:
+        return
+    rows = ready_dependents(db, done_ids)
+    record_events(db, "task.ready", [
+        {"id": id, "project_id": project_id} for id, project_id in rows
+    ], [project_id for _, project_id in rows])
+
+
+class TaskDependencyRepository:
+    """Repository for the 'task_dependencies' graph using SQLAlchemy"""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def get(self, task_id: int, blocker_id: int) -> Optional[TaskDependency]:
+        return self.db.get(TaskDependency, (task_id, blocker_id))
+
+    def add(self, task_id: int, blocker_id: int) -> TaskDependency:
+        dependency = TaskDependency(task_id=task_id, blocker_id=blocker_id)
+        self.db.add(dependency)
+        self.db.commit()
+        return dependency
+
+    def delete(self, task_id: int, blocker_id: int) -> bool:
+        dependency = self.get(task_id, blocker_id)
+        if dependency is None:
+            return False
+        self.db.delete(dependency)
+        self.db.commit()
+        return True
+
+    def is_blocked_by(self, task_id: int, blocker_id: int) -> bool:
+        """Check whether ``blocker_id`` is a transitive blocker of ``task_id``"""
+        walk = _walk(task_id, blockers=True)
+        return self.db.execute(
+            select(walk.c.id).where(walk.c.id == blocker_id).limit(1)
+        ).first() is not None
+
+    def get_blockers(self, task_id: int, transitive: bool = True) -> List[Task]:
+        """Tasks ``task_id`` waits for, directly or through other tasks"""
+        walk = _walk(task_id, blockers=True, transitive=transitive)
+        return self.db.query(Task).filter(Task.id.in_(select(walk.c.id))).order_by(Task.id).all()
+
+    def get_dependents(self, task_id: int, transitive: bool = True) -> List[Task]:
+        """Tasks waiting for ``task_id``, directly or through other tasks"""
+        walk = _walk(task_id, blockers=False, transitive=transitive)
+        return self.db.query(Task).filter(Task.id.in_(select(walk.c.id))).order_by(Task.id).all()
+
+    def get_ready(self, project_id: int, limit: Optional[int] = None) -> List[Task]:
+        """Tasks of a project still to do whose blockers are all done"""
+        query = self.db.query(Task).filter(
+            Task.project_id == project_id, Task.status == "todo", ~_has_unfinished_blocker()
+        ).order_by(Task.id)
+        return query.limit(limit).all() if limit else query.all()
@@ -0,0 +1,109 @@
+"""
+Queries over the task status event log
+
+Throughput and lead time are aggregated in the database: only one row per
+day, or one row per requested percentile, is returned to Python.
+"""
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import BigInteger, extract, func, or_, select, type_coerce
+from sqlalchemy.orm import Session
+
+from ..models.task_status_event import TaskStatusEvent
+
+
+class TaskEventRepository:
+    """Repository for the append-only 'task_status_events' log"""
+
+    def __init__(self, db_session: Session):
+        self.db = db_session
+
+    def get_by_task(self, task_id: int) -> List[TaskStatusEvent]:
+        """Get the status history of a task, oldest first"""
+        return self.db.query(TaskStatusEvent).filter(
+            TaskStatusEvent.task_id == task_id
+        ).order_by(TaskStatusEvent.changed_at, TaskStatusEvent.id).all()
+
+    def daily_throughput(self, project_id: int, start: datetime, end: datetime,
+                         status: str = "done") -> List[Tuple[date, int]]:
+        """Count transitions into ``status`` per day in [start, end)"""
+        day = self._day(TaskStatusEvent.changed_at).label("day")
+        rows = self.db.execute(
+            select(day, func.count()).where(
+                TaskStatusEvent.project_id == project_id,
+                TaskStatusEvent.to_status == status,
+                TaskStatusEvent.changed_at >= start,
+                TaskStatusEvent.changed_at < end,
+            ).group_by(day).order_by(day)
+        ).all()
+        # SQLite returns date() as text
+        return [(date.fromisoformat(d) if isinstance(d, str) else d, count) for d, count in rows]
+
+    def lead_time_percentiles(self, project_id: int, start: datetime, end: datetime,
+                              percentiles: Sequence[float]) -> Dict[str, Optional[float]]:
+        """
+        Seconds from a task's first event to each transition into 'done' in
+        [start, end), as count, mean and nearest-rank percentiles
+        """
+        first = select(
+            TaskStatusEvent.task_id,
+            func.min(TaskStatusEvent.changed_at).label("started_at"),
+        ).where(TaskStatusEvent.project_id == project_id).group_by(
+            TaskStatusEvent.task_id
+        ).subquery()
+        lead = select(
+            self._seconds_between(TaskStatusEvent.changed_at, first.c.started_at).label("seconds")
+        ).join(first, first.c.task_id == TaskStatusEvent.task_id).where(
+            TaskStatusEvent.project_id == project_id,
+            TaskStatusEvent.to_status == "done",
+            TaskStatusEvent.changed_at >= start,
+            TaskStatusEvent.changed_at < end,
+        ).subquery()
+        ranked = select(
+            lead.c.seconds,
+            func.row_number().over(order_by=lead.c.seconds).label("rank"),
+            func.count().over().label("total"),
+            func.avg(lead.c.seconds).over().label("mean"),
+        ).subquery()
+
+        # Nearest rank: the smallest rank with rank / total >= p / 100
+        wanted = [
+            (ranked.c.rank * 100 >= p * ranked.c.total) & ((ranked.c.rank - 1) * 100 < p * ranked.c.total)
+            for p in percentiles
+        ]
+        rows = self.db.execute(
+            select(ranked.c.seconds, ranked.c.rank, ranked.c.total, ranked.c.mean).where(
+                or_(ranked.c.rank == 1, *wanted)
+            ).order_by(ranked.c.rank)
+        ).all()
+
+        result = {"count": 0, "mean": None}
+        result.update({f"p{p:g}": None for p in percentiles})
+        if not rows:
+            return result
+        total = rows[0].total
+        result["count"] = total
+        result["mean"] = float(rows[0].mean)
+        for p in percentiles:
+            for row in rows:
+                if row.rank * 100 >= p * total:
+                    result[f"p{p:g}"] = float(row.seconds)
+                    break
+        return result
+
+    def _is_sqlite(self) -> bool:
+        return self.db.get_bind().dialect.name == "sqlite"
+
+    def _day(self, column):
+        """Dialect-specific date of a timestamp"""
+        if self._is_sqlite():
+            # Timestamps are epoch microseconds on SQLite
+            return func.date(type_coerce(column, BigInteger) // 1000000, "unixepoch")
+        return func.date(column)
+
+    def _seconds_between(self, end, start):
+        """Dialect-specific difference of two timestamps in seconds"""
+        if self._is_sqlite():
+            return (type_coerce(end, BigInteger) - type_coerce(start, BigInteger)) / 1000000.0
+        return extract("epoch", end - start)
@@ -0,0 +1,196 @@
+"""
+Filters, ordering and paging for task list queries
+
+A ``TaskQuery`` is built once by the caller and applied by each backend:
+``apply()`` adds WHERE / ORDER BY / LIMIT clauses to a SQLAlchemy query over
+``Task`` or ``TaskArchive`` (same column names), while ``matches()`` and
+``sort_and_page()`` evaluate it against in-memory tasks. Tag filters are
+SQL only, the in-memory backend has no tags.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+
+from ..db.types import STATUS_CODES
+from ..models.tag import Tag, TaskTag
+
+
+# Columns that can be sorted on, all backed by an index
+SORTABLE_COLUMNS = (
+    "id", "deadline", "created_at", "updated_at", "status", "project_id", "rank",
+)
+
+
+def parse_sort(sort: Optional[str]) -> List[Tuple[str, bool]]:
+    """
+    Parse 'deadline,-created_at' into [("deadline", False), ("created_at", True)],
+    a leading '-' meaning descending
+    """
+    if not sort:
+        return []
+    order = []
+    for part in sort.split(","):
+        part = part.strip()
+        column = part.lstrip("-")
+        if column not in SORTABLE_COLUMNS:
+            raise ValueError(
+                f"Cannot sort by '{column}', sortable columns: {', '.join(SORTABLE_COLUMNS)}"
+            )
+        order.append((column, part.startswith("-")))
+    return order
+
+
+def _sort_value(task, name: str):
+    # Statuses sort in workflow order, like their stored codes
+    value = getattr(task, name)
+    return STATUS_CODES.get(value, -1) if name == "status" else value
+
+
+def tagged_task_ids(names: Sequence[str], match_all: bool = False):
+    """
+    Select of the IDs of tasks with any (or all) of the named tags, resolved
+    through the unique tag names and the (tag_id, task_id) index
+    """
+    query = select(TaskTag.task_id).where(
+        TaskTag.tag_id.in_(select(Tag.id).where(Tag.name.in_(names)))
+    )
+    if match_all and len(names) > 1:
+        query = query.group_by(TaskTag.task_id).having(func.count() == len(names))
+    return query
+
+
+class TaskQuery:
+    """Task filters, sort order and page"""
+
+    def __init__(self, project_id: Optional[int] = None,
+                 ids: Optional[Sequence[int]] = None,
+                 statuses: Optional[Sequence[str]] = None,
+                 deadline_from: Optional[datetime] = None,
+                 deadline_to: Optional[datetime] = None,
+                 created_from: Optional[datetime] = None,
+                 created_to: Optional[datetime] = None,
+                 updated_from: Optional[datetime] = None,
+                 updated_to: Optional[datetime] = None,
+                 overdue: bool = False,
+                 upcoming_days: Optional[int] = None,
+                 tags: Optional[Sequence[str]] = None,
+                 match_all_tags: bool = False,
+                 sort: Optional[List[Tuple[str, bool]]] = None,
+                 limit: Optional[int] = None,
+                 offset: int = 0):
+        self.project_id = project_id
+        # Batch lookup by task IDs, None when not filtering on IDs
+        self.ids = set(ids) if ids is not None else None
+        self.statuses = list(statuses) if statuses else []
+        self.overdue = overdue
+        self.tags = list(dict.fromkeys(tags)) if tags else []
+        self.match_all_tags = match_all_tags
+        self.sort = sort or []
+        self.limit = limit
+        self.offset = offset or 0
+
+        # Ranges are half-open: [from, to)
+        self.ranges = []
+        for column, start, end in (("deadline", deadline_from, deadline_to),
+                                   ("created_at", created_from, created_to),
+                                   ("updated_at", updated_from, updated_to)):
+            if start is not None or end is not None:
+                self.ranges.append((column, start, end))
+        if upcoming_days is not None:
+            now = datetime.now()
+            self.ranges.append(("deadline", now, now + timedelta(days=upcoming_days)))
+        # Upcoming deadlines are only interesting for unfinished tasks
+        self.unfinished = overdue or upcoming_days is not None
+
+    def key(self) -> tuple:
+        """Hashable value of the query, equal for identical queries"""
+        return (
+            self.project_id,
+            tuple(sorted(self.ids)) if self.ids is not None else None,
+            tuple(self.statuses), tuple(self.ranges), self.overdue, self.unfinished,
+            tuple(sorted(self.tags)), self.match_all_tags,
+            tuple(self.sort), self.limit, self.offset,
+        )
+
+    def apply(self, query, model):
+        """Apply filters, order and page to a Query/Select over ``model``"""
+        query = self.apply_filters(query, model).order_by(*self.order_by(model))
+        return self.apply_page(query)
+
+    def apply_filters(self, query, model):
+        """Apply only the WHERE clauses to a Query/Select over ``model``"""
+        if self.project_id is not None:
+            query = query.filter(model.project_id == self.project_id)
+        if self.ids is not None:
+            query = query.filter(model.id.in_(self.ids))
+        if len(self.statuses) == 1:
+            query = query.filter(model.status == self.statuses[0])
+        elif self.statuses:
+            query = query.filter(model.status.in_(self.statuses))
+        for column, start, end in self.ranges:
+            attribute = getattr(model, column)
+            if start is not None:
+                query = query.filter(attribute >= start)
+            if end is not None:
+                query = query.filter(attribute < end)
+        if self.overdue:
+            query = query.filter(model.deadline < datetime.now())
+        if self.unfinished:
+            query = query.filter(model.status != "done")
+        if self.tags:
+            query = query.filter(model.id.in_(tagged_task_ids(self.tags, self.match_all_tags)))
+        return query
+
+    def apply_page(self, query):
+        """Apply LIMIT / OFFSET"""
+        if self.limit is not None:
+            query = query.limit(self.limit)
+        if self.offset:
+            query = query.offset(self.offset)
+        return query
+
+    def order_by(self, columns) -> list:
+        """ORDER BY clauses against an object exposing the sort columns"""
+        order = [
+            getattr(columns, name).desc() if descending else getattr(columns, name)
+            for name, descending in self.sort
+        ]
+        if "id" not in (name for name, _ in self.sort):
+            order.append(columns.id)
+        return order
+
+    def matches(self, task, now: Optional[datetime] = None) -> bool:
+        """Check an in-memory task against the filters"""
+        if self.project_id is not None and task.project_id != self.project_id:
+            return False
+        if self.ids is not None and task.id not in self.ids:
+            return False
+        if self.statuses and task.status not in self.statuses:
+            return False
+        for column, start, end in self.ranges:
+            value = getattr(task, column)
+            if value is None:
+                return False
+            if start is not None and value < start:
+                return False
+            if end is not None and value >= end:
+                return False
+        if self.overdue and (task.deadline is None or task.deadline >= (now or datetime.now())):
+            return False
+        if self.unfinished and task.status == "done":
+            return False
+        return True
+
+    def sort_and_page(self, tasks: list) -> list:
+        """Sort and slice in-memory tasks like ``apply`` does in SQL"""
+        tasks = sorted(tasks, key=lambda task: task.id)
+        # Stable sorts applied from the least significant key
+        for name, descending in reversed(self.sort):
+            present = [task for task in tasks if getattr(task, name) is not None]
+            missing = [task for task in tasks if getattr(task, name) is None]
+            present.sort(key=lambda task: _sort_value(task, name), reverse=descending)
+            # NULLs sort first ascending and last descending, as in SQLite
+            tasks = present + missing if descending else missing + present
+        end = self.offset + self.limit if self.limit is not None else None
+        return tasks[self.offset:end]
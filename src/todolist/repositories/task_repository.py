@@ -1,22 +1,56 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy import bindparam, delete, func, inspect, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.exc import StaleDataError
 
 from .base import BaseRepository
+from .outbox_repository import record_event, record_events, task_payload
+from .rank_repository import next_rank, next_ranks
+from .task_dependency_repository import record_ready_events
+from .task_query import TaskQuery
 from ..models.task import Task
 from ..exceptions.repository_exceptions import NotFoundError
+from ..utils.ranks import rank_between
+
+
+def _is_foreign_key_violation(error: IntegrityError) -> bool:
+    """Whether a write failed on a foreign key (SQLite message, PostgreSQL SQLSTATE 23503)"""
+    orig = error.orig
+    code = getattr(orig, "sqlstate", None) or getattr(orig, "pgcode", None)
+    return code == "23503" or "FOREIGN KEY constraint failed" in str(orig)
 
 
 class TaskRepository(BaseRepository[Task]):
-    """Repository for Task entities using SQLAlchemy"""
+    """
+    Repository for Task entities using SQLAlchemy
+    
+    Project existence is enforced by the foreign key and task existence by
+    affected-row counts, so writes never pre-query the table beyond the
+    index seeks for the rank at the end of a task's new column. Every change
+    is recorded in the outbox in the same transaction, with a 'task.ready'
+    event for every dependent a completed task unblocks.
+    """
     
     def __init__(self, db_session: Session):
         self.db = db_session
     
     def add(self, task: Task) -> Task:
-        """Add a new task to database"""
+        """Add a new task to database, at the end of its board column"""
+        if task.rank is None:
+            task.rank = next_rank(self.db, task.project_id, task.status or "todo")
         self.db.add(task)
+        try:
+            self.db.flush()
+        except IntegrityError as e:
+            self.db.rollback()
+            if _is_foreign_key_violation(e):
+                raise NotFoundError("Project", task.project_id)
+            raise
+        record_event(self.db, "task.created", task_payload(task), task.project_id)
         self.db.commit()
-        self.db.refresh(task)
         return task
     
     def get(self, id: int) -> Optional[Task]:
@@ -36,40 +70,121 @@ class TaskRepository(BaseRepository[Task]):
     
     def get_overdue_tasks(self, project_id: Optional[int] = None) -> List[Task]:
         """Get overdue tasks (deadline passed and status not 'done')"""
-        from datetime import datetime
-        query = self.db.query(Task).filter(
-            Task.deadline < datetime.now(),
-            Task.status != 'done'
-        )
-        
-        if project_id:
-            query = query.filter(Task.project_id == project_id)
-        
-        return query.all()
+        return self._overdue_query(self.db.query(Task), project_id).all()
+    
+    def get_rows(self, columns: Sequence[str],
+                 query: Optional[TaskQuery] = None) -> List[Row]:
+        """
+        Get selected task columns as plain rows, without building ORM objects,
+        filtered, sorted and paged by ``query``
+        """
+        return (query or TaskQuery()).apply(self.db.query(*self._columns(columns)), Task).all()
     
     def get_all(self) -> List[Task]:
         """Get all tasks"""
         return self.db.query(Task).all()
     
     def update(self, task: Task) -> Task:
-        """Update task in database"""
-        existing = self.get(task.id)
-        if not existing:
+        """Update task in database, a task changing status goes to the end of its new column"""
+        old_status = inspect(task).attrs.status.history.deleted
+        if old_status and old_status[0] != task.status:
+            task.rank = next_rank(self.db, task.project_id, task.status)
+        try:
+            self.db.flush()
+        except StaleDataError:
+            self.db.rollback()
             raise NotFoundError("Task", task.id)
+        record_event(self.db, "task.updated", task_payload(task), task.project_id)
+        if task.status == "done":
+            record_ready_events(self.db, [task.id])
+        self.db.commit()
+        return task
+    
+    def update_by_id(self, id: int, values: dict) -> Task:
+        """
+        Update task columns with one UPDATE ... RETURNING statement; a task
+        changing status goes to the end of its new column
+        """
+        values = dict(values, updated_at=datetime.now())
+        if "status" in values and "rank" not in values:
+            # One seek for the task's column and the end of the new one
+            column = aliased(Task)
+            last = select(func.max(column.rank)).where(
+                column.project_id == Task.project_id, column.status == values["status"]
+            ).scalar_subquery()
+            current = self.db.execute(
+                select(Task.status, last).where(Task.id == id)
+            ).first()
+            if current is not None and current[0] != values["status"]:
+                values["rank"] = rank_between(current[1], None)
+        task = self.db.execute(
+            update(Task).where(Task.id == id).values(**values).returning(Task)
+        ).scalar_one_or_none()
+        if task is None:
+            self.db.commit()
+            raise NotFoundError("Task", id)
         
+        record_event(self.db, "task.updated", task_payload(task), task.project_id)
+        if values.get("status") == "done":
+            record_ready_events(self.db, [task.id])
         self.db.commit()
-        self.db.refresh(task)
         return task
     
+    def bulk_change_status(self, ids: Sequence[int], status: str) -> int:
+        """
+        Set the status of many tasks with one UPDATE, returns affected rows.
+        Tasks changing status go to the end of their new column.
+        """
+        if not ids:
+            return 0
+        now = datetime.now()
+        moving = self.db.execute(
+            select(Task.id, Task.project_id).where(Task.id.in_(ids), Task.status != status)
+        ).all()
+        rows = self.db.execute(
+            update(Task).where(Task.id.in_(ids)).values(status=status, updated_at=now)
+            .returning(Task.id, Task.project_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if moving:
+            self.db.execute(
+                update(Task.__table__).where(Task.__table__.c.id == bindparam("task_id"))
+                .values(rank=bindparam("new_rank")),
+                [{"task_id": id, "new_rank": rank}
+                 for id, rank in next_ranks(self.db, status, moving).items()]
+            )
+        record_events(self.db, "task.status_changed", [
+            {"id": id, "project_id": project_id, "status": status, "updated_at": now.isoformat()}
+            for id, project_id in rows
+        ], [project_id for _, project_id in rows])
+        if status == "done":
+            # One query for all dependents unblocked by the batch
+            record_ready_events(self.db, [id for id, _ in rows])
+        self.db.commit()
+        return len(rows)
+    
     def delete(self, id: int) -> bool:
         """Delete task by ID"""
-        task = self.get(id)
-        if not task:
-            return False
-        
-        self.db.delete(task)
+        project_id = self.db.execute(
+            delete(Task).where(Task.id == id).returning(Task.project_id)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        if project_id is not None:
+            record_event(self.db, "task.deleted", {"id": id, "project_id": project_id}, project_id)
+        self.db.commit()
+        return project_id is not None
+    
+    def delete_chunk_by_project(self, project_id: int, limit: int) -> int:
+        """
+        Delete up to ``limit`` tasks of a project in one transaction. Part of
+        a project purge: no per-task events, the project deletion is recorded.
+        """
+        chunk = select(Task.id).where(Task.project_id == project_id).limit(limit)
+        deleted = self.db.query(Task).filter(Task.id.in_(chunk.scalar_subquery())).delete(
+            synchronize_session=False
+        )
         self.db.commit()
-        return True
+        return deleted
     
     def count(self) -> int:
         """Get total number of tasks"""
@@ -77,4 +192,27 @@ class TaskRepository(BaseRepository[Task]):
     
     def count_by_project(self, project_id: int) -> int:
         """Count tasks for a specific project"""
-        return self.db.query(Task).filter(Task.project_id == project_id).count()
\ No newline at end of file
+        return self.db.query(Task).filter(Task.project_id == project_id).count()
+    
+    def count_by_status(self, project_id: int) -> Dict[str, int]:
+        """Count tasks per status for a project with a single grouped query"""
+        rows = self.db.query(Task.status, func.count(Task.id)).filter(
+            Task.project_id == project_id
+        ).group_by(Task.status).all()
+        return {status: count for status, count in rows}
+    
+    @staticmethod
+    def _columns(columns: Sequence[str]) -> list:
+        return [getattr(Task, name) for name in columns]
+    
+    @staticmethod
+    def _overdue_query(query, project_id: Optional[int] = None):
+        query = query.filter(
+            Task.deadline < datetime.now(),
+            Task.status != 'done'
+        )
+        
+        if project_id:
+            query = query.filter(Task.project_id == project_id)
+        
+        return query
\ No newline at end of file
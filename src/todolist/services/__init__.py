@@ -1,4 +1,7 @@
 from .project_service import ProjectService
+from .job_runner import JobRunner
+from .job_service import JobService
 from .task_service import TaskService
+from .webhook_dispatcher import WebhookDispatcher
 
-__all__ = ["ProjectService", "TaskService"]
+__all__ = ["JobRunner", "JobService", "ProjectService", "TaskService", "WebhookDispatcher"]
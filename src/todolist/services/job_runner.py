@@ -0,0 +1,189 @@
+"""
+Background job execution
+
+``JobRunner`` claims queued jobs from the 'jobs' table and runs them on a
+pool of threads or processes. A job is a plain function called with the
+job's params and a ``progress(current, total)`` callback; the callback
+stores progress on the job row (at most every ``PROGRESS_INTERVAL``
+seconds) and raises ``JobCancelled`` once cancellation was requested, so
+jobs stop between two units of work. The returned dict is stored as the
+job result, and a ``paths`` entry in it as the result location.
+
+The runner refreshes the heartbeat of its running jobs on every poll; jobs
+of a worker that died are queued again after ``stale_after`` seconds, so
+job functions must be safe to run twice.
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Mapping, NamedTuple, Optional
+
+from ..repositories.job_repository import JobRepository
+from ..utils.log import bind
+
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL = 0.5
+
+
+class JobCancelled(Exception):
+    """Raised by the progress callback of a job whose cancellation was requested"""
+
+
+class JobKind(NamedTuple):
+    """A function that can be submitted as a job"""
+    func: Callable
+    # Pass output=<results dir>/job-<id> to the function
+    writes_output: bool = False
+
+
+class JobProgress:
+    """Progress callback handed to a job function"""
+
+    def __init__(self, job_id: int, session_factory: Callable):
+        self.job_id = job_id
+        self.session_factory = session_factory
+        self.current, self.total = 0, None
+        self._reported_at = 0.0
+        self._pending = False
+
+    def __call__(self, current: int, total: Optional[int] = None):
+        self.current, self.total = current, total
+        self._pending = True
+        now = time.monotonic()
+        if now - self._reported_at < PROGRESS_INTERVAL:
+            return
+        self._reported_at = now
+        if self._write():
+            raise JobCancelled(f"Job {self.job_id} was cancelled")
+
+    def flush(self):
+        """Store the last progress, which may have been throttled"""
+        if self._pending:
+            self._write()
+
+    def _write(self) -> bool:
+        self._pending = False
+        with self.session_factory() as db:
+            return JobRepository(db).report_progress(self.job_id, self.current, self.total)
+
+
+def _result_location(result: Optional[dict]) -> Optional[str]:
+    paths = (result or {}).get("paths")
+    return os.path.commonpath([str(path) for path in paths]) if paths else None
+
+
+def execute_job(job_id: int, kind: JobKind, params: dict,
+                session_factory: Optional[Callable] = None,
+                results_dir: Optional[str] = None):
+    """Run one claimed job and store its outcome; runs in a pool worker"""
+    if session_factory is None:
+        # Process workers open their own connections
+        from ..db.session import SessionLocal
+        session_factory = SessionLocal
+
+    progress = JobProgress(job_id, session_factory)
+    kwargs = dict(params, progress=progress)
+    if kind.writes_output:
+        results_dir = results_dir or "."
+        os.makedirs(results_dir, exist_ok=True)
+        kwargs["output"] = os.path.join(results_dir, f"job-{job_id}")
+
+    outcome = {"status": "succeeded", "result": None, "error": None}
+    with bind(job_id=job_id):
+        try:
+            result = kind.func(**kwargs)
+            # Results are stored as JSON
+            outcome["result"] = json.loads(json.dumps(result, default=str)) if result else None
+        except JobCancelled:
+            outcome["status"] = "cancelled"
+        except Exception as e:
+            outcome.update(status="failed", error=f"{type(e).__name__}: {e}")
+            logger.exception("job failed")
+        finally:
+            progress.flush()
+            with session_factory() as db:
+                JobRepository(db).finish(
+                    job_id, outcome["status"], outcome["result"],
+                    _result_location(outcome["result"]), outcome["error"],
+                )
+
+
+class JobRunner:
+    """Claims queued jobs and runs up to ``workers`` of them at once"""
+
+    def __init__(self, kinds: Mapping[str, JobKind], session_factory: Callable,
+                 workers: int = 2, mode: str = "thread", poll_interval: float = 1.0,
+                 stale_after: float = 60, results_dir: str = "job-results"):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown job worker mode '{mode}'")
+        self.kinds = kinds
+        self.session_factory = session_factory
+        self.workers = workers
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.results_dir = results_dir
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        pool = ProcessPoolExecutor if mode == "process" else ThreadPoolExecutor
+        self.executor = pool(max_workers=workers)
+        self.running: Dict[int, Future] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Poll for jobs in a background thread"""
+        self._thread = threading.Thread(target=self.run, name="job-runner", daemon=True)
+        self._thread.start()
+
+    def run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("job polling failed")
+            self._stop.wait(self.poll_interval)
+
+    def poll(self) -> int:
+        """Start queued jobs while workers are free, returns how many started"""
+        self.running = {job_id: f for job_id, f in self.running.items() if not f.done()}
+        started = 0
+        with self.session_factory() as db:
+            job_repo = JobRepository(db)
+            job_repo.heartbeat(list(self.running))
+            job_repo.requeue_stale(datetime.now() - timedelta(seconds=self.stale_after))
+            while len(self.running) < self.workers:
+                job = job_repo.claim_next(self.worker_id)
+                if job is None:
+                    break
+                kind = self.kinds.get(job.kind)
+                if kind is None:
+                    job_repo.finish(job.id, "failed", error=f"Unknown job kind '{job.kind}'")
+                    continue
+                # Process workers cannot share this process' session factory
+                factory = self.session_factory if self.mode == "thread" else None
+                self.running[job.id] = self.executor.submit(
+                    execute_job, job.id, kind, job.params, factory, self.results_dir
+                )
+                started += 1
+                logger.info("job started", extra={"job_id": job.id, "kind": job.kind})
+        return started
+
+    def run_until_idle(self):
+        """Run queued jobs and wait for them, until the queue is empty"""
+        while self.poll() or self.running:
+            for future in list(self.running.values()):
+                future.result()
+
+    def stop(self, wait: bool = True):
+        """Stop claiming jobs; ``wait`` lets the running ones finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.executor.shutdown(wait=wait)
@@ -0,0 +1,52 @@
+import inspect
+from typing import List, Mapping, Optional
+
+from ..models.job import Job
+from ..repositories.job_repository import JobRepository
+from ..exceptions.service_exceptions import ValidationError
+from .job_runner import JobKind
+
+
+class JobService:
+    """Service layer for submitting and following background jobs"""
+
+    def __init__(self, job_repo: JobRepository, kinds: Mapping[str, JobKind]):
+        self.job_repo = job_repo
+        self.kinds = kinds
+
+    def submit(self, kind: str, params: Optional[dict] = None) -> Job:
+        """
+        Queue a job after checking that ``params`` match the arguments of
+        the job function
+        """
+        params = params or {}
+        job_kind = self.kinds.get(kind)
+        if job_kind is None:
+            raise ValidationError(
+                f"Unknown job kind '{kind}', expected one of: {', '.join(sorted(self.kinds))}",
+                field="kind"
+            )
+        reserved = {"progress", "output"} & set(params)
+        if reserved:
+            raise ValidationError(f"Parameter '{reserved.pop()}' is set by the runner", field="params")
+        runner_params = {"progress": None}
+        if job_kind.writes_output:
+            runner_params["output"] = None
+        try:
+            inspect.signature(job_kind.func).bind(**params, **runner_params)
+        except TypeError as e:
+            raise ValidationError(f"Invalid parameters for '{kind}': {e}", field="params")
+        return self.job_repo.add(kind, params)
+
+    def get_job(self, job_id: int) -> Optional[Job]:
+        return self.job_repo.get(job_id)
+
+    def get_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[Job]:
+        return self.job_repo.get_all(status, limit)
+
+    def get_latest_job(self, kind: str, project_id: int) -> Optional[Job]:
+        return self.job_repo.get_latest(kind, project_id)
+
+    def cancel_job(self, job_id: int) -> Optional[Job]:
+        """Cancel a queued job, or ask a running one to stop"""
+        return self.job_repo.request_cancel(job_id)
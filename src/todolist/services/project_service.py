@@ -1,11 +1,17 @@
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Sequence, Tuple
 from sqlalchemy.orm import Session
 
 from ..models.project import Project
+from ..models.task import Task
+from ..repositories.archive_repository import TaskArchiveRepository
 from ..repositories.project_repository import ProjectRepository
+from ..repositories.task_event_repository import TaskEventRepository
 from ..repositories.task_repository import TaskRepository
-from ..exceptions.service_exceptions import ValidationError
+from ..exceptions.repository_exceptions import DuplicateError
+from ..exceptions.service_exceptions import ConflictError, ValidationError
 from ..utils.config import Config
+from ..utils.single_flight import coalesce
 
 
 class ProjectService:
@@ -14,9 +20,13 @@ class ProjectService:
     Now uses Repository Pattern with dependency injection
     """
     
-    def __init__(self, project_repo: ProjectRepository, task_repo: TaskRepository):
+    def __init__(self, project_repo: ProjectRepository, task_repo: TaskRepository,
+                 archive_repo: Optional[TaskArchiveRepository] = None,
+                 event_repo: Optional[TaskEventRepository] = None):
         self.project_repo = project_repo
         self.task_repo = task_repo
+        self.archive_repo = archive_repo
+        self.event_repo = event_repo
     
     def create_project(self, name: str, description: str) -> Project:
         """
@@ -27,7 +37,10 @@ class ProjectService:
             raise ValidationError(f"Cannot create more than {Config.MAX_NUMBER_OF_PROJECTS} projects")
         
         project = Project(name=name, description=description)
-        return self.project_repo.add(project)
+        try:
+            return self.project_repo.add(project)
+        except DuplicateError as e:
+            raise ConflictError(str(e), field="name") from e
     
     def get_project(self, project_id: int) -> Optional[Project]:
         """Get project by ID"""
@@ -37,40 +50,132 @@ class ProjectService:
         """Get all projects"""
         return self.project_repo.get_all()
     
-    def update_project(self, project_id: int, name: str, description: str) -> Project:
+    @coalesce("project_rows", key=lambda columns, ids=None: (
+        tuple(columns), tuple(ids) if ids is not None else None))
+    def get_project_rows(self, columns: Sequence[str],
+                         ids: Optional[Sequence[int]] = None) -> list:
+        """Get selected columns of all projects, or only of ``ids``, as rows"""
+        return self.project_repo.get_rows(columns, ids)
+    
+    def get_projects_with_tasks(self, ids: Optional[Sequence[int]] = None) -> List[Tuple[Project, List[Task]]]:
+        """Get projects, or only ``ids``, each paired with its tasks"""
+        return self.project_repo.get_with_tasks(ids)
+    
+    def update_project(self, project_id: int, name: Optional[str] = None,
+                       description: Optional[str] = None) -> Project:
         """
-        Update project information
+        Update project information, only the given fields are changed
         """
-        project = self.project_repo.get(project_id)
-        if not project:
-            raise ValidationError("Project not found")
-        
-        project.update(name, description)
-        return self.project_repo.update(project)
+        values = {}
+        if name is not None:
+            values["name"] = name
+        if description is not None:
+            values["description"] = description
+        try:
+            return self.project_repo.update_by_id(project_id, values)
+        except DuplicateError as e:
+            raise ConflictError(str(e), field="name") from e
     
     def delete_project(self, project_id: int) -> bool:
         """
-        Delete project (cascade delete handled by SQLAlchemy)
+        Delete project. Tasks are removed by the database ON DELETE CASCADE,
+        or chunk by chunk when PROJECT_DELETE_MODE is 'chunked'
+        """
+        if Config.PROJECT_DELETE_MODE == "chunked":
+            return self.purge_project(project_id)
+        return self.project_repo.delete(project_id)
+    
+    def requires_background_purge(self, project_id: int) -> bool:
+        """Check if a project is too large to delete within a request"""
+        return self.task_repo.count_by_project(project_id) > Config.PROJECT_PURGE_THRESHOLD
+    
+    def purge_project(self, project_id: int, chunk_size: Optional[int] = None,
+                      progress: Optional[Callable[[int, int], None]] = None) -> bool:
+        """
+        Delete a project's tasks in chunks of ``chunk_size`` (one short
+        transaction each), then the project itself
+        
+        Args:
+            progress: Optional callback receiving (deleted_tasks, total_tasks)
         """
+        chunk_size = chunk_size or Config.DELETE_CHUNK_SIZE
+        total = self.task_repo.count_by_project(project_id)
+        deleted = 0
+        while True:
+            count = self.task_repo.delete_chunk_by_project(project_id, chunk_size)
+            if not count:
+                break
+            deleted += count
+            if progress:
+                progress(deleted, total)
         return self.project_repo.delete(project_id)
     
     def project_exists(self, project_id: int) -> bool:
         """Check if project exists"""
         return self.project_repo.get(project_id) is not None
     
-    def get_project_stats(self, project_id: int) -> dict:
-        """Get statistics for a project"""
+    @coalesce("project_stats")
+    def get_project_stats(self, project_id: int, include_archived: bool = False) -> dict:
+        """
+        Get statistics for a project, optionally adding the precomputed
+        totals of archived tasks
+        """
         project = self.get_project(project_id)
         if not project:
             raise ValidationError("Project not found")
         
-        tasks = self.task_repo.get_by_project_id(project_id)
+        counts = self.task_repo.count_by_status(project_id)
+        if include_archived and self.archive_repo:
+            for status, count in self.archive_repo.totals_by_status(project_id).items():
+                counts[status] = counts.get(status, 0) + count
         status_count = {}
         for status in Config.VALID_TASK_STATUSES:
-            status_count[status] = len([task for task in tasks if task.status == status])
+            status_count[status] = counts.get(status, 0)
         
         return {
-            "total_tasks": len(tasks),
+            "total_tasks": sum(counts.values()),
             "status_count": status_count,
             "project": project
-        }
\ No newline at end of file
+        }    
+    def get_throughput(self, project_id: int, days: int, status: str = "done") -> List[dict]:
+        """
+        Get the number of tasks that reached ``status`` on each of the last
+        ``days`` days (today included), with zero for quiet days
+        """
+        self._check_event_log(project_id)
+        first_day = datetime.now().date() - timedelta(days=days - 1)
+        start = datetime.combine(first_day, datetime.min.time())
+        counts = dict(self.event_repo.daily_throughput(
+            project_id, start, start + timedelta(days=days), status
+        ))
+        return [
+            {"day": day, "count": counts.get(day, 0)}
+            for day in (first_day + timedelta(days=i) for i in range(days))
+        ]
+    
+    def get_lead_time(self, project_id: int, days: int,
+                      percentiles: Sequence[float] = (50, 90, 95)) -> dict:
+        """
+        Get lead time statistics, from creation to done, of the tasks
+        completed in the last ``days`` days
+        """
+        self._check_event_log(project_id)
+        end = datetime.now()
+        stats = self.event_repo.lead_time_percentiles(
+            project_id, end - timedelta(days=days), end, percentiles
+        )
+        count = stats.pop("count")
+        mean = stats.pop("mean")
+        return {
+            "project_id": project_id,
+            "days": days,
+            "count": count,
+            "mean_seconds": mean,
+            "percentiles": stats,
+        }
+    
+    def _check_event_log(self, project_id: int):
+        if not self.event_repo:
+            raise ValidationError("Status history is not supported by this backend")
+        if not self.get_project(project_id):
+            raise ValidationError("Project not found")
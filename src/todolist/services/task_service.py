@@ -1,10 +1,18 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from ..models.task import Task
+from ..models.task_dependency import TaskDependency
+from ..repositories.archive_repository import TaskArchiveRepository
+from ..repositories.rank_repository import TaskRankRepository
+from ..repositories.tag_repository import TagRepository
+from ..repositories.task_dependency_repository import TaskDependencyRepository
+from ..repositories.task_query import TaskQuery
 from ..repositories.task_repository import TaskRepository
+from ..exceptions.repository_exceptions import NotFoundError
 from ..exceptions.service_exceptions import ValidationError
 from ..utils.config import Config
+from ..utils.single_flight import coalesce
 
 
 class TaskService:
@@ -13,15 +21,23 @@ class TaskService:
     Now uses Repository Pattern with dependency injection
     """
     
-    def __init__(self, task_repo: TaskRepository):
+    def __init__(self, task_repo: TaskRepository,
+                 archive_repo: Optional[TaskArchiveRepository] = None,
+                 dependency_repo: Optional[TaskDependencyRepository] = None,
+                 tag_repo: Optional[TagRepository] = None,
+                 rank_repo: Optional[TaskRankRepository] = None):
         self.task_repo = task_repo
+        self.archive_repo = archive_repo
+        self.dependency_repo = dependency_repo
+        self.tag_repo = tag_repo
+        self.rank_repo = rank_repo
     
     def create_task(self, project_id: int, title: str, description: str, 
                    deadline: Optional[datetime] = None) -> Task:
         """
         Create a new task in specified project
         """
-        # Note: Project existence check should be done by caller (service composition)
+        # Project existence is enforced by the foreign key on insert
         
         # Check maximum tasks limit for project
         project_tasks_count = self.task_repo.count_by_project(project_id)
@@ -32,41 +48,176 @@ class TaskService:
         task.project_id = project_id
         return self.task_repo.add(task)
     
-    def get_task(self, task_id: int) -> Optional[Task]:
-        """Get task by ID"""
-        return self.task_repo.get(task_id)
+    def get_task(self, task_id: int, include_archived: bool = False) -> Optional[Task]:
+        """Get task by ID, optionally falling back to the archive"""
+        task = self.task_repo.get(task_id)
+        if task is None and include_archived and self.archive_repo:
+            return self.archive_repo.get(task_id)
+        return task
     
     def get_tasks_by_project(self, project_id: int) -> List[Task]:
         """Get all tasks for a project"""
         return self.task_repo.get_by_project_id(project_id)
     
-    def update_task(self, task_id: int, title: str, description: str, 
-                   status: str, deadline: Optional[datetime] = None) -> Task:
+    @coalesce("task_rows", key=lambda columns, query=None, include_archived=False: (
+        tuple(columns), query.key() if query else None, include_archived))
+    def get_task_rows(self, columns: Sequence[str], query: Optional[TaskQuery] = None,
+                      include_archived: bool = False) -> list:
+        """Get selected task columns as rows, filtered, sorted and paged by query"""
+        if query and query.tags:
+            self._tags()
+        if include_archived and self.archive_repo:
+            return self.archive_repo.get_rows_with_live(columns, query)
+        return self.task_repo.get_rows(columns, query)
+    
+    def update_task(self, task_id: int, title: Optional[str] = None,
+                    description: Optional[str] = None, status: Optional[str] = None,
+                    deadline: Optional[datetime] = None) -> Task:
         """
-        Update task information
+        Update task information, only the given fields are changed
         """
-        task = self.task_repo.get(task_id)
-        if not task:
-            raise ValidationError("Task not found")
-        
-        task.update(title, description, status, deadline)
-        return self.task_repo.update(task)
+        values = {}
+        if title is not None:
+            values["title"] = title
+        if description is not None:
+            values["description"] = description
+        if status is not None:
+            values["status"] = status
+        if deadline is not None:
+            values["deadline"] = deadline
+        return self.task_repo.update_by_id(task_id, values)
     
     def change_task_status(self, task_id: int, status: str) -> Task:
         """
         Change task status only
         """
-        task = self.task_repo.get(task_id)
-        if not task:
-            raise ValidationError("Task not found")
-        
-        task.change_status(status)
-        return self.task_repo.update(task)
+        return self.task_repo.update_by_id(task_id, {"status": status})
+    
+    def change_tasks_status(self, task_ids: List[int], status: str) -> int:
+        """
+        Change the status of many tasks at once, returns the number changed
+        """
+        return self.task_repo.bulk_change_status(task_ids, status)
     
     def delete_task(self, task_id: int) -> bool:
         """Delete task by ID"""
         return self.task_repo.delete(task_id)
     
+    def archive_done_tasks(self, older_than: datetime, chunk_size: int) -> int:
+        """
+        Archive one chunk of done tasks last updated before ``older_than``,
+        returns the number of tasks moved
+        """
+        if not self.archive_repo:
+            raise ValidationError("Archiving is not supported by this backend")
+        return self.archive_repo.archive_done_before(older_than, chunk_size)
+    
+    def _dependencies(self) -> TaskDependencyRepository:
+        if not self.dependency_repo:
+            raise ValidationError("Task dependencies are not supported by this backend")
+        return self.dependency_repo
+    
+    def add_blocker(self, task_id: int, blocker_id: int) -> TaskDependency:
+        """
+        Make ``task_id`` wait for ``blocker_id``, rejecting edges that would
+        close a cycle; adding an existing edge returns it unchanged
+        """
+        dependencies = self._dependencies()
+        task = self.task_repo.get(task_id)
+        if task is None:
+            raise NotFoundError("Task", task_id)
+        blocker = self.task_repo.get(blocker_id)
+        if blocker is None:
+            raise NotFoundError("Task", blocker_id)
+        if task_id == blocker_id:
+            raise ValidationError("A task cannot block itself")
+        if task.project_id != blocker.project_id:
+            raise ValidationError("A task can only be blocked by tasks of the same project")
+        
+        existing = dependencies.get(task_id, blocker_id)
+        if existing is not None:
+            return existing
+        # The new edge closes a cycle if the blocker already waits for the task
+        if dependencies.is_blocked_by(blocker_id, task_id):
+            raise ValidationError(f"Task {blocker_id} already depends on task {task_id}")
+        return dependencies.add(task_id, blocker_id)
+    
+    def remove_blocker(self, task_id: int, blocker_id: int) -> bool:
+        """Remove a blocking relationship"""
+        return self._dependencies().delete(task_id, blocker_id)
+    
+    def get_blockers(self, task_id: int, transitive: bool = True) -> List[Task]:
+        """Tasks a task waits for, all of them or only the direct ones"""
+        return self._dependencies().get_blockers(task_id, transitive)
+    
+    def get_dependents(self, task_id: int, transitive: bool = True) -> List[Task]:
+        """Tasks waiting for a task, all of them or only the direct ones"""
+        return self._dependencies().get_dependents(task_id, transitive)
+    
+    def get_ready_tasks(self, project_id: int, limit: Optional[int] = None) -> List[Task]:
+        """Tasks of a project still to do whose blockers are all done"""
+        return self._dependencies().get_ready(project_id, limit)
+    
+    def _tags(self) -> TagRepository:
+        if not self.tag_repo:
+            raise ValidationError("Tags are not supported by this backend")
+        return self.tag_repo
+    
+    def tag_tasks(self, task_ids: Sequence[int], tags: Sequence[str]) -> int:
+        """
+        Add tags to tasks, creating unknown tags; returns the number of tags
+        added, unknown task IDs are skipped
+        """
+        return self._tags().tag(list(dict.fromkeys(task_ids)), list(dict.fromkeys(tags)))
+    
+    def untag_tasks(self, task_ids: Sequence[int], tags: Sequence[str]) -> int:
+        """Remove tags from tasks, returns the number of tags removed"""
+        return self._tags().untag(list(dict.fromkeys(task_ids)), list(dict.fromkeys(tags)))
+    
+    def get_task_tags(self, task_id: int) -> List[str]:
+        """Names of the tags of a task"""
+        return self._tags().get_task_tags(task_id)
+    
+    def get_tag_counts(self, project_id: Optional[int] = None) -> List[dict]:
+        """Number of tasks per tag per project"""
+        return [
+            {"project_id": project_id, "tag": tag, "count": count}
+            for project_id, tag, count in self._tags().counts(project_id)
+        ]
+    
+    def move_task(self, task_id: int, before_id: Optional[int] = None,
+                  after_id: Optional[int] = None) -> Task:
+        """
+        Move a task right before or right after another task of its board
+        column, or to the end of the column when neither is given
+        """
+        if not self.rank_repo:
+            raise ValidationError("Manual ordering is not supported by this backend")
+        if before_id is not None and after_id is not None:
+            raise ValidationError("Give either before_id or after_id, not both")
+        task = self.task_repo.get(task_id)
+        if task is None:
+            raise NotFoundError("Task", task_id)
+        anchor_id = before_id if before_id is not None else after_id
+        anchor = None
+        if anchor_id is not None:
+            if anchor_id == task_id:
+                raise ValidationError("A task cannot be moved next to itself")
+            anchor = self.task_repo.get(anchor_id)
+            if anchor is None:
+                raise NotFoundError("Task", anchor_id)
+            if (anchor.project_id, anchor.status) != (task.project_id, task.status):
+                raise ValidationError(
+                    "Tasks can only be moved next to tasks of the same project and status"
+                )
+        return self.rank_repo.move(task_id, before_id=before_id, after_id=after_id)
+    
+    def rebalance_ranks(self, project_id: int, status: str) -> int:
+        """Respace the ranks of a board column, returns the number of tasks"""
+        if not self.rank_repo:
+            raise ValidationError("Manual ordering is not supported by this backend")
+        return self.rank_repo.rebalance(project_id, status)
+    
     def get_overdue_tasks(self, project_id: Optional[int] = None) -> List[Task]:
         """Get overdue tasks for a project or all projects"""
-        return self.task_repo.get_overdue_tasks(project_id)
\ No newline at end of file
+        return self.task_repo.get_overdue_tasks(project_id)
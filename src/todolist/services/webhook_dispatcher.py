@@ -0,0 +1,120 @@
+"""
+Delivery of outbox events to webhook endpoints
+
+Each round reads the next batch of events after every due endpoint's cursor
+and POSTs it as one JSON body, up to ``concurrency`` endpoints in parallel
+and one batch per endpoint at a time. The cursor only moves past a batch
+once the endpoint accepted it (2xx), so events reach every endpoint in
+order and at least once; receivers should skip event IDs they have seen.
+A failing endpoint is retried with exponential backoff without holding up
+the others.
+"""
+import json
+import logging
+import random
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from ..repositories.outbox_repository import OutboxRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+def post_json(url: str, messages: List[dict], timeout: float):
+    """POST a batch of events, raising on connection errors and non-2xx replies"""
+    request = urllib.request.Request(
+        url,
+        data=json.dumps({"events": messages}).encode(),
+        headers={"Content-Type": "application/json", "User-Agent": "todolist-webhooks"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+
+
+class WebhookDispatcher:
+    """Drains the outbox to the registered endpoints in batches"""
+
+    def __init__(self, outbox_repo: OutboxRepository,
+                 send: Callable[[str, List[dict], float], None] = post_json,
+                 batch_size: int = 100, concurrency: int = 4, timeout: float = 5,
+                 max_backoff: int = 300):
+        self.outbox_repo = outbox_repo
+        self.send = send
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.executor = ThreadPoolExecutor(max_workers=concurrency,
+                                           thread_name_prefix="webhooks")
+
+    def dispatch_once(self) -> Dict[str, int]:
+        """Deliver one batch to every due endpoint, returns delivery counts"""
+        result = {"delivered": 0, "failed": 0}
+        batches: Dict[tuple, list] = {}
+        deliveries = []
+        for endpoint in self.outbox_repo.get_due_endpoints(datetime.now()):
+            if endpoint.position not in batches:
+                batches[endpoint.position] = self.outbox_repo.get_events_after(
+                    endpoint.position, self.batch_size
+                )
+            events = batches[endpoint.position]
+            if not events:
+                continue
+            messages = [event.as_message() for event in events if endpoint.wants(event.event_type)]
+            if not messages:
+                self.outbox_repo.mark_delivered(endpoint, events[-1].position)
+                continue
+            future = self.executor.submit(self.send, endpoint.url, messages, self.timeout)
+            deliveries.append((endpoint, events[-1].position, len(messages), future))
+
+        # Sessions are not thread safe: only the HTTP calls run in the pool
+        for endpoint, position, count, future in deliveries:
+            try:
+                future.result()
+            except Exception as e:
+                retry_in = self._backoff(endpoint.failures)
+                self.outbox_repo.mark_failed(
+                    endpoint, str(e), datetime.now() + timedelta(seconds=retry_in)
+                )
+                result["failed"] += 1
+                logger.warning("webhook delivery failed", extra={
+                    "endpoint_id": endpoint.id, "url": endpoint.url, "failures": endpoint.failures,
+                    "retry_in_s": round(retry_in, 3), "error": str(e),
+                })
+                continue
+            self.outbox_repo.mark_delivered(endpoint, position)
+            result["delivered"] += count
+            logger.debug("webhook batch delivered", extra={
+                "endpoint_id": endpoint.id, "events": count, "cursor": endpoint.cursor
+            })
+        return result
+
+    def run(self, stop: Optional[threading.Event] = None, poll_interval: float = 1.0,
+            retention_days: Optional[int] = None):
+        """Dispatch until ``stop`` is set, sleeping while there is nothing to send"""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            result = self.dispatch_once()
+            self.prune(retention_days)
+            if not result["delivered"]:
+                stop.wait(poll_interval)
+
+    def prune(self, retention_days: Optional[int] = None) -> int:
+        """Drop events every endpoint has received, and all beyond the retention"""
+        pruned = self.outbox_repo.prune_delivered()
+        if retention_days:
+            pruned += self.outbox_repo.prune_older_than(
+                datetime.now() - timedelta(days=retention_days)
+            )
+        return pruned
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def _backoff(self, failures: int) -> float:
+        """Seconds before the next attempt: doubling, capped, with jitter"""
+        return min(self.max_backoff, 2 ** failures) * random.uniform(0.5, 1.0)
@@ -18,15 +18,137 @@ class Config:
         f"sqlite:///{SQLITE_DB_PATH}"
     )
     
+    # Repository backend: "sqlalchemy" (default) or "memory"
+    REPOSITORY_BACKEND = os.getenv("REPOSITORY_BACKEND", "sqlalchemy")
+    # Optional JSON snapshot file for the memory backend
+    MEMORY_SNAPSHOT_PATH = os.getenv("MEMORY_SNAPSHOT_PATH") or None
+    
+    # Group commit: API writes go through one writer thread that commits up to
+    # WRITE_BATCH_SIZE operations at once, waiting WRITE_BATCH_DELAY_MS for more
+    WRITE_COORDINATOR = os.getenv("WRITE_COORDINATOR", "false").lower() == "true"
+    WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "128"))
+    WRITE_BATCH_DELAY_MS = float(os.getenv("WRITE_BATCH_DELAY_MS", "2"))
+    
+    # Production server (python -m src.todolist.api.server)
+    API_HOST = os.getenv("API_HOST", "0.0.0.0")
+    API_PORT = int(os.getenv("API_PORT", "8000"))
+    # Worker processes, 0 means one per CPU
+    API_WORKERS = int(os.getenv("API_WORKERS", "0"))
+    # Event loop / HTTP parser: "auto" uses uvloop / httptools when installed
+    API_LOOP = os.getenv("API_LOOP", "auto")
+    API_HTTP = os.getenv("API_HTTP", "auto")
+    # Recycle a worker after this many requests (0 = never); needs an
+    # external supervisor to restart it
+    API_MAX_REQUESTS = int(os.getenv("API_MAX_REQUESTS", "0"))
+    # Seconds in-flight requests get to finish on shutdown
+    API_GRACEFUL_TIMEOUT = int(os.getenv("API_GRACEFUL_TIMEOUT", "30"))
+    API_KEEPALIVE_TIMEOUT = int(os.getenv("API_KEEPALIVE_TIMEOUT", "5"))
+    
+    # Admission control: concurrent reads / writes per worker, then a bounded
+    # wait queue; requests beyond it get 503 with Retry-After
+    ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "false").lower() == "true"
+    ADMISSION_READ_LIMIT = int(os.getenv("ADMISSION_READ_LIMIT", "32"))
+    ADMISSION_WRITE_LIMIT = int(os.getenv("ADMISSION_WRITE_LIMIT", "4"))
+    ADMISSION_QUEUE_SIZE = int(os.getenv("ADMISSION_QUEUE_SIZE", "64"))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2.0"))
+    ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "1"))
+    # Per-client token bucket (requests per second, 0 = off) keyed by X-API-Key or IP
+    CLIENT_RATE_LIMIT = float(os.getenv("CLIENT_RATE_LIMIT", "0"))
+    CLIENT_RATE_BURST = int(os.getenv("CLIENT_RATE_BURST", "20"))
+    # Single-flight: concurrent identical stats / list reads share one query,
+    # and the result is reused for COALESCE_CACHE_TTL seconds (0 = not kept)
+    COALESCE_ENABLED = os.getenv("COALESCE_ENABLED", "false").lower() == "true"
+    COALESCE_CACHE_TTL = float(os.getenv("COALESCE_CACHE_TTL", "0"))
+    COALESCE_MAX_CACHED = int(os.getenv("COALESCE_MAX_CACHED", "1000"))
+    
+    # Logging: records are written by a background thread, as JSON lines or
+    # text; LOG_REQUESTS adds one access record per API request
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+    LOG_REQUESTS = os.getenv("LOG_REQUESTS", "true").lower() == "true"
+    
+    # Statement timing: statements slower than the threshold are logged with
+    # parameters (redacted by default), caller and query plan
+    SLOW_QUERY_LOG_ENABLED = os.getenv("SLOW_QUERY_LOG_ENABLED", "false").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+    SLOW_QUERY_LOG_PATH = os.getenv("SLOW_QUERY_LOG_PATH", str(BASE_DIR / "slow_queries.log"))
+    SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "5"))
+    SLOW_QUERY_REDACT_PARAMS = os.getenv("SLOW_QUERY_REDACT_PARAMS", "true").lower() == "true"
+    SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    
+    # Per-request CPU profiling, triggered by an X-Profile header, a
+    # ?profile=1 flag or a sampling rate; newest PROFILING_MAX_FILES kept
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    PROFILING_DIR = os.getenv("PROFILING_DIR", str(BASE_DIR / "profiles"))
+    PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "50"))
+    # tracemalloc instrumentation: admin snapshots and the peak allocation
+    # of a sampled fraction of requests, per route
+    MEMORY_TRACING_ENABLED = os.getenv("MEMORY_TRACING_ENABLED", "false").lower() == "true"
+    MEMORY_TRACE_SAMPLE_RATE = float(os.getenv("MEMORY_TRACE_SAMPLE_RATE", "0.1"))
+    MEMORY_TRACE_FRAMES = int(os.getenv("MEMORY_TRACE_FRAMES", "10"))
+    MEMORY_TRACE_MAX_SNAPSHOTS = int(os.getenv("MEMORY_TRACE_MAX_SNAPSHOTS", "10"))
+    # Required in X-Admin-Token by admin endpoints and on-demand profiling when set
+    ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+    
+    # Sharding: comma separated database URLs, projects are spread over them
+    # and the directory database maps each project to its shard (off when empty)
+    SHARD_URLS = [url.strip() for url in os.getenv("SHARD_URLS", "").split(",") if url.strip()]
+    SHARD_DIRECTORY_URL = os.getenv("SHARD_DIRECTORY_URL", f"sqlite:///{BASE_DIR / 'shards.db'}")
+    # Task IDs reserved from the directory at a time by each process
+    SHARD_ID_BLOCK_SIZE = int(os.getenv("SHARD_ID_BLOCK_SIZE", "1000"))
+    
+    # Transactional outbox: project and task changes are recorded with the
+    # write and delivered to webhook endpoints by the dispatcher command
+    OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "false").lower() == "true"
+    WEBHOOK_BATCH_SIZE = int(os.getenv("WEBHOOK_BATCH_SIZE", "100"))
+    # Endpoints delivered to in parallel; each endpoint gets one batch at a time
+    WEBHOOK_CONCURRENCY = int(os.getenv("WEBHOOK_CONCURRENCY", "4"))
+    WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT", "5"))
+    WEBHOOK_POLL_INTERVAL = float(os.getenv("WEBHOOK_POLL_INTERVAL", "1"))
+    # Retries back off exponentially from 1 second up to this many seconds
+    WEBHOOK_MAX_BACKOFF = int(os.getenv("WEBHOOK_MAX_BACKOFF", "300"))
+    # Events older than this are dropped even if undelivered
+    OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+    
+    # Background jobs: each API process runs up to JOB_WORKERS jobs at once in
+    # threads or processes (0 leaves them to the job worker command)
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "0"))
+    JOB_WORKER_MODE = os.getenv("JOB_WORKER_MODE", "thread")
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+    # Running jobs without a worker heartbeat for this many seconds are queued again
+    JOB_STALE_AFTER = int(os.getenv("JOB_STALE_AFTER", "60"))
+    JOB_RESULTS_DIR = os.getenv("JOB_RESULTS_DIR", str(BASE_DIR / "job-results"))
+    
     # Application Limits
     MAX_NUMBER_OF_PROJECTS = int(os.getenv("MAX_NUMBER_OF_PROJECTS", "10"))
     MAX_NUMBER_OF_TASKS = int(os.getenv("MAX_NUMBER_OF_TASKS", "100"))
     
+    # Project deletion: "cascade" (single DELETE, tasks removed by ON DELETE
+    # CASCADE) or "chunked" (tasks deleted DELETE_CHUNK_SIZE at a time)
+    PROJECT_DELETE_MODE = os.getenv("PROJECT_DELETE_MODE", "cascade")
+    DELETE_CHUNK_SIZE = int(os.getenv("DELETE_CHUNK_SIZE", "1000"))
+    # Projects with more tasks than this are purged in the background
+    PROJECT_PURGE_THRESHOLD = int(os.getenv("PROJECT_PURGE_THRESHOLD", "10000"))
+    
+    # Archival of done tasks into 'tasks_archive'
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+    ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", "1000"))
+    
+    # Manual task order: a column is rebalanced in the background once a
+    # move produces a rank key longer than this
+    RANK_MAX_LENGTH = int(os.getenv("RANK_MAX_LENGTH", "16"))
+    # Columns a move may respace inline (unranked or tied keys); longer ones
+    # get a background rebalance and the move answers 409
+    RANK_INLINE_REBALANCE_MAX = int(os.getenv("RANK_INLINE_REBALANCE_MAX", "1000"))
+    
     # Text Length Limits
     MAX_PROJECT_NAME_LENGTH = 30
     MAX_PROJECT_DESCRIPTION_LENGTH = 150
     MAX_TASK_TITLE_LENGTH = 30
     MAX_TASK_DESCRIPTION_LENGTH = 150
+    MAX_TAG_NAME_LENGTH = 30
     
     # Valid Task Statuses
     VALID_TASK_STATUSES = ["todo", "doing", "done"]
\ No newline at end of file
@@ -0,0 +1,180 @@
+"""
+Structured, non-blocking logging
+
+Records are put on an in-process queue by a ``QueueHandler`` and formatted
+and written by a ``QueueListener`` thread, so the thread doing the work never
+waits on stdout or a log pipe. Records carry the fields bound with ``bind()``
+(request ID, route, job name, ...) plus any ``extra=`` fields, and are
+written as one JSON object per line (LOG_FORMAT=json) or as text.
+
+``log_job()`` wraps a batch job and emits one summary record with its
+duration, outcome and counters, instead of a line per processed row.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterator, Optional
+
+from .config import Config
+
+
+_context: contextvars.ContextVar = contextvars.ContextVar("log_context", default={})
+# Attributes every LogRecord has, everything else is an extra field
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+@contextmanager
+def bind(**fields):
+    """Add fields to every record logged in this context (thread or task)"""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+def bound_fields() -> dict:
+    return dict(_context.get())
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {
+        key: value for key, value in vars(record).items()
+        if key not in _RECORD_ATTRIBUTES and not key.startswith("_")
+    }
+
+
+class ContextFilter(logging.Filter):
+    """Copy the bound context onto records, in the thread that logs them"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Readable lines with the extra fields appended as key=value"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extra = " ".join(f"{key}={value}" for key, value in _extra_fields(record).items())
+        return f"{line} {extra}" if extra else line
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                      stream=None) -> QueueListener:
+    """
+    Route all records through a queue to a listener thread writing to
+    ``stream`` (stdout by default). Safe to call more than once.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JsonFormatter() if (fmt or Config.LOG_FORMAT) == "json" else TextFormatter())
+    log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel((level or Config.LOG_LEVEL).upper())
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Write out queued records and stop the listener thread"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener.stop()
+    _listener = _queue_handler = None
+
+
+@contextmanager
+def log_job(logger: logging.Logger, job: str, **fields) -> Iterator[dict]:
+    """
+    Bind a job name and run ID to the records of a job and log one summary
+    when it ends. Counters added to the yielded dict go into the summary.
+    """
+    summary = {}
+    context = dict(fields, job=job, run_id=uuid.uuid4().hex[:12])
+    start = time.perf_counter()
+    with bind(**context):
+        try:
+            yield summary
+        except BaseException:
+            logger.exception("job failed", extra=dict(
+                context, **summary, outcome="failed", duration_ms=_elapsed_ms(start)
+            ))
+            raise
+        logger.info("job finished", extra=dict(
+            context, **summary, outcome="ok", duration_ms=_elapsed_ms(start)
+        ))
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+# Time spent in the database by the current request: [milliseconds, statements]
+_db_time: contextvars.ContextVar = contextvars.ContextVar("db_time", default=None)
+
+
+def start_db_timer() -> list:
+    """Start accumulating database time for the current context"""
+    totals = [0.0, 0]
+    _db_time.set(totals)
+    return totals
+
+
+def track_db_time(engine):
+    """Add the duration of every statement on ``engine`` to the current DB timer"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("db_timer_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["db_timer_start"].pop()
+        totals = _db_time.get()
+        if totals is not None:
+            totals[0] += (time.perf_counter() - start) * 1000
+            totals[1] += 1
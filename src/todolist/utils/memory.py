@@ -0,0 +1,201 @@
+"""
+Opt-in memory instrumentation with tracemalloc
+
+``MemoryTracker`` keeps a few named snapshots to list top allocation sites
+or diff two of them, and records the peak traced memory of sampled requests
+or jobs by name, so growth can be pinned to a route or a command.
+``trace_memory`` wraps a batch command run and logs its peak and the
+allocation sites that grew the most.
+
+tracemalloc slows Python allocations down noticeably; it only runs when
+enabled.
+"""
+import itertools
+import logging
+import threading
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from .config import Config
+
+
+logger = logging.getLogger(__name__)
+
+# Allocations made by the instrumentation itself
+_IGNORED = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+GROUP_BY = ("lineno", "filename", "traceback")
+
+
+def max_rss_kb() -> Optional[int]:
+    """Peak resident set size of the process (kilobytes on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None
+
+
+def _site(trace) -> str:
+    frame = trace.traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+
+def top_stats(snapshot: tracemalloc.Snapshot, limit: int = 20,
+              group_by: str = "lineno") -> List[dict]:
+    """Largest allocation sites of a snapshot"""
+    return [
+        {
+            "site": _site(stat),
+            "traceback": stat.traceback.format() if group_by == "traceback" else None,
+            "size": stat.size,
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics(group_by)[:limit]
+    ]
+
+
+def diff_stats(old: tracemalloc.Snapshot, new: tracemalloc.Snapshot, limit: int = 20,
+               group_by: str = "lineno") -> List[dict]:
+    """Allocation sites that grew the most from ``old`` to ``new``"""
+    return [
+        {
+            "site": _site(stat),
+            "traceback": stat.traceback.format() if group_by == "traceback" else None,
+            "size": stat.size,
+            "size_diff": stat.size_diff,
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        }
+        for stat in new.compare_to(old, group_by)[:limit]
+    ]
+
+
+class MemoryTracker:
+    """Named tracemalloc snapshots and per-name peak allocation stats"""
+
+    def __init__(self, frames: int = 10, max_snapshots: int = 10):
+        self.frames = frames
+        self.max_snapshots = max_snapshots
+        self.snapshots: "OrderedDict[int, dict]" = OrderedDict()
+        self.peaks: Dict[str, dict] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._measuring = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    def take_snapshot(self, label: str = "") -> dict:
+        """Take and keep a snapshot, dropping the oldest beyond max_snapshots"""
+        self.start()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        current, peak = tracemalloc.get_traced_memory()
+        info = {
+            "id": next(self._ids),
+            "label": label,
+            "created_at": datetime.now(),
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "max_rss_kb": max_rss_kb(),
+        }
+        with self._lock:
+            self.snapshots[info["id"]] = dict(info, snapshot=snapshot)
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+        return info
+
+    def list_snapshots(self) -> List[dict]:
+        with self._lock:
+            return [
+                {key: value for key, value in entry.items() if key != "snapshot"}
+                for entry in self.snapshots.values()
+            ]
+
+    def snapshot(self, snapshot_id: int) -> Optional[tracemalloc.Snapshot]:
+        entry = self.snapshots.get(snapshot_id)
+        return entry["snapshot"] if entry else None
+
+    def try_measure(self) -> bool:
+        """Claim the peak counter, which tracemalloc keeps process-wide"""
+        with self._lock:
+            if self._measuring or not tracemalloc.is_tracing():
+                return False
+            self._measuring = True
+        tracemalloc.reset_peak()
+        return True
+
+    def finish_measure(self, name: str) -> int:
+        """Record the peak allocated since ``try_measure`` under ``name``"""
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            self._measuring = False
+            stats = self.peaks.setdefault(name, {"name": name, "count": 0, "total_bytes": 0,
+                                                 "max_bytes": 0, "last_bytes": 0})
+            stats["count"] += 1
+            stats["total_bytes"] += peak
+            stats["max_bytes"] = max(stats["max_bytes"], peak)
+            stats["last_bytes"] = peak
+        return peak
+
+    def peak_stats(self) -> List[dict]:
+        """Sampled peaks per name, largest first"""
+        with self._lock:
+            rows = [dict(stats, mean_bytes=stats["total_bytes"] // stats["count"])
+                    for stats in self.peaks.values()]
+        return sorted(rows, key=lambda row: row["max_bytes"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self.snapshots.clear()
+            self.peaks.clear()
+
+
+@lru_cache(maxsize=None)
+def get_memory_tracker() -> MemoryTracker:
+    """Process-wide tracker configured from MEMORY_TRACE_* settings"""
+    return MemoryTracker(Config.MEMORY_TRACE_FRAMES, Config.MEMORY_TRACE_MAX_SNAPSHOTS)
+
+
+@contextmanager
+def trace_memory(name: str, enabled: bool = True, top: int = 10, frames: int = 10):
+    """
+    Trace allocations of a command run and log its peak and the sites
+    that grew the most, when ``enabled``
+    """
+    if not enabled:
+        yield
+        return
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(frames)
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+    try:
+        yield
+    finally:
+        after = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        current, peak = tracemalloc.get_traced_memory()
+        if started:
+            tracemalloc.stop()
+        logger.info("memory trace", extra={
+            "job": name,
+            "peak_bytes": peak,
+            "current_bytes": current,
+            "max_rss_kb": max_rss_kb(),
+            "top_sites": [
+                {key: stat[key] for key in ("site", "size_diff", "count_diff")}
+                for stat in diff_stats(before, after, top)
+            ],
+        })
@@ -0,0 +1,73 @@
+"""
+Fractional rank keys for manual task ordering
+
+A rank is a base-36 fraction written as its digits after the point ('0'-'9',
+'a'-'z', no trailing zeros), so comparing ranks as strings compares the
+fractions and a key can always be found between two others. Moving a task
+writes one new key for it and leaves its neighbours alone; keys only get
+longer when many tasks are put into the same gap, until the column is
+rebalanced with ``spaced_ranks()``.
+"""
+from typing import List, Optional
+
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+# Spaced, appended and prepended keys are RANK_GAP apart, room for ~15
+# moves into one gap
+RANK_GAP = BASE ** 3
+# Minimum digits of spaced keys, enough for RANK_GAP-spaced columns of ~23k tasks
+RANK_WIDTH = 6
+
+
+def _to_int(rank: str, width: int) -> int:
+    value = 0
+    for digit in rank.ljust(width, "0"):
+        value = value * BASE + DIGITS.index(digit)
+    return value
+
+
+def _to_rank(value: int, width: int) -> str:
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(DIGITS[digit])
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Key sorting after ``before`` and before ``after``, either of which may
+    be None for the start or end of the column
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"No rank between '{before}' and '{after}'")
+    width = max(len(before or ""), len(after or ""), RANK_WIDTH)
+    low = _to_int(before, width) if before is not None else 0
+    high = _to_int(after, width) if after is not None else BASE ** width
+
+    if before is None and after is None:
+        return DIGITS[BASE // 2]
+    if before is None or after is None:
+        # Step RANK_GAP from the only neighbour, a digit deeper when out of room
+        while high - low <= RANK_GAP:
+            width += 1
+            low, high = low * BASE, high * BASE
+        return _to_rank(low + RANK_GAP if after is None else high - RANK_GAP, width)
+    # One more digit gives BASE times the room
+    while high - low < 2:
+        width += 1
+        low, high = low * BASE, high * BASE
+    return _to_rank((low + high) // 2, width)
+
+
+def spaced_ranks(count: int) -> List[str]:
+    """
+    ``count`` increasing keys RANK_GAP apart, centred so there is room to
+    add tasks at both ends
+    """
+    width = RANK_WIDTH
+    while BASE ** width < 2 * (count + 1) * RANK_GAP:
+        width += 1
+    start = (BASE ** width // RANK_GAP - count) // 2 * RANK_GAP
+    return [_to_rank(start + i * RANK_GAP, width) for i in range(count)]
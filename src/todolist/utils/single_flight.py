@@ -0,0 +1,157 @@
+"""
+Single-flight coalescing of expensive reads
+
+Concurrent identical calls of a ``@coalesce``-d service method share one
+computation: the first caller runs it, the others wait for and receive
+its result (or exception). With ``COALESCE_CACHE_TTL`` the result is also
+kept for that many seconds, so a burst arriving just after it is served
+without a query. Results are shared between requests and must not be
+modified by callers.
+
+Coalescing is per process; a read that starts while an identical one is
+running may see data as of that earlier start, and cached results are up
+to ``COALESCE_CACHE_TTL`` seconds old.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from .config import Config
+
+
+class _Call:
+    """A computation in flight and the callers waiting for it"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class FlightStats:
+    """Calls of one coalesced function by outcome"""
+
+    def __init__(self):
+        self.executions = 0
+        self.shared = 0
+        self.cached = 0
+
+    def as_dict(self, name: str, in_flight: int) -> dict:
+        calls = self.executions + self.shared + self.cached
+        return {
+            "name": name,
+            "calls": calls,
+            "executions": self.executions,
+            "shared": self.shared,
+            "cached": self.cached,
+            "in_flight": in_flight,
+            "saved_ratio": round((self.shared + self.cached) / calls, 3) if calls else None,
+        }
+
+
+class SingleFlight:
+    """Runs one computation per key at a time and optionally caches results"""
+
+    def __init__(self, cache_ttl: float = 0, max_cached: int = 1000):
+        self.cache_ttl = cache_ttl
+        self.max_cached = max_cached
+        self.calls: Dict[tuple, _Call] = {}
+        self.cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.stats: Dict[str, FlightStats] = {}
+        self._lock = threading.Lock()
+
+    def do(self, name: str, key: Hashable, func: Callable[[], Any]) -> Any:
+        """Return ``func()``, or the result of an identical call in flight or cached"""
+        full_key = (name, key)
+        with self._lock:
+            stats = self.stats.setdefault(name, FlightStats())
+            cached = self.cache.get(full_key)
+            if cached is not None and cached[0] > time.monotonic():
+                stats.cached += 1
+                return cached[1]
+            call = self.calls.get(full_key)
+            leader = call is None
+            if leader:
+                call = self.calls[full_key] = _Call()
+                stats.executions += 1
+            else:
+                stats.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self.calls[full_key]
+                # Errors are not cached, the next call tries again
+                if call.error is None and self.cache_ttl > 0:
+                    self._store(full_key, call.result)
+            call.done.set()
+
+    def _store(self, full_key: tuple, result: Any):
+        now = time.monotonic()
+        self.cache[full_key] = (now + self.cache_ttl, result)
+        self.cache.move_to_end(full_key)
+        while self.cache:
+            oldest_key, (expires, _) = next(iter(self.cache.items()))
+            if expires > now and len(self.cache) <= self.max_cached:
+                break
+            del self.cache[oldest_key]
+
+    def stats_list(self) -> List[dict]:
+        with self._lock:
+            in_flight: Dict[str, int] = {}
+            for name, _ in self.calls:
+                in_flight[name] = in_flight.get(name, 0) + 1
+            rows = [stats.as_dict(name, in_flight.get(name, 0))
+                    for name, stats in self.stats.items()]
+        return sorted(rows, key=lambda row: row["calls"], reverse=True)
+
+    def reset(self):
+        """Drop stats and cached results; calls in flight are not affected"""
+        with self._lock:
+            self.stats.clear()
+            self.cache.clear()
+
+
+@lru_cache(maxsize=None)
+def get_single_flight() -> SingleFlight:
+    """Process-wide group configured from COALESCE_* settings"""
+    return SingleFlight(Config.COALESCE_CACHE_TTL, Config.COALESCE_MAX_CACHED)
+
+
+def _default_key(args: tuple, kwargs: dict) -> Hashable:
+    return args, tuple(sorted(kwargs.items()))
+
+
+def coalesce(name: str, key: Optional[Callable[..., Hashable]] = None):
+    """
+    Coalesce concurrent identical calls of a service method
+
+    Args:
+        name: Stats name of the method
+        key: Builds the call key from the method arguments (``self``
+            excluded); by default the arguments themselves, which must be
+            hashable
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not Config.COALESCE_ENABLED:
+                return func(self, *args, **kwargs)
+            call_key = key(*args, **kwargs) if key else _default_key(args, kwargs)
+            return get_single_flight().do(name, call_key, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
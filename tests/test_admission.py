@@ -0,0 +1,101 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.todolist.api.middleware.admission import AdmissionMiddleware, Gate, TokenBucket
+
+
+def http_scope(method="GET", path="/api/v1/tasks/"):
+    return {"type": "http", "method": method, "path": path, "headers": [],
+            "client": ("10.0.0.1", 1234)}
+
+
+class TestGate:
+    def test_queue_bounded_and_fifo(self):
+        async def scenario():
+            gate = Gate(limit=1, queue_size=1, timeout=1.0)
+            assert await gate.acquire()
+            waiter = asyncio.create_task(gate.acquire())
+            await asyncio.sleep(0)
+            # Queue full: rejected without waiting
+            assert not await gate.acquire()
+            gate.release()
+            assert await waiter
+            assert gate.active == 1
+            gate.release()
+            assert gate.active == 0
+            return gate.rejected
+        
+        assert asyncio.run(scenario()) == 1
+    
+    def test_waiter_times_out(self):
+        async def scenario():
+            gate = Gate(limit=1, queue_size=5, timeout=0.01)
+            await gate.acquire()
+            assert not await gate.acquire()
+            assert not gate.waiters
+        
+        asyncio.run(scenario())
+
+
+class TestTokenBucket:
+    def test_refills_over_time(self):
+        bucket = TokenBucket(rate=2, burst=2)
+        assert bucket.take("a", now=0) == 0
+        assert bucket.take("a", now=0) == 0
+        assert bucket.take("a", now=0) == 0.5
+        assert bucket.take("b", now=0) == 0
+        assert bucket.take("a", now=1.0) == 0
+
+
+class TestAdmissionMiddleware:
+    def test_overloaded_writes_get_503_while_reads_pass(self):
+        async def scenario():
+            release = asyncio.Event()
+            
+            async def app(scope, receive, send):
+                if scope["method"] == "POST":
+                    await release.wait()
+                await send({"type": "http.response.start", "status": 200, "headers": []})
+                await send({"type": "http.response.body", "body": b""})
+            
+            middleware = AdmissionMiddleware(app, write_limit=1, queue_size=0)
+            
+            async def call(method):
+                messages = []
+                
+                async def send(message):
+                    messages.append(message)
+                
+                await middleware(http_scope(method), None, send)
+                return messages[0]
+            
+            slow = asyncio.create_task(call("POST"))
+            await asyncio.sleep(0)
+            rejected = await call("POST")
+            read = await call("GET")
+            release.set()
+            await slow
+            return rejected, read
+        
+        rejected, read = asyncio.run(scenario())
+        assert rejected["status"] == 503
+        assert (b"retry-after", b"1") in rejected["headers"]
+        assert read["status"] == 200
+    
+    def test_noisy_client_rate_limited(self):
+        app = FastAPI()
+        app.add_middleware(AdmissionMiddleware, client_rate=0.5, client_burst=2)
+        
+        @app.get("/items")
+        def items():
+            return []
+        
+        client = TestClient(app)
+        assert client.get("/items", headers={"X-API-Key": "noisy"}).status_code == 200
+        assert client.get("/items", headers={"X-API-Key": "noisy"}).status_code == 200
+        response = client.get("/items", headers={"X-API-Key": "noisy"})
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "2"
+        assert client.get("/items", headers={"X-API-Key": "quiet"}).status_code == 200
@@ -0,0 +1,81 @@
+import csv
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.todolist.db.base import Base
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+
+np = pytest.importorskip("numpy")
+
+from src.todolist.analytics import (  # noqa: E402 - needs numpy
+    burn_down, deadline_heatmap, load_task_arrays, overdue_age_histogram, write_csv, write_npz
+)
+from src.todolist.analytics.reports import build_reports  # noqa: E402
+
+
+NOW = datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.fixture
+def arrays():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([Project(name="A", description="D"), Project(name="B", description="D")])
+    db.commit()
+    
+    def add(project_id, status, created_days_ago, deadline_days=None, updated_days_ago=0):
+        task = Task(title="T", description="D")
+        task.project_id = project_id
+        task.status = status
+        task.created_at = NOW - timedelta(days=created_days_ago)
+        task.updated_at = NOW - timedelta(days=updated_days_ago)
+        if deadline_days is not None:
+            task.deadline = NOW + timedelta(days=deadline_days)
+        db.add(task)
+    
+    add(1, "todo", 5, deadline_days=-2)      # overdue by 2 days
+    add(1, "doing", 3, deadline_days=1)      # due tomorrow
+    add(1, "done", 4, deadline_days=-10, updated_days_ago=1)
+    add(2, "todo", 1, deadline_days=-40)     # overdue by 40 days
+    add(2, "todo", 0)
+    db.commit()
+    yield load_task_arrays(db, batch_size=2)
+    db.close()
+
+
+class TestAnalytics:
+    def test_load_task_arrays(self, arrays):
+        assert len(arrays) == 5
+        assert list(arrays.status) == [0, 1, 2, 0, 0]
+        assert np.isnan(arrays.deadline[4])
+    
+    def test_burn_down(self, arrays):
+        report = burn_down(arrays, NOW.date() - timedelta(days=3), 4)
+        assert list(report["projects"]) == [1, 2]
+        # Project 1: three open until the done task closes yesterday
+        assert report["remaining"].tolist() == [[3, 3, 2, 2], [0, 0, 1, 2]]
+    
+    def test_overdue_age_and_heatmap(self, arrays):
+        overdue = overdue_age_histogram(arrays, NOW)
+        assert overdue["counts"].tolist() == [[0, 1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 1, 0]]
+        
+        heatmap = deadline_heatmap(arrays, NOW.date(), 3)
+        assert heatmap["counts"].tolist() == [[0, 1, 0], [0, 0, 0]]
+    
+    def test_snapshots(self, arrays, tmp_path):
+        reports = build_reports(arrays, NOW, 7, 14)
+        path = write_npz(reports, str(tmp_path / "report.npz"))
+        with np.load(path) as snapshot:
+            assert snapshot["burn_down.remaining"].shape == (2, 7)
+            assert snapshot["deadline_heatmap.counts"].sum() == 1
+        
+        paths = write_csv(reports, str(tmp_path / "csv"))
+        with open(paths[0]) as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == ["project_id", "day", "count"]
+        assert len(rows) == 1 + 2 * 7
@@ -0,0 +1,413 @@
+import importlib
+import pytest
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.todolist.api.main import app
+from src.todolist.api.dependencies.database import get_db
+from src.todolist.api.dependencies.repositories import get_memory_store
+from src.todolist.commands.jobs import JOB_KINDS
+from src.todolist.db.base import Base
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+from src.todolist.services.job_runner import JobRunner
+from src.todolist.utils.config import Config
+
+
+# Fixture for an isolated in-memory database behind the API
+@pytest.fixture
+def db_session():
+    """Create a fresh in-memory database for each test"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def client(db_session):
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def project(db_session):
+    project = Project(name="API Project", description="API Description")
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+@pytest.fixture
+def statements(db_session):
+    """Record every SQL statement sent to the test database"""
+    executed = []
+    engine = db_session.get_bind()
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield executed
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def add_task(db_session, project, title, status="todo", deadline=None):
+    task = Task(title=title, description="Description", deadline=deadline)
+    task.project_id = project.id
+    task.status = status
+    db_session.add(task)
+    db_session.commit()
+    return task
+
+
+class TestListEndpoints:
+    def test_list_projects_matches_schema(self, client, project):
+        """Fast-path project list returns the ProjectResponse shape"""
+        response = client.get("/api/v1/projects/")
+        assert response.status_code == 200
+        assert response.json() == [{
+            "name": "API Project",
+            "description": "API Description",
+            "id": project.id,
+            "created_at": project.created_at.isoformat(),
+            "updated_at": project.updated_at.isoformat(),
+        }]
+    
+    def test_list_tasks_filters_by_status(self, client, db_session, project):
+        """Status filter is applied in the query"""
+        add_task(db_session, project, "Todo Task")
+        done = add_task(db_session, project, "Done Task", status="done")
+        
+        response = client.get("/api/v1/tasks/", params={"status": "done"})
+        assert response.status_code == 200
+        body = response.json()
+        assert [task["id"] for task in body] == [done.id]
+        assert body[0]["deadline"] is None
+        assert body[0]["project_id"] == project.id
+    
+    def test_overdue_tasks(self, client, db_session, project):
+        """Overdue list only returns unfinished tasks past their deadline"""
+        overdue = add_task(db_session, project, "Late", deadline=datetime.now() - timedelta(days=1))
+        add_task(db_session, project, "Late Done", status="done",
+                 deadline=datetime.now() - timedelta(days=1))
+        add_task(db_session, project, "Upcoming", deadline=datetime.now() + timedelta(days=1))
+        
+        response = client.get("/api/v1/tasks/overdue/")
+        assert response.status_code == 200
+        assert [task["id"] for task in response.json()] == [overdue.id]
+    
+    def test_openapi_schema_unchanged(self, client):
+        """List endpoints still document their response models"""
+        schema = client.get("/openapi.json").json()
+        response = schema["paths"]["/api/v1/tasks/"]["get"]["responses"]["200"]
+        items = response["content"]["application/json"]["schema"]["items"]
+        assert items["$ref"].endswith("/TaskResponse")
+
+
+
+class TestWriteEndpoints:
+    def test_create_project_two_statements(self, client, statements):
+        """Project create is the limit count plus the INSERT"""
+        response = client.post("/api/v1/projects/", json={"name": "New", "description": "D"})
+        assert response.status_code == 201
+        assert response.json()["id"] is not None
+        assert len(statements) == 2
+    
+    def test_create_project_duplicate_name(self, client, project):
+        """Unique constraint violation maps to 409"""
+        response = client.post(
+            "/api/v1/projects/", json={"name": project.name, "description": "D"}
+        )
+        assert response.status_code == 409
+    
+    def test_update_project_duplicate_and_missing(self, client, project):
+        """Project update maps constraint and row-count failures"""
+        other = client.post("/api/v1/projects/", json={"name": "Other", "description": "D"})
+        other_id = other.json()["id"]
+        
+        response = client.put(f"/api/v1/projects/{other_id}", json={"name": project.name})
+        assert response.status_code == 409
+        response = client.put("/api/v1/projects/999", json={"name": "Missing"})
+        assert response.status_code == 404
+    
+    def test_create_task_missing_project(self, client):
+        """Foreign key violation maps to 404"""
+        response = client.post(
+            "/api/v1/tasks/", json={"project_id": 999, "title": "T", "description": "D"}
+        )
+        assert response.status_code == 404
+    
+    def test_update_task_single_statement(self, client, db_session, project, statements):
+        """PUT only changes the given fields with one UPDATE ... RETURNING"""
+        task = add_task(db_session, project, "Original")
+        statements.clear()
+        
+        response = client.put(f"/api/v1/tasks/{task.id}", json={"title": "Renamed"})
+        assert response.status_code == 200
+        assert response.json()["status"] == "todo"
+        assert len(statements) == 1
+        assert statements[0].startswith("UPDATE")
+        
+        # A status change also reads the end of the new column for the rank
+        statements.clear()
+        response = client.put(f"/api/v1/tasks/{task.id}", json={"status": "doing"})
+        assert response.json()["title"] == "Renamed"
+        assert response.json()["status"] == "doing"
+        assert [s.split()[0] for s in statements] == ["SELECT", "UPDATE"]
+    
+    def test_update_and_delete_missing_task(self, client):
+        """Missing tasks are detected from affected rows"""
+        assert client.put("/api/v1/tasks/999", json={"title": "X"}).status_code == 404
+        assert client.patch("/api/v1/tasks/999/status", json={"status": "done"}).status_code == 404
+        assert client.delete("/api/v1/tasks/999").status_code == 404
+
+
+
+class TestMemoryBackend:
+    def test_crud_through_memory_backend(self, monkeypatch):
+        """REPOSITORY_BACKEND=memory serves the API without a database"""
+        monkeypatch.setattr(Config, "REPOSITORY_BACKEND", "memory")
+        get_memory_store.cache_clear()
+        client = TestClient(app)
+        try:
+            project = client.post("/api/v1/projects/", json={"name": "Mem", "description": "D"})
+            assert project.status_code == 201
+            project_id = project.json()["id"]
+            
+            task = client.post(
+                "/api/v1/tasks/",
+                json={"project_id": project_id, "title": "T", "description": "D"}
+            )
+            assert task.status_code == 201
+            client.patch(f"/api/v1/tasks/{task.json()['id']}/status", json={"status": "done"})
+            
+            listed = client.get("/api/v1/tasks/", params={"status": "done"}).json()
+            assert [t["title"] for t in listed] == ["T"]
+            stats = client.get(f"/api/v1/projects/{project_id}/stats").json()
+            assert stats["status_count"] == {"todo": 0, "doing": 0, "done": 1}
+        finally:
+            get_memory_store.cache_clear()
+
+
+
+class TestProjectDelete:
+    def test_small_project_deleted_inline(self, client, db_session, project):
+        add_task(db_session, project, "Task")
+        assert client.delete(f"/api/v1/projects/{project.id}").status_code == 204
+        assert client.get(f"/api/v1/projects/{project.id}").status_code == 404
+        assert client.get("/api/v1/tasks/").json() == []
+    
+    def test_large_project_purged_in_background(self, client, db_session, project, monkeypatch):
+        """Projects over the threshold return 202 and are purged in chunks"""
+        purge_module = importlib.import_module("src.todolist.commands.purge_project")
+        engine = db_session.get_bind()
+        monkeypatch.setattr(purge_module, "SessionLocal", sessionmaker(bind=engine))
+        monkeypatch.setattr(Config, "PROJECT_PURGE_THRESHOLD", 2)
+        monkeypatch.setattr(Config, "DELETE_CHUNK_SIZE", 2)
+        for i in range(3):
+            add_task(db_session, project, f"Task {i}")
+        
+        response = client.delete(f"/api/v1/projects/{project.id}")
+        assert response.status_code == 202
+        assert response.json()["status"] == "scheduled"
+        assert response.headers["Location"] == f"/api/v1/jobs/{response.json()['job_id']}"
+        # Deleting again while queued does not queue a second purge
+        assert client.delete(f"/api/v1/projects/{project.id}").json()["job_id"] == response.json()["job_id"]
+        
+        runner = JobRunner(JOB_KINDS, sessionmaker(bind=engine), workers=1)
+        runner.run_until_idle()
+        runner.stop()
+        progress = client.get(f"/api/v1/projects/{project.id}/purge").json()
+        assert progress["status"] == "done"
+        assert progress["deleted_tasks"] == 3
+        assert client.get(f"/api/v1/projects/{project.id}").status_code == 404
+
+
+
+class TestArchivedTasks:
+    def test_include_archived_on_list_get_and_stats(self, client, db_session, project):
+        from src.todolist.repositories.archive_repository import TaskArchiveRepository
+        
+        archived = add_task(db_session, project, "Old", status="done")
+        live = add_task(db_session, project, "Live")
+        TaskArchiveRepository(db_session).archive_done_before(
+            datetime.now() + timedelta(seconds=1), limit=10
+        )
+        
+        listed = client.get("/api/v1/tasks/").json()
+        assert [t["id"] for t in listed] == [live.id]
+        # Live and archived tasks are merged in id order
+        listed = client.get("/api/v1/tasks/", params={"include_archived": True}).json()
+        assert [t["id"] for t in listed] == [archived.id, live.id]
+        
+        assert client.get(f"/api/v1/tasks/{archived.id}").status_code == 404
+        response = client.get(f"/api/v1/tasks/{archived.id}", params={"include_archived": True})
+        assert response.json()["title"] == "Old"
+        
+        stats = client.get(f"/api/v1/projects/{project.id}/stats").json()
+        assert stats["total_tasks"] == 1
+        stats = client.get(
+            f"/api/v1/projects/{project.id}/stats", params={"include_archived": True}
+        ).json()
+        assert stats["total_tasks"] == 2
+        assert stats["status_count"]["done"] == 1
+        
+        listed = client.get("/api/v1/tasks/", params={
+            "include_archived": True, "sort": "-id", "limit": 1, "fields": "id,status"
+        }).json()
+        assert listed == [{"id": live.id, "status": "todo"}]
+
+
+class TestTaskQuery:
+    def test_multi_status_and_range_filters(self, client, db_session, project):
+        now = datetime.now()
+        soon = add_task(db_session, project, "Soon", deadline=now + timedelta(days=2))
+        later = add_task(db_session, project, "Later", deadline=now + timedelta(days=20))
+        done = add_task(db_session, project, "Done", status="done",
+                        deadline=now + timedelta(days=1))
+        add_task(db_session, project, "Doing", status="doing")
+        
+        listed = client.get("/api/v1/tasks/", params={"status": "todo,done"}).json()
+        assert [t["id"] for t in listed] == [soon.id, later.id, done.id]
+        
+        listed = client.get("/api/v1/tasks/", params={
+            "deadline_from": now.isoformat(),
+            "deadline_to": (now + timedelta(days=10)).isoformat(),
+        }).json()
+        assert [t["id"] for t in listed] == [soon.id, done.id]
+        
+        # Upcoming skips finished tasks
+        listed = client.get("/api/v1/tasks/", params={"upcoming_days": 7}).json()
+        assert [t["id"] for t in listed] == [soon.id]
+    
+    def test_sort_page_and_sparse_fields(self, client, db_session, project):
+        now = datetime.now()
+        tasks = [
+            add_task(db_session, project, f"Task {i}", deadline=now + timedelta(days=days))
+            for i, days in enumerate([3, 1, 2])
+        ]
+        
+        listed = client.get("/api/v1/tasks/", params={
+            "sort": "-deadline", "limit": 2, "offset": 1, "fields": "id,title"
+        }).json()
+        assert listed == [
+            {"id": tasks[2].id, "title": "Task 2"},
+            {"id": tasks[1].id, "title": "Task 1"},
+        ]
+    
+    def test_invalid_sort_and_fields(self, client):
+        response = client.get("/api/v1/tasks/", params={"sort": "title"})
+        assert response.status_code == 400
+        response = client.get("/api/v1/tasks/", params={"fields": "id,secret"})
+        assert response.status_code == 400
+        response = client.get("/api/v1/tasks/", params={"status": "todo,lost"})
+        assert response.status_code == 422
+
+
+class TestBatchReads:
+    def test_batch_lookups(self, client, db_session, project, statements):
+        tasks = [add_task(db_session, project, f"Task {i}") for i in range(3)]
+        other = Project(name="Other", description="D")
+        db_session.add(other)
+        db_session.commit()
+        statements.clear()
+        
+        listed = client.get("/api/v1/tasks/", params={"ids": f"{tasks[2].id},{tasks[0].id},999"}).json()
+        assert [t["id"] for t in listed] == [tasks[0].id, tasks[2].id]
+        listed = client.get("/api/v1/projects/", params={"ids": f"{other.id},999"}).json()
+        assert [p["id"] for p in listed] == [other.id]
+        assert len(statements) == 2
+        
+        response = client.get("/api/v1/tasks/", params={"ids": "1,x"})
+        assert response.status_code == 400
+    
+    def test_include_tasks_in_two_queries(self, client, db_session, project, statements):
+        projects = [project] + [Project(name=f"Board {i}", description="D") for i in range(4)]
+        db_session.add_all(projects[1:])
+        db_session.commit()
+        for p in projects:
+            add_task(db_session, p, f"{p.name} task")
+        statements.clear()
+        
+        listed = client.get("/api/v1/projects/", params={"include": "tasks"}).json()
+        assert len(statements) == 2
+        assert [p["id"] for p in listed] == [p.id for p in projects]
+        assert [[t["title"] for t in p["tasks"]] for p in listed] == [
+            [f"{p.name} task"] for p in projects
+        ]
+        
+        single = client.get(f"/api/v1/projects/{project.id}", params={"include": "tasks"}).json()
+        assert single["name"] == "API Project"
+        assert [t["title"] for t in single["tasks"]] == ["API Project task"]
+        response = client.get("/api/v1/projects/999", params={"include": "tasks"})
+        assert response.status_code == 404
+
+
+class TestStatusHistory:
+    def test_every_status_change_is_logged(self, client, db_session, project):
+        from src.todolist.repositories.task_event_repository import TaskEventRepository
+        from src.todolist.repositories.task_repository import TaskRepository
+        
+        task_id = client.post("/api/v1/tasks/", json={
+            "project_id": project.id, "title": "T", "description": "D"
+        }).json()["id"]
+        client.put(f"/api/v1/tasks/{task_id}", json={"status": "doing"})
+        client.put(f"/api/v1/tasks/{task_id}", json={"title": "Renamed"})
+        client.patch(f"/api/v1/tasks/{task_id}/status", json={"status": "done"})
+        TaskRepository(db_session).bulk_change_status([task_id], "todo")
+        
+        events = TaskEventRepository(db_session).get_by_task(task_id)
+        assert [(e.from_status, e.to_status) for e in events] == [
+            (None, "todo"), ("todo", "doing"), ("doing", "done"), ("done", "todo")
+        ]
+    
+    def test_throughput_and_lead_time(self, client, db_session, project):
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        # Created two days ago, done after 25h, 26h and 48h; one still open
+        for hours in (25, 26, 48, None):
+            task = Task(title="T", description="D")
+            task.project_id = project.id
+            task.created_at = task.updated_at = today - timedelta(days=2)
+            db_session.add(task)
+            db_session.commit()
+            if hours is not None:
+                done_at = task.created_at + timedelta(hours=hours)
+                db_session.execute(
+                    update(Task).where(Task.id == task.id).values(status="done", updated_at=done_at)
+                )
+                db_session.commit()
+        
+        days = client.get(f"/api/v1/projects/{project.id}/throughput", params={"days": 3}).json()
+        assert [d["count"] for d in days] == [0, 2, 1]
+        assert days[-1]["day"] == today.date().isoformat()
+        
+        stats = client.get(f"/api/v1/projects/{project.id}/lead-time",
+                           params={"percentiles": "50,100"}).json()
+        assert stats["count"] == 3
+        assert stats["percentiles"]["p50"] == pytest.approx(26 * 3600, abs=1)
+        assert stats["percentiles"]["p100"] == pytest.approx(48 * 3600, abs=1)
+        assert stats["mean_seconds"] == pytest.approx((25 + 26 + 48) * 3600 / 3, abs=1)
+        
+        assert client.get("/api/v1/projects/999/lead-time").status_code == 404
+        response = client.get(f"/api/v1/projects/{project.id}/lead-time",
+                              params={"percentiles": "0"})
+        assert response.status_code == 400
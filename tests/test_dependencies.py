@@ -0,0 +1,149 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.todolist.api.main import app
+from src.todolist.api.dependencies.database import get_db
+from src.todolist.db.base import Base
+from src.todolist.db import session  # noqa: F401 - enables SQLite foreign keys
+from src.todolist.exceptions.repository_exceptions import NotFoundError
+from src.todolist.exceptions.service_exceptions import ValidationError
+from src.todolist.models.outbox import OutboxEvent
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+from src.todolist.repositories.task_dependency_repository import TaskDependencyRepository
+from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.services.task_service import TaskService
+from src.todolist.utils.config import Config
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def service(db_session):
+    return TaskService(TaskRepository(db_session), dependency_repo=TaskDependencyRepository(db_session))
+
+
+@pytest.fixture
+def chain(db_session, service):
+    """Tasks a <- b <- c <- d, each blocked by the one before, and a free task e"""
+    project = Project(name="Graph", description="Dependency graph")
+    db_session.add(project)
+    db_session.commit()
+    tasks = {}
+    for name in "abcde":
+        tasks[name] = service.create_task(project.id, f"Task {name}", "Graph task")
+    for blocker, task in ("ab", "bc", "cd"):
+        service.add_blocker(tasks[task].id, tasks[blocker].id)
+    return tasks
+
+
+def ids(tasks):
+    return [task.id for task in tasks]
+
+
+class TestTaskDependencies:
+    def test_transitive_blockers_and_dependents(self, service, chain):
+        a, b, c, d = (chain[name] for name in "abcd")
+        assert ids(service.get_blockers(d.id)) == [a.id, b.id, c.id]
+        assert ids(service.get_blockers(d.id, transitive=False)) == [c.id]
+        assert ids(service.get_dependents(a.id)) == [b.id, c.id, d.id]
+        assert ids(service.get_dependents(chain["e"].id)) == []
+
+    def test_cycles_and_invalid_edges_rejected(self, db_session, service, chain):
+        a, d = chain["a"], chain["d"]
+        with pytest.raises(ValidationError, match="already depends"):
+            service.add_blocker(a.id, d.id)
+        with pytest.raises(ValidationError):
+            service.add_blocker(a.id, a.id)
+        with pytest.raises(NotFoundError):
+            service.add_blocker(a.id, 999)
+
+        other = Project(name="Other", description="Other project")
+        db_session.add(other)
+        db_session.commit()
+        outsider = service.create_task(other.id, "Outsider", "Other task")
+        with pytest.raises(ValidationError, match="same project"):
+            service.add_blocker(a.id, outsider.id)
+
+        # Adding an existing edge is a no-op
+        assert service.add_blocker(chain["b"].id, a.id).blocker_id == a.id
+
+    def test_ready_follows_blockers(self, service, chain):
+        a, b, c, d, e = (chain[name] for name in "abcde")
+        project_id = a.project_id
+        assert ids(service.get_ready_tasks(project_id)) == [a.id, e.id]
+
+        service.change_task_status(a.id, "done")
+        assert ids(service.get_ready_tasks(project_id)) == [b.id, e.id]
+
+        service.change_tasks_status([b.id, c.id], "done")
+        assert ids(service.get_ready_tasks(project_id)) == [d.id, e.id]
+        assert ids(service.get_ready_tasks(project_id, limit=1)) == [d.id]
+
+        assert service.remove_blocker(d.id, c.id)
+        assert not service.remove_blocker(d.id, c.id)
+
+    def test_deleting_a_task_removes_its_edges(self, service, chain):
+        service.delete_task(chain["b"].id)
+        assert ids(service.get_blockers(chain["c"].id)) == []
+        assert ids(service.get_ready_tasks(chain["a"].project_id)) == [
+            chain["a"].id, chain["c"].id, chain["e"].id
+        ]
+
+    def test_ready_events_recorded_for_unblocked_tasks(self, db_session, service, chain,
+                                                       monkeypatch):
+        monkeypatch.setattr(Config, "OUTBOX_ENABLED", True)
+        a, b, c = chain["a"], chain["b"], chain["c"]
+        # A second blocker keeps c waiting until both are done
+        service.add_blocker(c.id, a.id)
+        service.change_task_status(a.id, "done")
+        service.change_tasks_status([b.id], "done")
+
+        ready = db_session.query(OutboxEvent).filter(
+            OutboxEvent.event_type == "task.ready"
+        ).order_by(OutboxEvent.id).all()
+        assert [event.payload["id"] for event in ready] == [b.id, c.id]
+
+
+def test_dependency_endpoints(db_session, chain):
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        client = TestClient(app)
+        a, b, e = chain["a"], chain["b"], chain["e"]
+
+        response = client.post(f"/api/v1/tasks/{e.id}/blockers", json={"blocker_id": b.id})
+        assert response.status_code == 201
+        assert response.json()["blocker_id"] == b.id
+
+        response = client.post(f"/api/v1/tasks/{a.id}/blockers", json={"blocker_id": e.id})
+        assert response.status_code == 400
+
+        response = client.get(f"/api/v1/tasks/{e.id}/blockers")
+        assert [task["id"] for task in response.json()] == [a.id, b.id]
+        response = client.get(f"/api/v1/tasks/{a.id}/dependents", params={"transitive": False})
+        assert [task["id"] for task in response.json()] == [b.id]
+
+        response = client.get("/api/v1/tasks/ready/", params={"project_id": a.project_id})
+        assert [task["id"] for task in response.json()] == [a.id]
+
+        assert client.delete(f"/api/v1/tasks/{e.id}/blockers/{b.id}").status_code == 204
+        assert client.delete(f"/api/v1/tasks/{e.id}/blockers/{b.id}").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
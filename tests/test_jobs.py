@@ -0,0 +1,116 @@
+import importlib
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.todolist.api.main import app
+from src.todolist.api.dependencies.database import get_db
+from src.todolist.db.base import Base
+from src.todolist.exceptions.service_exceptions import ValidationError
+from src.todolist.repositories.job_repository import JobRepository
+from src.todolist.services.job_runner import JobKind, JobRunner
+from src.todolist.services.job_service import JobService
+from src.todolist.utils.config import Config
+
+
+def count_to(n, progress=None):
+    for i in range(1, n + 1):
+        progress(i, n)
+    return {"counted": n, "paths": ["/tmp/a/x.csv", "/tmp/a/y.csv"]}
+
+
+def wait_for_cancel(started, progress=None):
+    started.set()
+    while True:
+        progress(0, None)
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """File database, so the runner threads get their own connections"""
+    monkeypatch.setattr(importlib.import_module("src.todolist.services.job_runner"),
+                        "PROGRESS_INTERVAL", 0)
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}",
+                           connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    try:
+        yield sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture
+def db_session(session_factory):
+    with session_factory() as db:
+        yield db
+
+
+KINDS = {"count_to": JobKind(count_to), "wait_for_cancel": JobKind(wait_for_cancel)}
+
+
+def test_submit_checks_kind_and_params(db_session):
+    service = JobService(JobRepository(db_session), KINDS)
+    with pytest.raises(ValidationError, match="Unknown job kind"):
+        service.submit("nope")
+    with pytest.raises(ValidationError, match="Invalid parameters"):
+        service.submit("count_to", {"m": 3})
+    with pytest.raises(ValidationError, match="set by the runner"):
+        service.submit("count_to", {"n": 3, "progress": 1})
+    assert service.submit("count_to", {"n": 3}).status == "queued"
+
+
+def test_runner_stores_progress_and_result(db_session, session_factory):
+    service = JobService(JobRepository(db_session), KINDS)
+    job = service.submit("count_to", {"n": 3})
+
+    runner = JobRunner(KINDS, session_factory, workers=1)
+    runner.run_until_idle()
+    runner.stop()
+
+    job = service.get_job(job.id)
+    assert job.status == "succeeded"
+    assert (job.progress_current, job.progress_total) == (3, 3)
+    assert job.result["counted"] == 3
+    assert job.result_location == "/tmp/a"
+    assert job.started_at and job.finished_at
+
+
+def test_cancel_queued_and_running_jobs(db_session, session_factory):
+    started = threading.Event()
+    kinds = dict(KINDS, wait_for_cancel=JobKind(lambda progress=None: wait_for_cancel(started, progress)))
+    service = JobService(JobRepository(db_session), kinds)
+    queued = service.submit("count_to", {"n": 1})
+    assert service.cancel_job(queued.id).status == "cancelled"
+
+    running = service.submit("wait_for_cancel")
+    runner = JobRunner(kinds, session_factory, workers=1)
+    assert runner.poll() == 1
+    assert started.wait(5)
+    assert service.cancel_job(running.id).cancel_requested
+    runner.run_until_idle()
+    runner.stop()
+    assert service.get_job(running.id).status == "cancelled"
+    # The cancelled queued job never ran
+    assert service.get_job(queued.id).started_at is None
+
+
+def test_jobs_api(db_session, monkeypatch):
+    monkeypatch.setattr(Config, "ADMIN_TOKEN", "secret")
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        client = TestClient(app, headers={"X-Admin-Token": "secret"})
+        response = client.post("/api/v1/jobs/", json={"kind": "purge_project", "params": {"project_id": 1}})
+        assert response.status_code == 202
+        job = response.json()
+        assert (job["status"], job["project_id"]) == ("queued", 1)
+        assert client.post("/api/v1/jobs/", json={"kind": "purge_project"}).status_code == 400
+
+        assert client.get(f"/api/v1/jobs/{job['id']}").json()["kind"] == "purge_project"
+        assert [j["id"] for j in client.get("/api/v1/jobs/", params={"status": "queued"}).json()] == [job["id"]]
+        assert client.post(f"/api/v1/jobs/{job['id']}/cancel").json()["status"] == "cancelled"
+        assert client.get("/api/v1/jobs/999").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
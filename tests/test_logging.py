@@ -0,0 +1,92 @@
+import io
+import json
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from src.todolist.api.middleware.request_context import RequestContextMiddleware
+from src.todolist.utils.log import (
+    ContextFilter, JsonFormatter, bind, configure_logging, log_job, shutdown_logging, track_db_time,
+)
+
+
+def make_record(message="hello", **extra):
+    record = logging.makeLogRecord({"name": "test", "levelname": "INFO", "msg": message})
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class TestStructuredLogging:
+    def test_json_formatter_includes_extra_fields(self):
+        entry = json.loads(JsonFormatter().format(make_record(job="archive", archived=3)))
+        assert entry["message"] == "hello"
+        assert entry["level"] == "INFO"
+        assert entry["job"] == "archive"
+        assert entry["archived"] == 3
+
+    def test_records_go_through_the_queue_with_bound_fields(self):
+        stream = io.StringIO()
+        configure_logging(level="INFO", fmt="json", stream=stream)
+        try:
+            with bind(request_id="abc"):
+                logging.getLogger("test.queue").info("queued", extra={"count": 2})
+        finally:
+            shutdown_logging()
+        entry = json.loads(stream.getvalue().splitlines()[-1])
+        assert entry["message"] == "queued"
+        assert entry["request_id"] == "abc"
+        assert entry["count"] == 2
+
+    def test_log_job_logs_one_summary(self, caplog):
+        logger = logging.getLogger("test.job")
+        with caplog.at_level("INFO", logger="test.job"):
+            with log_job(logger, "demo", dry_run=True) as summary:
+                summary["processed"] = 5
+            with pytest.raises(ValueError):
+                with log_job(logger, "demo"):
+                    raise ValueError("boom")
+
+        finished, failed = caplog.records
+        assert finished.getMessage() == "job finished"
+        assert finished.outcome == "ok"
+        assert finished.processed == 5
+        assert finished.dry_run is True
+        assert failed.outcome == "failed"
+        assert failed.exc_info is not None
+
+
+class TestRequestContextMiddleware:
+    @pytest.fixture
+    def client(self):
+        engine = create_engine("sqlite://")
+        track_db_time(engine)
+        app = FastAPI()
+
+        @app.get("/items/{item_id}")
+        def item(item_id: int):
+            logging.getLogger("test.route").info("in route")
+            with engine.connect() as conn:
+                return {"id": conn.execute(text("SELECT :id"), {"id": item_id}).scalar()}
+
+        app.add_middleware(RequestContextMiddleware)
+        return TestClient(app)
+
+    def test_request_id_is_echoed_and_bound(self, client, caplog):
+        caplog.handler.addFilter(ContextFilter())
+        with caplog.at_level("INFO"):
+            response = client.get("/items/1", headers={"X-Request-ID": "req-1"})
+        assert response.headers["x-request-id"] == "req-1"
+
+        in_route = next(r for r in caplog.records if r.getMessage() == "in route")
+        assert in_route.request_id == "req-1"
+        access = next(r for r in caplog.records if r.getMessage() == "request")
+        assert access.route == "/items/{item_id}"
+        assert access.status == 200
+        assert access.db_statements == 1
+
+    def test_request_id_is_generated(self, client):
+        assert len(client.get("/items/2").headers["x-request-id"]) == 32
@@ -0,0 +1,86 @@
+import importlib
+import tracemalloc
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.todolist.api.main import app as api_app
+from src.todolist.api.middleware.memory import MemoryMiddleware
+from src.todolist.utils.config import Config
+from src.todolist.utils.memory import MemoryTracker, diff_stats, trace_memory
+
+admin_routes = importlib.import_module("src.todolist.api.routes.admin")
+
+
+@pytest.fixture
+def tracker():
+    tracker = MemoryTracker(frames=5, max_snapshots=2)
+    yield tracker
+    tracemalloc.stop()
+
+
+class TestMemoryTracker:
+    def test_snapshots_diff_to_the_allocating_site(self, tracker):
+        first = tracker.take_snapshot("before")
+        kept = [bytearray(1024) for _ in range(200)]
+        second = tracker.take_snapshot("after")
+        
+        [grown] = diff_stats(tracker.snapshot(first["id"]), tracker.snapshot(second["id"]), 1)
+        assert "test_memory.py" in grown["site"]
+        assert grown["size_diff"] >= 200 * 1024
+        
+        tracker.take_snapshot("third")
+        assert [s["label"] for s in tracker.list_snapshots()] == ["after", "third"]
+        del kept
+    
+    def test_request_peaks_per_route(self, tracker):
+        app = FastAPI()
+        
+        @app.get("/items/{item_id}")
+        async def item(item_id: int):
+            return {"size": len(bytearray(2_000_000)) + item_id}
+        
+        app.add_middleware(MemoryMiddleware, tracker=tracker, sample_rate=1.0)
+        client = TestClient(app)
+        client.get("/items/1")
+        client.get("/items/2")
+        
+        [stats] = tracker.peak_stats()
+        assert stats["name"] == "GET /items/{item_id}"
+        assert stats["count"] == 2
+        assert stats["max_bytes"] >= 2_000_000
+    
+    def test_trace_memory_logs_summary(self, caplog):
+        with caplog.at_level("INFO", logger="src.todolist.utils.memory"):
+            with trace_memory("job"):
+                data = [bytearray(1024) for _ in range(100)]
+        assert not tracemalloc.is_tracing()
+        record = next(r for r in caplog.records if r.getMessage() == "memory trace")
+        assert record.job == "job"
+        assert record.peak_bytes >= 100 * 1024
+        assert record.top_sites
+        del data
+
+
+class TestAdminMemory:
+    def test_snapshot_endpoints(self, tracker, monkeypatch):
+        monkeypatch.setattr(Config, "MEMORY_TRACING_ENABLED", True)
+        monkeypatch.setattr(Config, "ADMIN_TOKEN", "secret")
+        monkeypatch.setattr(admin_routes, "get_memory_tracker", lambda: tracker)
+        client = TestClient(api_app, headers={"X-Admin-Token": "secret"})
+        
+        first = client.post("/api/v1/admin/memory/snapshots", params={"label": "a"}).json()
+        second = client.post("/api/v1/admin/memory/snapshots", params={"label": "b"}).json()
+        assert [s["label"] for s in client.get("/api/v1/admin/memory/snapshots").json()] == ["a", "b"]
+        
+        top = client.get(f"/api/v1/admin/memory/snapshots/{second['id']}/top",
+                         params={"limit": 3, "group_by": "filename"}).json()
+        assert len(top) == 3 and top[0]["size"] >= top[1]["size"]
+        diff = client.get("/api/v1/admin/memory/diff",
+                          params={"from": first["id"], "to": second["id"], "limit": 2}).json()
+        assert len(diff) == 2 and "size_diff" in diff[0]
+        assert client.get("/api/v1/admin/memory/snapshots/99/top").status_code == 404
+        
+        monkeypatch.setattr(Config, "MEMORY_TRACING_ENABLED", False)
+        assert client.get("/api/v1/admin/memory/requests").status_code == 404
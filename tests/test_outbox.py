@@ -0,0 +1,181 @@
+import json
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.todolist.db.base import Base
+from src.todolist.db import session  # noqa: F401 - enables SQLite foreign keys
+from src.todolist.exceptions.repository_exceptions import NotFoundError
+from src.todolist.models.outbox import OutboxEvent
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+from src.todolist.repositories.outbox_repository import OutboxRepository
+from src.todolist.repositories.project_repository import ProjectRepository
+from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.services.webhook_dispatcher import WebhookDispatcher
+from src.todolist.utils.config import Config
+
+
+@pytest.fixture
+def db_session(monkeypatch):
+    monkeypatch.setattr(Config, "OUTBOX_ENABLED", True)
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def stub_server():
+    """Local HTTP server recording POSTed batches, failing the first ``fail`` ones"""
+    state = {"received": [], "fail": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            if state["fail"] > 0:
+                state["fail"] -= 1
+                self.send_response(503)
+            else:
+                state["received"].append(body["events"])
+                self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}/hook"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def event_types(db):
+    return [event.event_type for event in db.query(OutboxEvent).order_by(OutboxEvent.id)]
+
+
+def create_project_with_task(db):
+    project = ProjectRepository(db).add(Project(name="Outbox", description="Description"))
+    task = Task(title="Task", description="Description")
+    task.project_id = project.id
+    TaskRepository(db).add(task)
+    return project, task
+
+
+class TestOutboxWrites:
+    def test_writes_record_events_in_their_transaction(self, db_session):
+        project, task = create_project_with_task(db_session)
+        task_repo = TaskRepository(db_session)
+        task_repo.update_by_id(task.id, {"status": "doing"})
+        task_repo.bulk_change_status([task.id], "done")
+        task_repo.delete(task.id)
+        ProjectRepository(db_session).delete(project.id)
+
+        assert event_types(db_session) == [
+            "project.created", "task.created", "task.updated",
+            "task.status_changed", "task.deleted", "project.deleted",
+        ]
+        created = db_session.query(OutboxEvent).filter_by(event_type="task.created").one()
+        assert created.project_id == project.id
+        assert created.payload["title"] == "Task"
+
+    def test_failed_write_records_nothing(self, db_session):
+        task = Task(title="Orphan", description="Description")
+        task.project_id = 999
+        with pytest.raises(NotFoundError):
+            TaskRepository(db_session).add(task)
+        assert TaskRepository(db_session).delete(12345) is False
+        assert event_types(db_session) == []
+
+    def test_disabled_outbox_records_nothing(self, db_session, monkeypatch):
+        monkeypatch.setattr(Config, "OUTBOX_ENABLED", False)
+        create_project_with_task(db_session)
+        assert event_types(db_session) == []
+
+
+class TestOutboxReads:
+    def test_events_of_open_transactions_are_held_back(self, db_session):
+        outbox_repo = OutboxRepository(db_session)
+        endpoint = outbox_repo.add_endpoint("http://127.0.0.1/hook")
+        create_project_with_task(db_session)
+        # An event whose transaction is not older than every open one (on
+        # SQLite the horizon is 1) must wait, even behind a lower ID
+        db_session.add(OutboxEvent(id=10, event_type="task.updated", payload={},
+                                   transaction_id=1))
+        db_session.commit()
+
+        events = outbox_repo.get_events_after(endpoint.position, 100)
+        assert [event.id for event in events] == [1, 2]
+        outbox_repo.mark_delivered(endpoint, events[-1].position)
+        assert endpoint.position == (0, 2)
+        assert outbox_repo.get_events_after(endpoint.position, 100) == []
+        assert outbox_repo.last_position() == (0, 2)
+        assert outbox_repo.prune_delivered() == 2
+        assert event_types(db_session) == ["task.updated"]
+
+
+class TestWebhookDispatcher:
+    def test_delivers_batches_in_order(self, db_session, stub_server):
+        outbox_repo = OutboxRepository(db_session)
+        endpoint = outbox_repo.add_endpoint(stub_server["url"])
+        tasks_only = outbox_repo.add_endpoint(stub_server["url"], event_types="task.")
+        create_project_with_task(db_session)
+        TaskRepository(db_session).bulk_change_status([1], "done")
+
+        dispatcher = WebhookDispatcher(outbox_repo, batch_size=2)
+        try:
+            assert dispatcher.dispatch_once() == {"delivered": 3, "failed": 0}
+            assert dispatcher.dispatch_once() == {"delivered": 2, "failed": 0}
+            assert dispatcher.dispatch_once() == {"delivered": 0, "failed": 0}
+        finally:
+            dispatcher.close()
+
+        batches = sorted([event["id"] for event in batch] for batch in stub_server["received"])
+        # Batches of two events; the task endpoint does not get project events
+        assert batches == [[1, 2], [2], [3], [3]]
+        assert endpoint.cursor == tasks_only.cursor == 3
+        assert outbox_repo.pending_counts() == {endpoint.id: 0, tasks_only.id: 0}
+        assert dispatcher.prune() == 3
+        assert event_types(db_session) == []
+
+    def test_failed_delivery_is_retried_after_backoff(self, db_session, stub_server):
+        outbox_repo = OutboxRepository(db_session)
+        endpoint = outbox_repo.add_endpoint(stub_server["url"])
+        create_project_with_task(db_session)
+        stub_server["fail"] = 1
+
+        dispatcher = WebhookDispatcher(outbox_repo)
+        try:
+            assert dispatcher.dispatch_once() == {"delivered": 0, "failed": 1}
+            assert endpoint.cursor == 0
+            assert endpoint.failures == 1
+            assert "503" in endpoint.last_error
+            assert endpoint.next_attempt_at > datetime.now()
+            # Not due yet
+            assert dispatcher.dispatch_once() == {"delivered": 0, "failed": 0}
+
+            endpoint.next_attempt_at = datetime.now()
+            db_session.commit()
+            assert dispatcher.dispatch_once() == {"delivered": 2, "failed": 0}
+        finally:
+            dispatcher.close()
+
+        assert [event["id"] for event in stub_server["received"][0]] == [1, 2]
+        assert endpoint.failures == 0
+        assert endpoint.last_error is None
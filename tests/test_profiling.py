@@ -0,0 +1,111 @@
+import importlib
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.todolist.api.main import app as api_app
+from src.todolist.api.middleware.profiling import ProfileStore, ProfilingMiddleware
+from src.todolist.utils.config import Config
+
+admin_routes = importlib.import_module("src.todolist.api.routes.admin")
+
+
+def profiled_app(store, **options):
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        return {"total": sum(i * i for i in range(1000))}
+
+    app.add_middleware(ProfilingMiddleware, store=store, **options)
+    return TestClient(app)
+
+
+class TestProfilingMiddleware:
+    def test_profiles_only_flagged_requests(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        client = profiled_app(store, token="secret")
+        
+        response = client.get("/work")
+        assert "x-profile-id" not in response.headers
+        assert store.list() == []
+        
+        response = client.get("/work", headers={"X-Profile": "1", "X-Admin-Token": "secret"})
+        profile_id = response.headers["x-profile-id"]
+        client.get("/work", params={"profile": "1"}, headers={"X-Admin-Token": "secret"})
+        profiles = store.list()
+        assert [p["path"] for p in profiles] == ["/work", "/work"]
+        assert profiles[1]["id"] == profile_id
+        assert profiles[1]["status"] == 200
+        assert "work" in store.summary(profile_id)
+    
+    def test_ring_buffer_and_token(self, tmp_path):
+        store = ProfileStore(tmp_path, max_files=2)
+        client = profiled_app(store, token="secret")
+        
+        assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "1"}).headers
+        # The token is only accepted in the X-Admin-Token header
+        assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "secret"}).headers
+        assert "x-profile-id" not in client.get("/work", params={"profile": "secret"}).headers
+        flagged = {"X-Profile": "1", "X-Admin-Token": "secret"}
+        ids = [
+            client.get("/work", headers=flagged).headers["x-profile-id"]
+            for _ in range(3)
+        ]
+        assert [p["id"] for p in store.list()] == ids[:0:-1]
+        assert len(list(tmp_path.iterdir())) == 4
+    
+    def test_no_token_no_profiling_on_demand(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        client = profiled_app(store)
+        assert "x-profile-id" not in client.get("/work", headers={"X-Profile": "1"}).headers
+        assert "x-profile-id" not in client.get("/work", params={"profile": "1"}).headers
+        flagged = {"X-Profile": "1", "X-Admin-Token": ""}
+        assert "x-profile-id" not in client.get("/work", headers=flagged).headers
+        assert store.list() == []
+    
+    def test_sampling(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        client = profiled_app(store, sample_rate=1.0)
+        client.get("/work")
+        assert len(store.list()) == 1
+
+
+class TestAdminProfiles:
+    def test_list_and_download(self, tmp_path, monkeypatch):
+        store = ProfileStore(tmp_path)
+        profile_id = profiled_app(store, token="secret").get(
+            "/work", headers={"X-Profile": "1", "X-Admin-Token": "secret"}
+        ).headers["x-profile-id"]
+        monkeypatch.setattr(Config, "PROFILING_ENABLED", True)
+        monkeypatch.setattr(Config, "ADMIN_TOKEN", "secret")
+        monkeypatch.setattr(admin_routes, "get_profile_store", lambda: store)
+        client = TestClient(api_app)
+        
+        assert client.get("/api/v1/admin/profiles").status_code == 403
+        headers = {"X-Admin-Token": "secret"}
+        listed = client.get("/api/v1/admin/profiles", headers=headers).json()
+        assert [p["id"] for p in listed] == [profile_id]
+        
+        download = client.get(f"/api/v1/admin/profiles/{profile_id}", headers=headers)
+        assert download.content == (tmp_path / f"{profile_id}.prof").read_bytes()
+        text = client.get(f"/api/v1/admin/profiles/{profile_id}",
+                          params={"format": "text"}, headers=headers)
+        assert "function calls" in text.text
+        missing = client.get("/api/v1/admin/profiles/..%2Fsecret", headers=headers)
+        assert missing.status_code == 404
+    
+    def test_disabled(self, monkeypatch):
+        monkeypatch.setattr(Config, "PROFILING_ENABLED", False)
+        monkeypatch.setattr(Config, "ADMIN_TOKEN", "secret")
+        response = TestClient(api_app).get("/api/v1/admin/profiles",
+                                           headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 404
+    
+    def test_admin_routes_hidden_without_token(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "PROFILING_ENABLED", True)
+        monkeypatch.setattr(Config, "ADMIN_TOKEN", "")
+        monkeypatch.setattr(admin_routes, "get_profile_store", lambda: ProfileStore(tmp_path))
+        client = TestClient(api_app)
+        assert client.get("/api/v1/admin/profiles").status_code == 404
+        assert client.post("/api/v1/jobs/", json={"kind": "purge_project"}).status_code == 404
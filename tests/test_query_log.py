@@ -0,0 +1,85 @@
+import importlib
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.todolist.api.main import app
+from src.todolist.db.base import Base
+from src.todolist.db.query_log import QueryLog, normalize
+from src.todolist.models.project import Project
+from src.todolist.repositories.project_repository import ProjectRepository
+from src.todolist.utils.config import Config
+
+admin_routes = importlib.import_module("src.todolist.api.routes.admin")
+
+
+def instrumented(tmp_path, **options):
+    engine = create_engine(f"sqlite:///{tmp_path / 'log.db'}")
+    Base.metadata.create_all(bind=engine)
+    query_log = QueryLog(log_path=str(tmp_path / "slow.log"), **options)
+    query_log.instrument(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    for name in ("A", "B", "C"):
+        db.add(Project(name=name, description="D"))
+    db.commit()
+    return query_log, ProjectRepository(db)
+
+
+class TestQueryLog:
+    def test_fingerprints_fold_in_lists(self):
+        assert normalize("SELECT *\n  FROM t WHERE id IN (?, ?,?)") == "SELECT * FROM t WHERE id IN (?)"
+        assert normalize("SELECT * FROM t WHERE id IN (?)") == "SELECT * FROM t WHERE id IN (?)"
+    
+    def test_stats_per_fingerprint(self, tmp_path):
+        query_log, projects = instrumented(tmp_path, threshold_ms=10_000)
+        query_log.reset()
+        projects.get_rows(("id",), ids=[1, 2])
+        projects.get_rows(("id",), ids=[1, 2, 3])
+        
+        stats = [s for s in query_log.report() if "projects.id IN" in s["statement"]]
+        assert len(stats) == 1
+        assert stats[0]["count"] == 2
+        assert stats[0]["p95_ms"] <= stats[0]["max_ms"]
+        assert query_log.recent() == []
+    
+    def test_slow_statements_logged_with_plan(self, tmp_path):
+        query_log, projects = instrumented(tmp_path, threshold_ms=0)
+        query_log.reset()
+        projects.get_by_name("B")
+        
+        [entry] = query_log.recent()
+        assert entry["caller"] == "ProjectRepository.get_by_name"
+        assert entry["parameters"][0] == "<str>"
+        assert any("USING INDEX" in line for line in entry["plan"])
+        
+        lines = (tmp_path / "slow.log").read_text().splitlines()
+        assert json.loads(lines[-1])["fingerprint"] == entry["fingerprint"]
+    
+    def test_parameters_kept_when_not_redacted(self, tmp_path):
+        query_log, projects = instrumented(tmp_path, threshold_ms=0, redact=False, explain=False)
+        query_log.reset()
+        projects.get_by_name("B")
+        [entry] = query_log.recent()
+        assert entry["parameters"][0] == "B"
+        assert entry["plan"] is None
+    
+    def test_admin_endpoints(self, tmp_path, monkeypatch):
+        query_log, projects = instrumented(tmp_path, threshold_ms=0)
+        projects.get_by_name("A")
+        monkeypatch.setattr(Config, "SLOW_QUERY_LOG_ENABLED", True)
+        monkeypatch.setattr(Config, "ADMIN_TOKEN", "secret")
+        monkeypatch.setattr(admin_routes, "get_query_log", lambda: query_log)
+        client = TestClient(app, headers={"X-Admin-Token": "secret"})
+        
+        stats = client.get("/api/v1/admin/queries", params={"limit": 1}).json()
+        assert len(stats) == 1 and stats[0]["count"] >= 1
+        slow = client.get("/api/v1/admin/queries/slow").json()
+        assert slow[0]["caller"] == "ProjectRepository.get_by_name"
+        
+        assert client.delete("/api/v1/admin/queries").status_code == 204
+        assert client.get("/api/v1/admin/queries").json() == []
+        
+        monkeypatch.setattr(Config, "SLOW_QUERY_LOG_ENABLED", False)
+        assert client.get("/api/v1/admin/queries").status_code == 404
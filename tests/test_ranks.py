@@ -0,0 +1,210 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.todolist.api.main import app
+from src.todolist.api.dependencies.database import get_db
+from src.todolist.db.base import Base
+from src.todolist.db import session  # noqa: F401 - enables SQLite foreign keys
+from src.todolist.exceptions.repository_exceptions import RebalanceRequiredError
+from src.todolist.exceptions.service_exceptions import ValidationError
+from src.todolist.models.job import Job
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+from src.todolist.repositories.rank_repository import TaskRankRepository
+from src.todolist.repositories.task_query import TaskQuery
+from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.services.task_service import TaskService
+from src.todolist.utils.config import Config
+from src.todolist.utils.ranks import rank_between, spaced_ranks
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def service(db_session):
+    return TaskService(TaskRepository(db_session), rank_repo=TaskRankRepository(db_session))
+
+
+@pytest.fixture
+def tasks(db_session, service):
+    project = Project(name="Board", description="Ordered board")
+    db_session.add(project)
+    db_session.commit()
+    return [service.create_task(project.id, f"Task {i}", "Board task") for i in range(5)]
+
+
+def board(service, project_id, status="todo"):
+    query = TaskQuery(project_id=project_id, statuses=[status], sort=[("rank", False)])
+    return [row[0] for row in service.get_task_rows(["id"], query)]
+
+
+class TestRankKeys:
+    def test_keys_between_neighbours(self):
+        rng = random.Random(42)
+        keys = spaced_ranks(50)
+        assert keys == sorted(keys) and len(set(keys)) == 50
+        for _ in range(2000):
+            i = rng.randint(0, len(keys))
+            before = keys[i - 1] if i > 0 else None
+            after = keys[i] if i < len(keys) else None
+            key = rank_between(before, after)
+            assert (before is None or before < key) and (after is None or key < after)
+            assert key and not key.endswith("0")
+            keys.insert(i, key)
+
+    def test_appending_keeps_keys_short(self):
+        key = None
+        for _ in range(10000):
+            key = rank_between(key, None)
+        assert len(key) <= 4
+        with pytest.raises(ValueError):
+            rank_between("b", "a")
+
+
+class TestTaskRanks:
+    def test_new_tasks_go_to_the_end(self, service, tasks):
+        assert board(service, tasks[0].project_id) == [task.id for task in tasks]
+
+    def test_move_before_and_after(self, service, tasks):
+        ids = [task.id for task in tasks]
+        service.move_task(ids[4], before_id=ids[0])
+        assert board(service, tasks[0].project_id) == [ids[4], ids[0], ids[1], ids[2], ids[3]]
+        service.move_task(ids[0], after_id=ids[2])
+        assert board(service, tasks[0].project_id) == [ids[4], ids[1], ids[2], ids[0], ids[3]]
+        service.move_task(ids[4])
+        assert board(service, tasks[0].project_id) == [ids[1], ids[2], ids[0], ids[3], ids[4]]
+
+    def test_move_writes_one_row(self, db_session, service, tasks):
+        statements = []
+        engine = db_session.get_bind()
+        record = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            service.move_task(tasks[3].id, before_id=tasks[1].id)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        writes = [s for s in statements if s.lstrip().upper().startswith(("UPDATE", "INSERT", "DELETE"))]
+        assert len(writes) == 1
+
+    def test_invalid_moves(self, service, tasks):
+        service.change_task_status(tasks[1].id, "doing")
+        with pytest.raises(ValidationError, match="same project and status"):
+            service.move_task(tasks[0].id, before_id=tasks[1].id)
+        with pytest.raises(ValidationError):
+            service.move_task(tasks[0].id, before_id=tasks[0].id)
+        with pytest.raises(ValidationError):
+            service.move_task(tasks[0].id, before_id=tasks[2].id, after_id=tasks[3].id)
+
+    def test_rebalance_keeps_order_and_shortens_keys(self, db_session, service, tasks):
+        ids = [task.id for task in tasks]
+        # Repeatedly moving into the same gap makes keys longer
+        for _ in range(40):
+            service.move_task(ids[4], after_id=ids[0])
+            service.move_task(ids[3], after_id=ids[0])
+        order = board(service, tasks[0].project_id)
+        rank_repo = TaskRankRepository(db_session)
+        assert rank_repo.long_columns(8) == [(tasks[0].project_id, "todo")]
+
+        assert service.rebalance_ranks(tasks[0].project_id, "todo") == 5
+        assert board(service, tasks[0].project_id) == order
+        assert rank_repo.long_columns(3) == []
+
+    def test_unranked_and_tied_tasks_are_respaced(self, db_session, service, tasks):
+        # Tasks added outside the repository have no rank
+        task = Task(title="Unranked", description="Board task")
+        task.project_id = tasks[0].project_id
+        db_session.add(task)
+        db_session.commit()
+        db_session.query(Task).filter(Task.id.in_([tasks[1].id, tasks[2].id])).update(
+            {"rank": tasks[1].rank}, synchronize_session=False
+        )
+        db_session.commit()
+
+        service.move_task(tasks[0].id, after_id=tasks[1].id)
+        assert board(service, tasks[0].project_id) == [
+            task.id, tasks[1].id, tasks[0].id, tasks[2].id, tasks[3].id, tasks[4].id
+        ]
+
+    def test_status_changes_go_to_the_end_of_the_new_column(self, db_session, service, tasks):
+        ids = [task.id for task in tasks]
+        service.change_task_status(ids[3], "doing")
+        service.change_tasks_status([ids[4], ids[0]], "doing")
+        # Not a change of column: keeps its rank
+        service.change_tasks_status([ids[3]], "doing")
+        assert board(service, tasks[0].project_id, "doing") == [ids[3], ids[0], ids[4]]
+        
+        task = db_session.get(Task, ids[1])
+        task.status = "doing"
+        TaskRepository(db_session).update(task)
+        assert board(service, tasks[0].project_id, "doing") == [ids[3], ids[0], ids[4], ids[1]]
+        assert board(service, tasks[0].project_id) == [ids[2]]
+    
+    def test_long_columns_are_not_respaced_inline(self, db_session, service, tasks, monkeypatch):
+        monkeypatch.setattr(Config, "RANK_INLINE_REBALANCE_MAX", 4)
+        db_session.query(Task).filter(Task.id.in_([tasks[1].id, tasks[2].id])).update(
+            {"rank": tasks[1].rank}, synchronize_session=False
+        )
+        db_session.commit()
+        with pytest.raises(RebalanceRequiredError):
+            service.move_task(tasks[0].id, after_id=tasks[1].id)
+        assert db_session.get(Task, tasks[0].id).rank == tasks[0].rank
+
+
+def test_move_endpoint_queues_rebalance(db_session, tasks, monkeypatch):
+    monkeypatch.setattr(Config, "RANK_MAX_LENGTH", 6)
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        client = TestClient(app)
+        ids = [task.id for task in tasks]
+
+        response = client.post(f"/api/v1/tasks/{ids[2]}/move", json={"before_id": ids[0]})
+        assert response.status_code == 200
+        response = client.get("/api/v1/tasks/", params={
+            "project_id": tasks[0].project_id, "sort": "rank", "fields": "id"
+        })
+        assert [task["id"] for task in response.json()] == [ids[2], ids[0], ids[1], ids[3], ids[4]]
+
+        response = client.post(f"/api/v1/tasks/{ids[0]}/move", json={"after_id": 999})
+        assert response.status_code == 404
+        assert db_session.query(Job).count() == 0
+
+        for _ in range(10):
+            client.post(f"/api/v1/tasks/{ids[4]}/move", json={"after_id": ids[2]})
+            client.post(f"/api/v1/tasks/{ids[3]}/move", json={"after_id": ids[2]})
+        jobs = db_session.query(Job).all()
+        assert [(job.kind, job.params) for job in jobs] == [
+            ("rebalance_ranks", {"project_id": tasks[0].project_id})
+        ]
+        
+        # Tied keys in a column too long to respace during the request
+        monkeypatch.setattr(Config, "RANK_INLINE_REBALANCE_MAX", 4)
+        db_session.query(Task).filter(Task.id.in_(ids[:2])).update(
+            {"rank": "i"}, synchronize_session=False
+        )
+        db_session.query(Job).update({"status": "succeeded"}, synchronize_session=False)
+        db_session.commit()
+        response = client.post(f"/api/v1/tasks/{ids[2]}/move", json={"after_id": ids[0]})
+        assert response.status_code == 409
+        job = db_session.query(Job).order_by(Job.id.desc()).first()
+        assert job.params == {"project_id": tasks[0].project_id, "status": "todo"}
+    finally:
+        app.dependency_overrides.clear()
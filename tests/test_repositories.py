@@ -0,0 +1,278 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.todolist.db.base import Base
+from src.todolist.db import session  # noqa: F401 - enables SQLite foreign keys
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+from src.todolist.exceptions.repository_exceptions import DuplicateError, NotFoundError
+from src.todolist.repositories.memory_repository import (
+    InMemoryProjectRepository,
+    InMemoryStore,
+    InMemoryTaskRepository,
+)
+from src.todolist.repositories.archive_repository import TaskArchiveRepository
+from src.todolist.repositories.project_repository import ProjectRepository
+from src.todolist.repositories.read_models import TaskReadRepository, TaskRecord
+from src.todolist.repositories.task_query import TaskQuery, parse_sort
+from src.todolist.repositories.task_repository import TaskRepository
+
+
+# Fixture for an isolated in-memory database
+@pytest.fixture
+def db_session():
+    """Create a fresh in-memory database for each test"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    TestingSession = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    
+    db = TestingSession()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def project(db_session):
+    project = Project(name="Repo Project", description="Repo Description")
+    db_session.add(project)
+    db_session.commit()
+    return project
+
+
+def add_tasks(db_session, project, count, deadline=None):
+    tasks = []
+    for i in range(count):
+        task = Task(title=f"Task {i}", description="Description", deadline=deadline)
+        task.project_id = project.id
+        tasks.append(task)
+    db_session.add_all(tasks)
+    db_session.commit()
+    return tasks
+
+
+class TestTaskReadRepository:
+    def test_list_returns_records(self, db_session, project):
+        """Records are plain tuples, not mapped instances"""
+        add_tasks(db_session, project, 3)
+        records = TaskReadRepository(db_session).list(project_id=project.id)
+        assert len(records) == 3
+        assert all(isinstance(record, TaskRecord) for record in records)
+        assert records[0].status == "todo"
+    
+    def test_iter_batches_covers_all_rows(self, db_session, project):
+        """Keyset batches cover every row exactly once"""
+        tasks = add_tasks(db_session, project, 7)
+        batches = list(TaskReadRepository(db_session).iter_batches(batch_size=3))
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert [r.id for batch in batches for r in batch] == [t.id for t in tasks]
+    
+    def test_iter_batches_overdue_with_bulk_close(self, db_session, project):
+        """Closing a batch between reads does not skip or repeat rows"""
+        add_tasks(db_session, project, 5, deadline=datetime.now() - timedelta(days=1))
+        task_repo = TaskRepository(db_session)
+        closed = 0
+        for batch in TaskReadRepository(db_session).iter_batches(2, overdue=True):
+            closed += task_repo.bulk_change_status([r.id for r in batch], "done")
+        assert closed == 5
+        assert TaskReadRepository(db_session).list(overdue=True) == []
+
+
+
+class TestCompactStorage:
+    def test_status_and_timestamps_stored_as_integers(self, db_session, project):
+        created = datetime(2026, 1, 2, 3, 4, 5, 123456)
+        task = add_tasks(db_session, project, 1)[0]
+        TaskRepository(db_session).update_by_id(task.id, {"status": "done"})
+        db_session.query(Task).filter(Task.id == task.id).update({"created_at": created})
+        db_session.commit()
+        
+        stored = db_session.execute(
+            text("SELECT status, created_at, typeof(updated_at) FROM tasks")
+        ).one()
+        assert stored == (2, 1767323045123456, "integer")
+        db_session.expire_all()
+        task = db_session.get(Task, task.id)
+        assert (task.status, task.created_at) == ("done", created)
+        
+        with pytest.raises(IntegrityError):
+            db_session.execute(text("UPDATE tasks SET status = 7"))
+        db_session.rollback()
+    
+    def test_status_sorts_in_workflow_order_on_both_backends(self, db_session, project):
+        store = InMemoryStore()
+        memory_projects = InMemoryProjectRepository(store)
+        memory_tasks = InMemoryTaskRepository(store)
+        memory_project = memory_projects.add(Project(name="Memory", description="Memory"))
+        repos = [(TaskRepository(db_session), add_tasks(db_session, project, 3))]
+        memory_added = []
+        for i in range(3):
+            task = Task(title=f"Task {i}", description="Description")
+            task.project_id = memory_project.id
+            memory_added.append(memory_tasks.add(task))
+        repos.append((memory_tasks, memory_added))
+        
+        for repo, tasks in repos:
+            repo.update_by_id(tasks[0].id, {"status": "done"})
+            repo.update_by_id(tasks[1].id, {"status": "doing"})
+            rows = repo.get_rows(("status",), TaskQuery(sort=parse_sort("status")))
+            assert [row[0] for row in rows] == ["todo", "doing", "done"]
+
+
+class TestProjectRepository:
+    def test_delete_cascades_in_database(self, db_session, project):
+        """Project delete is one DELETE, tasks go with ON DELETE CASCADE"""
+        add_tasks(db_session, project, 3)
+        db_session.expunge_all()
+        
+        assert ProjectRepository(db_session).delete(project.id)
+        assert TaskRepository(db_session).count() == 0
+        assert not ProjectRepository(db_session).delete(project.id)
+
+
+class TestTaskRepository:
+    def test_add_maps_only_foreign_key_failures(self, db_session, project):
+        orphan = Task(title="Orphan", description="Description")
+        orphan.project_id = 999
+        with pytest.raises(NotFoundError):
+            TaskRepository(db_session).add(orphan)
+        
+        task = add_tasks(db_session, project, 1)[0]
+        duplicate = Task(title="Duplicate", description="Description")
+        duplicate.id, duplicate.project_id = task.id, project.id
+        db_session.expunge(task)
+        with pytest.raises(IntegrityError):
+            TaskRepository(db_session).add(duplicate)
+
+
+class TestTaskArchiveRepository:
+    def test_archive_moves_old_done_tasks_in_chunks(self, db_session, project):
+        """Chunks move rows, keep ids and maintain per-project totals"""
+        tasks = add_tasks(db_session, project, 5)
+        task_repo = TaskRepository(db_session)
+        task_repo.bulk_change_status([t.id for t in tasks[:3]], "done")
+        archive_repo = TaskArchiveRepository(db_session)
+        
+        cutoff = datetime.now() + timedelta(seconds=1)
+        assert archive_repo.archive_done_before(cutoff, limit=2) == 2
+        assert archive_repo.archive_done_before(cutoff, limit=2) == 1
+        assert archive_repo.archive_done_before(cutoff, limit=2) == 0
+        
+        assert task_repo.count() == 2
+        assert archive_repo.get(tasks[0].id).title == tasks[0].title
+        assert archive_repo.totals_by_status(project.id) == {"done": 3}
+    
+    def test_recent_done_tasks_are_kept(self, db_session, project):
+        tasks = add_tasks(db_session, project, 1)
+        TaskRepository(db_session).bulk_change_status([tasks[0].id], "done")
+        cutoff = datetime.now() - timedelta(days=1)
+        assert TaskArchiveRepository(db_session).archive_done_before(cutoff, 10) == 0
+
+
+class TestInMemoryRepositories:
+    @pytest.fixture(autouse=True)
+    def setup_method(self, tmp_path):
+        self.snapshot_path = str(tmp_path / "snapshot.json")
+        self.store = InMemoryStore(snapshot_path=self.snapshot_path)
+        self.projects = InMemoryProjectRepository(self.store)
+        self.tasks = InMemoryTaskRepository(self.store)
+        self.project = self.projects.add(Project(name="Memory", description="D"))
+    
+    def add_task(self, title, deadline=None):
+        task = Task(title=title, description="D", deadline=deadline)
+        task.project_id = self.project.id
+        return self.tasks.add(task)
+    
+    def test_unique_name_index(self):
+        """Name index rejects duplicates on insert and rename"""
+        other = self.projects.add(Project(name="Other", description="D"))
+        with pytest.raises(DuplicateError):
+            self.projects.add(Project(name="Memory", description="D"))
+        with pytest.raises(DuplicateError):
+            self.projects.update_by_id(other.id, {"name": "Memory"})
+        self.projects.update_by_id(other.id, {"name": "Renamed"})
+        assert self.projects.get_by_name("Renamed").id == other.id
+        assert self.projects.get_by_name("Other") is None
+    
+    def test_missing_project_rejected(self):
+        task = Task(title="Orphan", description="D")
+        task.project_id = 999
+        with pytest.raises(NotFoundError):
+            self.tasks.add(task)
+    
+    def test_overdue_heap_tracks_changes(self):
+        """Deadline heap follows status, deadline and delete changes"""
+        past = datetime.now() - timedelta(days=1)
+        late = self.add_task("Late", past)
+        done = self.add_task("Done", past)
+        moved = self.add_task("Moved", past)
+        gone = self.add_task("Gone", past)
+        self.add_task("Future", datetime.now() + timedelta(days=1))
+        
+        self.tasks.update_by_id(done.id, {"status": "done"})
+        self.tasks.update_by_id(moved.id, {"deadline": datetime.now() + timedelta(days=2)})
+        self.tasks.delete(gone.id)
+        assert [t.id for t in self.tasks.get_overdue_tasks()] == [late.id]
+        
+        self.tasks.update_by_id(done.id, {"status": "doing"})
+        assert [t.id for t in self.tasks.get_overdue_tasks()] == [late.id, done.id]
+    
+    def test_status_indexes_and_counts(self):
+        first = self.add_task("First")
+        self.add_task("Second")
+        self.tasks.update_by_id(first.id, {"status": "doing"})
+        assert self.tasks.count_by_status(self.project.id) == {"todo": 1, "doing": 1}
+        assert [t.id for t in self.tasks.get_by_status(self.project.id, "doing")] == [first.id]
+        
+        assert self.projects.delete(self.project.id)
+        assert self.tasks.count() == 0
+    
+    def test_task_query_matches_sql_semantics(self):
+        """Filters, NULL ordering and paging behave like the SQL backend"""
+        now = datetime.now()
+        first = self.add_task("First", now + timedelta(days=2))
+        second = self.add_task("Second", now + timedelta(days=1))
+        undated = self.add_task("Undated")
+        self.tasks.update_by_id(second.id, {"status": "doing"})
+        
+        rows = self.tasks.get_rows(("id",), TaskQuery(sort=parse_sort("deadline")))
+        assert [row[0] for row in rows] == [undated.id, second.id, first.id]
+        rows = self.tasks.get_rows(("id",), TaskQuery(sort=parse_sort("-deadline"), limit=2))
+        assert [row[0] for row in rows] == [first.id, second.id]
+        rows = self.tasks.get_rows(("id",), TaskQuery(statuses=["todo"], upcoming_days=5))
+        assert [row[0] for row in rows] == [first.id]
+    
+    def test_batch_lookups(self):
+        first = self.add_task("First")
+        self.add_task("Second")
+        third = self.add_task("Third")
+        rows = self.tasks.get_rows(("id",), TaskQuery(ids=[third.id, first.id, 999]))
+        assert [row[0] for row in rows] == [first.id, third.id]
+        
+        other = self.projects.add(Project(name="Other", description="D"))
+        assert self.projects.get_rows(("id",), ids=[other.id, 999]) == [(other.id,)]
+        pairs = self.projects.get_with_tasks()
+        assert [(p.id, [t.title for t in tasks]) for p, tasks in pairs] == [
+            (self.project.id, ["First", "Second", "Third"]), (other.id, []),
+        ]
+    
+    def test_snapshot_round_trip(self):
+        task = self.add_task("Saved", datetime.now() - timedelta(days=1))
+        self.store.save_snapshot()
+        
+        restored = InMemoryStore(snapshot_path=self.snapshot_path)
+        restored_tasks = InMemoryTaskRepository(restored)
+        assert restored_tasks.get(task.id).title == "Saved"
+        assert restored_tasks.get(task.id).deadline == task.deadline
+        assert [t.id for t in restored_tasks.get_overdue_tasks()] == [task.id]
+        assert InMemoryProjectRepository(restored).get_by_name("Memory").id == self.project.id
@@ -0,0 +1,22 @@
+from src.todolist.api import server
+from src.todolist.utils.config import Config
+
+
+class TestServerOptions:
+    def test_workers_default_to_cpu_count(self, monkeypatch):
+        monkeypatch.setattr(Config, "API_WORKERS", 0)
+        monkeypatch.setattr(server.os, "cpu_count", lambda: 8)
+        assert server.server_options()["workers"] == 8
+        assert server.server_options(workers=3)["workers"] == 3
+    
+    def test_memory_backend_runs_single_worker(self, monkeypatch):
+        monkeypatch.setattr(Config, "REPOSITORY_BACKEND", "memory")
+        assert server.worker_count(4) == 1
+    
+    def test_worker_recycling_only_when_configured(self, monkeypatch):
+        assert "limit_max_requests" not in server.server_options()
+        monkeypatch.setattr(Config, "API_MAX_REQUESTS", 10000)
+        options = server.server_options()
+        assert options["limit_max_requests"] == 10000
+        # Only options known to uvicorn 0.24
+        assert "limit_max_requests_jitter" not in options
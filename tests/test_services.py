@@ -6,6 +6,11 @@ from src.todolist.db.session import SessionLocal, engine
 from src.todolist.db.base import Base
 from src.todolist.repositories.project_repository import ProjectRepository
 from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.repositories.memory_repository import (
+    InMemoryProjectRepository,
+    InMemoryStore,
+    InMemoryTaskRepository,
+)
 from src.todolist.services.project_service import ProjectService
 from src.todolist.services.task_service import TaskService
 from src.todolist.exceptions.service_exceptions import ValidationError
@@ -26,15 +31,29 @@ def db_session():
         db.close()
 
 
-# Fixture for repositories
+# Fixture for repositories, every service test runs against both backends
+@pytest.fixture(params=["sqlalchemy", "memory"])
+def backend(request):
+    return request.param
+
+
+@pytest.fixture
+def memory_store():
+    return InMemoryStore()
+
+
 @pytest.fixture
-def project_repo(db_session):
-    return ProjectRepository(db_session)
+def project_repo(backend, request):
+    if backend == "memory":
+        return InMemoryProjectRepository(request.getfixturevalue("memory_store"))
+    return ProjectRepository(request.getfixturevalue("db_session"))
 
 
 @pytest.fixture
-def task_repo(db_session):
-    return TaskRepository(db_session)
+def task_repo(backend, request):
+    if backend == "memory":
+        return InMemoryTaskRepository(request.getfixturevalue("memory_store"))
+    return TaskRepository(request.getfixturevalue("db_session"))
 
 
 # Fixture for services
@@ -74,6 +93,21 @@ class TestProjectService:
         
         # Verify project is deleted
         assert project_service.get_project(project.id) is None
+    
+    def test_purge_project_in_chunks(self, project_service, task_service):
+        """Test chunked project purge with progress reporting"""
+        project = project_service.create_project("Test Project 4", "Test Description 4")
+        for i in range(3):
+            task_service.create_task(project.id, f"Task {i}", "Task Description")
+        
+        progress = []
+        success = project_service.purge_project(
+            project.id, chunk_size=2, progress=lambda done, total: progress.append((done, total))
+        )
+        assert success
+        assert progress == [(2, 3), (3, 3)]
+        assert project_service.get_project(project.id) is None
+        assert task_service.get_tasks_by_project(project.id) == []
 
 
 class TestTaskService:
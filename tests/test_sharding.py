@@ -0,0 +1,116 @@
+import importlib
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.todolist.api.main import app
+from src.todolist.db.sharding import ProjectMovingError, ShardRouter
+from src.todolist.models.task import Task
+from src.todolist.models.task_status_event import TaskStatusEvent
+from src.todolist.repositories.sharded_repository import ShardedTaskRepository
+from src.todolist.repositories.tag_repository import TagRepository
+from src.todolist.repositories.task_dependency_repository import TaskDependencyRepository
+from src.todolist.utils.config import Config
+
+shards_command = importlib.import_module("src.todolist.commands.shards")
+database_dependency = importlib.import_module("src.todolist.api.dependencies.database")
+
+
+@pytest.fixture
+def router(tmp_path, monkeypatch):
+    router = ShardRouter(
+        [f"sqlite:///{tmp_path / f'shard{i}.db'}" for i in range(2)],
+        f"sqlite:///{tmp_path / 'directory.db'}",
+        id_block_size=10,
+    )
+    router.init_schema()
+    monkeypatch.setattr(Config, "SHARD_URLS", router.shard_urls)
+    monkeypatch.setattr(database_dependency, "get_shard_router", lambda: router)
+    monkeypatch.setattr(shards_command, "get_shard_router", lambda: router)
+    yield router
+    router.dispose()
+
+
+@pytest.fixture
+def client(router):
+    return TestClient(app)
+
+
+def create(client, name, tasks):
+    project_id = client.post("/api/v1/projects/", json={
+        "name": name, "description": "D"
+    }).json()["id"]
+    task_ids = [
+        client.post("/api/v1/tasks/", json={
+            "project_id": project_id, "title": f"{name} {i}", "description": "D"
+        }).json()["id"]
+        for i in range(tasks)
+    ]
+    return project_id, task_ids
+
+
+class TestSharding:
+    def test_projects_spread_and_lists_merged(self, client, router):
+        a, a_tasks = create(client, "A", 2)
+        b, b_tasks = create(client, "B", 2)
+        assert router.project_ids() == {a: 0, b: 1}
+        # Task IDs come from the directory, unique across shards
+        assert len(set(a_tasks + b_tasks)) == 4
+        
+        assert [p["id"] for p in client.get("/api/v1/projects/").json()] == [a, b]
+        listed = client.get("/api/v1/tasks/", params={"sort": "-id", "limit": 3}).json()
+        assert [t["id"] for t in listed] == sorted(a_tasks + b_tasks, reverse=True)[:3]
+        
+        task = client.get(f"/api/v1/tasks/{b_tasks[0]}").json()
+        assert task["title"] == "B 0"
+        client.patch(f"/api/v1/tasks/{b_tasks[0]}/status", json={"status": "done"})
+        stats = client.get(f"/api/v1/projects/{b}/stats").json()
+        assert stats["status_count"] == {"todo": 1, "doing": 0, "done": 1}
+        
+        # Names are unique across shards
+        response = client.post("/api/v1/projects/", json={"name": "A", "description": "D"})
+        assert response.status_code == 409
+        
+        assert client.delete(f"/api/v1/projects/{a}").status_code == 204
+        assert router.project_ids() == {b: 1}
+        assert client.get(f"/api/v1/tasks/{a_tasks[0]}").status_code == 404
+    
+    def test_move_project_between_shards(self, client, router):
+        create(client, "A", 1)
+        b, b_tasks = create(client, "B", 3)
+        client.patch(f"/api/v1/tasks/{b_tasks[0]}/status", json={"status": "done"})
+        # Edges and tags left from before sharding, not reachable through the API
+        with router.sessionmakers[1]() as old:
+            TaskDependencyRepository(old).add(b_tasks[1], b_tasks[0])
+            TagRepository(old).tag(b_tasks[1:], ["ui", "bug"])
+        with router.sessionmakers[0]() as new:
+            TagRepository(new).tag([], ["bug"])
+        
+        shards_command.move_project(b, 0, chunk_size=2)
+        
+        assert router.shard_of(b) == 0
+        with router.sessionmakers[1]() as old:
+            assert old.query(Task).count() == 0
+        with router.sessionmakers[0]() as new:
+            events = new.query(TaskStatusEvent).filter(TaskStatusEvent.project_id == b).count()
+            assert events == 4
+            assert TaskDependencyRepository(new).is_blocked_by(b_tasks[1], b_tasks[0])
+            assert TagRepository(new).get_task_tags(b_tasks[2]) == ["bug", "ui"]
+        listed = client.get("/api/v1/tasks/", params={"project_id": b}).json()
+        assert [t["id"] for t in listed] == b_tasks
+        assert client.get(f"/api/v1/tasks/{b_tasks[0]}").json()["status"] == "done"
+    
+    def test_bulk_change_status_refuses_moving_project(self, client, router):
+        a, a_tasks = create(client, "A", 2)
+        b, b_tasks = create(client, "B", 1)
+        repo = ShardedTaskRepository(router.sessions())
+        try:
+            router.set_shard(b, moving=True)
+            with pytest.raises(ProjectMovingError):
+                repo.bulk_change_status(a_tasks + b_tasks, "done")
+            router.set_shard(b, moving=False)
+            assert repo.bulk_change_status(a_tasks + b_tasks, "done") == 3
+        finally:
+            repo.sessions.close()
+        statuses = [t["status"] for t in client.get("/api/v1/tasks/").json()]
+        assert statuses == ["done"] * 3
@@ -0,0 +1,103 @@
+import importlib
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.todolist.api.main import app
+from src.todolist.api.dependencies.database import get_db
+from src.todolist.db.base import Base
+from src.todolist.models.project import Project
+from src.todolist.utils.config import Config
+from src.todolist.utils.single_flight import SingleFlight
+
+single_flight_module = importlib.import_module("src.todolist.utils.single_flight")
+admin_routes = importlib.import_module("src.todolist.api.routes.admin")
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    release = threading.Event()
+    executions, results = [], []
+
+    def compute():
+        executions.append(1)
+        release.wait(5)
+        return {"total": 42}
+
+    threads = [threading.Thread(target=lambda: results.append(group.do("stats", 1, compute)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    # Release the leader once the others are waiting for it
+    wait_until(lambda: group.stats.get("stats") and group.stats["stats"].shared == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(executions) == 1
+    assert results == [{"total": 42}] * 5
+    stats, = group.stats_list()
+    assert (stats["executions"], stats["shared"], stats["in_flight"]) == (1, 4, 0)
+    # Another key is computed on its own
+    assert group.do("stats", 2, lambda: "other") == "other"
+
+
+def test_errors_are_shared_but_not_cached(monkeypatch):
+    group = SingleFlight(cache_ttl=10)
+    now = [100.0]
+    monkeypatch.setattr(single_flight_module.time, "monotonic", lambda: now[0])
+
+    with pytest.raises(ValueError):
+        group.do("stats", 1, lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert group.do("stats", 1, lambda: "fresh") == "fresh"
+    assert group.do("stats", 1, lambda: "stale") == "fresh"
+    now[0] += 11
+    assert group.do("stats", 1, lambda: "expired") == "expired"
+    assert group.stats["stats"].cached == 1
+
+
+def test_stats_endpoint_coalesced_and_reported(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    project = Project(name="Dashboard", description="Wall screens")
+    db.add(project)
+    db.commit()
+
+    group = SingleFlight(cache_ttl=60)
+    monkeypatch.setattr(single_flight_module, "get_single_flight", lambda: group)
+    monkeypatch.setattr(admin_routes, "get_single_flight", lambda: group)
+    monkeypatch.setattr(Config, "ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(Config, "COALESCE_ENABLED", True)
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        client = TestClient(app, headers={"X-Admin-Token": "secret"})
+        first = client.get(f"/api/v1/projects/{project.id}/stats").json()
+        assert client.get(f"/api/v1/projects/{project.id}/stats").json() == first
+        assert client.get("/api/v1/projects/999/stats").status_code == 404
+
+        stats = {row["name"]: row for row in client.get("/api/v1/admin/coalescing").json()}
+        assert stats["project_stats"]["executions"] == 2
+        assert stats["project_stats"]["cached"] == 1
+        assert client.delete("/api/v1/admin/coalescing").status_code == 204
+        assert client.get("/api/v1/admin/coalescing").json() == []
+
+        monkeypatch.setattr(Config, "COALESCE_ENABLED", False)
+        assert client.get("/api/v1/admin/coalescing").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+        db.close()
+        engine.dispose()
@@ -0,0 +1,138 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.todolist.api.main import app
+from src.todolist.api.dependencies.database import get_db
+from src.todolist.db.base import Base
+from src.todolist.db import session  # noqa: F401 - enables SQLite foreign keys
+from src.todolist.exceptions.service_exceptions import ValidationError
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+from src.todolist.repositories.memory_repository import InMemoryStore, InMemoryTaskRepository
+from src.todolist.repositories.tag_repository import TagRepository
+from src.todolist.repositories.task_query import TaskQuery
+from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.services.task_service import TaskService
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def service(db_session):
+    return TaskService(TaskRepository(db_session), tag_repo=TagRepository(db_session))
+
+
+@pytest.fixture
+def tasks(db_session, service):
+    """Two projects, tasks 0-3 in the first and 4 in the second"""
+    projects = [Project(name=f"Tags {i}", description="Tagged project") for i in range(2)]
+    db_session.add_all(projects)
+    db_session.commit()
+    return [
+        service.create_task(projects[0 if i < 4 else 1].id, f"Task {i}", "Tagged task")
+        for i in range(5)
+    ]
+
+
+def filtered_ids(service, tags, match_all=False):
+    query = TaskQuery(tags=tags, match_all_tags=match_all)
+    return [row[0] for row in service.get_task_rows(["id"], query)]
+
+
+class TestTags:
+    def test_bulk_tag_and_untag(self, service, tasks):
+        ids = [task.id for task in tasks]
+        assert service.tag_tasks(ids[:3], ["bug", "ui"]) == 6
+        # Existing pairs and unknown tasks are skipped
+        assert service.tag_tasks(ids[:3] + [999], ["bug", "ui", "api"]) == 3
+        assert service.get_task_tags(ids[0]) == ["api", "bug", "ui"]
+
+        assert service.untag_tasks(ids[:2], ["ui", "missing"]) == 2
+        assert service.get_task_tags(ids[0]) == ["api", "bug"]
+        assert service.get_task_tags(ids[2]) == ["api", "bug", "ui"]
+
+    def test_filter_any_and_all(self, service, tasks):
+        ids = [task.id for task in tasks]
+        service.tag_tasks([ids[0], ids[1], ids[4]], ["bug"])
+        service.tag_tasks([ids[1], ids[2]], ["ui"])
+
+        assert filtered_ids(service, ["bug", "ui"]) == [ids[0], ids[1], ids[2], ids[4]]
+        assert filtered_ids(service, ["bug", "ui"], match_all=True) == [ids[1]]
+        assert filtered_ids(service, ["ui", "unknown"], match_all=True) == []
+        assert filtered_ids(service, ["unknown"]) == []
+
+        query = TaskQuery(project_id=tasks[0].project_id, tags=["bug"])
+        assert [row[0] for row in service.get_task_rows(["id"], query)] == [ids[0], ids[1]]
+
+    def test_counts_per_project(self, service, tasks):
+        ids = [task.id for task in tasks]
+        service.tag_tasks(ids, ["bug"])
+        service.tag_tasks(ids[:2], ["ui"])
+        first, second = tasks[0].project_id, tasks[4].project_id
+        assert service.get_tag_counts() == [
+            {"project_id": first, "tag": "bug", "count": 4},
+            {"project_id": first, "tag": "ui", "count": 2},
+            {"project_id": second, "tag": "bug", "count": 1},
+        ]
+        assert service.get_tag_counts(second) == [{"project_id": second, "tag": "bug", "count": 1}]
+
+        service.delete_task(ids[0])
+        assert service.get_tag_counts(first)[0]["count"] == 3
+
+    def test_tag_filter_uses_tag_index(self, db_session):
+        query = TaskQuery(tags=["bug", "ui"], match_all_tags=True).apply(select(Task.id), Task)
+        compiled = query.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = " ".join(
+            row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+        )
+        assert "ix_task_tags_tag_id_task_id" in plan
+        assert "SCAN task_tags" not in plan
+
+    def test_memory_backend_rejects_tag_filter(self):
+        service = TaskService(InMemoryTaskRepository(InMemoryStore()))
+        with pytest.raises(ValidationError):
+            service.get_task_rows(["id"], TaskQuery(tags=["bug"]))
+
+
+def test_tag_endpoints(db_session, tasks):
+    app.dependency_overrides[get_db] = lambda: db_session
+    try:
+        client = TestClient(app)
+        ids = [task.id for task in tasks]
+
+        response = client.post("/api/v1/tasks/tags/add", json={"task_ids": ids[:2], "tags": ["bug"]})
+        assert response.json() == {"changed": 2}
+        client.post("/api/v1/tasks/tags/add", json={"task_ids": ids[1:3], "tags": ["ui"]})
+        bad_name = client.post("/api/v1/tasks/tags/add", json={"task_ids": ids, "tags": ["a,b"]})
+        assert bad_name.status_code == 422
+
+        response = client.get("/api/v1/tasks/", params={"tags": "bug,ui", "match": "all"})
+        assert [task["id"] for task in response.json()] == [ids[1]]
+        response = client.get("/api/v1/tasks/", params={"tags": "bug,ui", "fields": "id"})
+        assert response.json() == [{"id": id} for id in ids[:3]]
+
+        response = client.get("/api/v1/tasks/tags/counts", params={"project_id": tasks[0].project_id})
+        assert [(row["tag"], row["count"]) for row in response.json()] == [("bug", 2), ("ui", 2)]
+
+        response = client.post("/api/v1/tasks/tags/remove", json={"task_ids": ids, "tags": ["ui"]})
+        assert response.json() == {"changed": 2}
+        assert client.get(f"/api/v1/tasks/{ids[1]}/tags").json() == ["bug"]
+    finally:
+        app.dependency_overrides.clear()
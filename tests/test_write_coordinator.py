@@ -0,0 +1,166 @@
+import asyncio
+import importlib
+import threading
+import time
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.todolist.api.main import app
+from src.todolist.api.dependencies.database import get_db
+
+from src.todolist.db.base import Base
+from src.todolist.db.write_coordinator import WriteCoordinator
+from src.todolist.exceptions.repository_exceptions import DuplicateError, NotFoundError
+from src.todolist.models.project import Project
+from src.todolist.models.task import Task
+from src.todolist.repositories.coordinated_repository import CoordinatedRepository
+from src.todolist.repositories.project_repository import ProjectRepository
+from src.todolist.repositories.rank_repository import TaskRankRepository
+from src.todolist.repositories.tag_repository import TagRepository
+from src.todolist.repositories.task_dependency_repository import TaskDependencyRepository
+from src.todolist.repositories.task_repository import TaskRepository
+from src.todolist.utils.config import Config
+
+repository_dependencies = importlib.import_module("src.todolist.api.dependencies.repositories")
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    url = f"sqlite:///{tmp_path / 'writes.db'}"
+    Base.metadata.create_all(bind=create_engine(url))
+    return url
+
+
+@pytest.fixture
+def coordinator(database_url):
+    coordinator = WriteCoordinator(database_url, max_delay=0.2)
+    commits = []
+    event.listen(coordinator.engine, "commit", lambda conn: commits.append(conn))
+    coordinator.commits = commits
+    yield coordinator
+    coordinator.stop()
+
+
+class TestWriteCoordinator:
+    def test_concurrent_writes_share_one_commit(self, coordinator, database_url):
+        db = sessionmaker(bind=create_engine(database_url))()
+        projects = CoordinatedRepository(ProjectRepository(db), coordinator)
+        results = {}
+        
+        # Hold the writer until all three submissions are queued
+        release = threading.Event()
+        run = coordinator._run
+        coordinator._run = lambda: (release.wait(), run())
+        
+        def create(name):
+            try:
+                results[name] = projects.add(Project(name=name, description="D"))
+            except DuplicateError as e:
+                results[name] = e
+        
+        threads = [threading.Thread(target=create, args=(n,)) for n in ["A", "B", "C"]]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while coordinator._queue.qsize() < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert coordinator.batches == 1
+        assert len(coordinator.commits) == 1
+        
+        # A later writer colliding on the unique name: only that one fails
+        create("A")
+        assert isinstance(results["A"], DuplicateError)
+        assert {results["B"].name, results["C"].name} == {"B", "C"}
+        assert db.query(Project).count() == 3
+        assert coordinator.operations == 4
+        assert len(coordinator.commits) == 2
+    
+    def test_errors_returned_to_their_caller(self, coordinator, database_url):
+        db = sessionmaker(bind=create_engine(database_url))()
+        projects = CoordinatedRepository(ProjectRepository(db), coordinator)
+        tasks = CoordinatedRepository(TaskRepository(db), coordinator)
+        project = projects.add(Project(name="P", description="D"))
+        
+        task = Task(title="T", description="D")
+        task.project_id = project.id
+        assert tasks.add(task).id is not None
+        orphan = Task(title="Orphan", description="D")
+        orphan.project_id = 999
+        with pytest.raises(NotFoundError):
+            tasks.add(orphan)
+        with pytest.raises(NotFoundError):
+            tasks.update_by_id(999, {"status": "done"})
+        
+        # Reads go through the wrapped repository's own session
+        assert tasks.count_by_project(project.id) == 1
+        assert tasks.update_by_id(task.id, {"status": "done"}).status == "done"
+    
+    def test_tag_dependency_and_rank_writes_are_coordinated(self, coordinator, database_url):
+        db = sessionmaker(bind=create_engine(database_url))()
+        project = CoordinatedRepository(ProjectRepository(db), coordinator).add(
+            Project(name="P", description="D")
+        )
+        tasks = CoordinatedRepository(TaskRepository(db), coordinator)
+        ids = []
+        for title in ["A", "B"]:
+            task = Task(title=title, description="D")
+            task.project_id = project.id
+            ids.append(tasks.add(task).id)
+        commits = len(coordinator.commits)
+        
+        tags = CoordinatedRepository(TagRepository(db), coordinator)
+        dependencies = CoordinatedRepository(TaskDependencyRepository(db), coordinator)
+        ranks = CoordinatedRepository(TaskRankRepository(db), coordinator)
+        assert tags.tag(ids, ["bug"]) == 2
+        assert tags.untag(ids[:1], ["bug"]) == 1
+        assert dependencies.add(ids[1], ids[0]).blocker_id == ids[0]
+        assert dependencies.delete(ids[1], ids[0])
+        assert ranks.move(ids[1], before_id=ids[0]).id == ids[1]
+        
+        assert len(coordinator.commits) == commits + 5
+        assert tags.get_task_tags(ids[1]) == ["bug"]
+        assert [task.id for task in db.query(Task).order_by(Task.rank)] == [ids[1], ids[0]]
+
+
+def test_concurrent_api_writes_share_commits(coordinator, database_url, monkeypatch):
+    monkeypatch.setattr(Config, "WRITE_COORDINATOR", True)
+    monkeypatch.setattr(repository_dependencies, "get_write_coordinator", lambda: coordinator)
+    engine = create_engine(database_url, connect_args={"check_same_thread": False})
+    make_session = sessionmaker(bind=engine, expire_on_commit=False)
+    
+    def session():
+        db = make_session()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    with make_session() as db:
+        project = ProjectRepository(db).add(Project(name="P", description="D"))
+    app.dependency_overrides[get_db] = session
+    
+    async def create_tasks(count):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*[
+                client.post("/api/v1/tasks/", json={
+                    "project_id": project.id, "title": f"Task {i}", "description": "D"
+                })
+                for i in range(count)
+            ])
+    
+    try:
+        batches = coordinator.batches
+        responses = asyncio.run(create_tasks(10))
+    finally:
+        app.dependency_overrides.clear()
+        engine.dispose()
+    assert [response.status_code for response in responses] == [201] * 10
+    # Endpoints waiting on the event loop would commit one request at a time
+    assert coordinator.batches - batches < 10